@@ -0,0 +1,56 @@
+"""Add composite indexes for patient list queries
+
+Each list endpoint filters on the owning id and orders by (date, id), so
+these indexes serve the filter, the keyset cursor and the ORDER BY in one
+scan; Postgres walks them backwards for descending pages. Planner dates are
+nullable and sorted NULLS LAST, so their index spells out the default
+descending order. The single-column indexes they replace were prefixes.
+
+Indexes are built CONCURRENTLY so existing tables stay writable.
+
+Revision ID: composite_list_indexes
+Revises: add_biodata_fields
+Create Date: 2025-03-04
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'composite_list_indexes'
+down_revision = 'add_biodata_fields'
+branch_labels = None
+depends_on = None
+
+PLANNED_DATE_DESC_OPS = {'planned_date': 'DESC NULLS LAST', 'id': 'DESC'}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_patients_user_id_created_at', 'patients', ['user_id', 'created_at', 'id'], postgresql_concurrently=True)
+        op.create_index('ix_visits_patient_id_visit_date', 'visits', ['patient_id', 'visit_date', 'id'], postgresql_concurrently=True)
+        op.create_index('ix_xrays_patient_id_taken_date', 'xrays', ['patient_id', 'taken_date', 'id'], postgresql_concurrently=True)
+        op.create_index('ix_intraoral_pictures_patient_id_taken_date', 'intraoral_pictures', ['patient_id', 'taken_date', 'id'], postgresql_concurrently=True)
+        op.create_index('ix_patient_record_planner_patient_id_planned_date', 'patient_record_planner', ['patient_id', 'planned_date', 'id'], postgresql_ops=PLANNED_DATE_DESC_OPS, postgresql_concurrently=True)
+        op.create_index('ix_patient_record_planner_patient_id_status_planned_date', 'patient_record_planner', ['patient_id', 'status', 'planned_date', 'id'], postgresql_ops=PLANNED_DATE_DESC_OPS, postgresql_concurrently=True)
+
+        op.drop_index('ix_patients_user_id', table_name='patients', postgresql_concurrently=True)
+        op.drop_index('ix_visits_patient_id', table_name='visits', postgresql_concurrently=True)
+        op.drop_index('ix_xrays_patient_id', table_name='xrays', postgresql_concurrently=True)
+        op.drop_index('ix_intraoral_pictures_patient_id', table_name='intraoral_pictures', postgresql_concurrently=True)
+        op.drop_index('ix_patient_record_planner_patient_id', table_name='patient_record_planner', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_patient_record_planner_patient_id', 'patient_record_planner', ['patient_id'], postgresql_concurrently=True)
+        op.create_index('ix_intraoral_pictures_patient_id', 'intraoral_pictures', ['patient_id'], postgresql_concurrently=True)
+        op.create_index('ix_xrays_patient_id', 'xrays', ['patient_id'], postgresql_concurrently=True)
+        op.create_index('ix_visits_patient_id', 'visits', ['patient_id'], postgresql_concurrently=True)
+        op.create_index('ix_patients_user_id', 'patients', ['user_id'], postgresql_concurrently=True)
+
+        op.drop_index('ix_patient_record_planner_patient_id_status_planned_date', table_name='patient_record_planner', postgresql_concurrently=True)
+        op.drop_index('ix_patient_record_planner_patient_id_planned_date', table_name='patient_record_planner', postgresql_concurrently=True)
+        op.drop_index('ix_intraoral_pictures_patient_id_taken_date', table_name='intraoral_pictures', postgresql_concurrently=True)
+        op.drop_index('ix_xrays_patient_id_taken_date', table_name='xrays', postgresql_concurrently=True)
+        op.drop_index('ix_visits_patient_id_visit_date', table_name='visits', postgresql_concurrently=True)
+        op.drop_index('ix_patients_user_id_created_at', table_name='patients', postgresql_concurrently=True)
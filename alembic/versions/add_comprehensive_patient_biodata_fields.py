@@ -1,7 +1,7 @@
 """Add comprehensive patient biodata fields
 
 Revision ID: add_biodata_fields
-Revises: 
+Revises: initial_tables
 Create Date: 2025-02-12
 
 """
@@ -11,7 +11,7 @@ from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
 revision = 'add_biodata_fields'
-down_revision = None
+down_revision = 'initial_tables'
 branch_labels = None
 depends_on = None
 
@@ -0,0 +1,130 @@
+"""Add content-addressed image blobs with reference counts
+
+Uploaded X-rays and intraoral pictures are stored once per SHA-256 under
+MEDIA_ROOT/blobs and the image rows reference image_blobs through their
+sha256 column. Statement-level triggers on both image tables keep
+image_blobs.ref_count in step with inserts, deletes and patient cascades;
+blobs left at zero references are removed by the blob garbage collector.
+
+Blob rows are backfilled for images uploaded before this revision. Their
+files stay at the path recorded in image_path until
+scripts/migrate_legacy_images.py moves them into the blob store, so run it
+once after upgrading.
+
+The function and trigger SQL must match BLOB_REF_* in src/patients/models.py.
+
+Revision ID: image_blob_store
+Revises: image_upload_columns
+Create Date: 2025-04-02
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'image_blob_store'
+down_revision = 'image_upload_columns'
+branch_labels = None
+depends_on = None
+
+IMAGE_TABLES = ['xrays', 'intraoral_pictures']
+
+BLOB_REF_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION image_blobs_add_refs() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE image_blobs AS blob
+        SET ref_count = blob.ref_count + refs.added, unreferenced_at = NULL
+        FROM (SELECT sha256, count(*) AS added FROM new_rows WHERE sha256 IS NOT NULL GROUP BY sha256) AS refs
+        WHERE blob.sha256 = refs.sha256;
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION image_blobs_drop_refs() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE image_blobs AS blob
+        SET ref_count = blob.ref_count - refs.dropped,
+            unreferenced_at = CASE WHEN blob.ref_count = refs.dropped THEN timezone('utc', now()) END
+        FROM (SELECT sha256, count(*) AS dropped FROM old_rows WHERE sha256 IS NOT NULL GROUP BY sha256) AS refs
+        WHERE blob.sha256 = refs.sha256;
+        RETURN NULL;
+    END $$
+    """,
+]
+BLOB_REF_TRIGGERS = [
+    """
+    CREATE TRIGGER {table}_add_blob_refs AFTER INSERT ON {table}
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION image_blobs_add_refs()
+    """,
+    """
+    CREATE TRIGGER {table}_drop_blob_refs AFTER DELETE ON {table}
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION image_blobs_drop_refs()
+    """,
+]
+
+# Creating the triggers locks both image tables against writes until commit,
+# so the backfill counts every existing reference exactly once.
+BACKFILL_BLOBS = """
+INSERT INTO image_blobs (sha256, content_type, size_bytes, ref_count, created_at)
+SELECT sha256, max(content_type), max(size_bytes), count(*), timezone('utc', now())
+FROM (
+    SELECT sha256, content_type, size_bytes FROM xrays WHERE sha256 IS NOT NULL
+    UNION ALL
+    SELECT sha256, content_type, size_bytes FROM intraoral_pictures WHERE sha256 IS NOT NULL
+) AS images
+GROUP BY sha256
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'image_blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('unreferenced_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('sha256'),
+    )
+    op.create_index(
+        'ix_image_blobs_unreferenced_at',
+        'image_blobs',
+        ['unreferenced_at'],
+        postgresql_where=sa.text('ref_count = 0'),
+    )
+    for statement in BLOB_REF_FUNCTIONS:
+        op.execute(statement)
+    for table in IMAGE_TABLES:
+        for statement in BLOB_REF_TRIGGERS:
+            op.execute(statement.format(table=table))
+    op.execute(BACKFILL_BLOBS)
+    for table in IMAGE_TABLES:
+        op.create_foreign_key(
+            f'{table}_sha256_fkey',
+            table,
+            'image_blobs',
+            ['sha256'],
+            ['sha256'],
+            postgresql_not_valid=True,
+        )
+
+    with op.get_context().autocommit_block():
+        for table in IMAGE_TABLES:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {table}_sha256_fkey')
+            op.create_index(f'ix_{table}_sha256', table, ['sha256'], postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in reversed(IMAGE_TABLES):
+            op.drop_index(f'ix_{table}_sha256', table_name=table, postgresql_concurrently=True)
+    for table in reversed(IMAGE_TABLES):
+        op.drop_constraint(f'{table}_sha256_fkey', table, type_='foreignkey')
+        op.execute(f'DROP TRIGGER {table}_drop_blob_refs ON {table}')
+        op.execute(f'DROP TRIGGER {table}_add_blob_refs ON {table}')
+    op.execute('DROP FUNCTION image_blobs_drop_refs()')
+    op.execute('DROP FUNCTION image_blobs_add_refs()')
+    op.drop_index('ix_image_blobs_unreferenced_at', table_name='image_blobs')
+    op.drop_table('image_blobs')
@@ -0,0 +1,36 @@
+"""Add upload metadata to imaging tables
+
+X-rays and intraoral pictures uploaded through the streaming upload
+endpoints record the stored file's content type, size and SHA-256 digest
+next to its path. Rows that only reference an external image_url leave
+them NULL.
+
+Revision ID: image_upload_columns
+Revises: patient_cascade_deletes
+Create Date: 2025-03-27
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'image_upload_columns'
+down_revision = 'patient_cascade_deletes'
+branch_labels = None
+depends_on = None
+
+IMAGE_TABLES = ['xrays', 'intraoral_pictures']
+
+
+def upgrade() -> None:
+    for table in IMAGE_TABLES:
+        op.add_column(table, sa.Column('content_type', sa.String(length=100), nullable=True))
+        op.add_column(table, sa.Column('size_bytes', sa.BigInteger(), nullable=True))
+        op.add_column(table, sa.Column('sha256', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    for table in IMAGE_TABLES:
+        op.drop_column(table, 'sha256')
+        op.drop_column(table, 'size_bytes')
+        op.drop_column(table, 'content_type')
@@ -0,0 +1,57 @@
+"""Cascade patient deletes to clinical history
+
+Deleting a patient is a single DELETE on patients; Postgres removes the
+patient's biodata, visits, x-rays, intraoral pictures and record planners
+through ON DELETE CASCADE. Every child table already has an index leading
+with patient_id, so each cascade is an index lookup rather than a scan.
+
+Each foreign key is recreated NOT VALID, which only holds the table lock
+briefly, and validated afterwards outside the migration transaction so
+existing rows are checked without blocking writes.
+
+Revision ID: patient_cascade_deletes
+Revises: patient_search_indexes
+Create Date: 2025-03-24
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'patient_cascade_deletes'
+down_revision = 'patient_search_indexes'
+branch_labels = None
+depends_on = None
+
+CHILD_TABLES = [
+    'patient_biodata',
+    'patient_record_planner',
+    'intraoral_pictures',
+    'xrays',
+    'visits',
+]
+
+
+def replace_patient_foreign_keys(ondelete: str | None) -> None:
+    for table in CHILD_TABLES:
+        constraint = f'{table}_patient_id_fkey'
+        op.drop_constraint(constraint, table, type_='foreignkey')
+        op.create_foreign_key(
+            constraint,
+            table,
+            'patients',
+            ['patient_id'],
+            ['id'],
+            ondelete=ondelete,
+            postgresql_not_valid=True,
+        )
+    with op.get_context().autocommit_block():
+        for table in CHILD_TABLES:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {table}_patient_id_fkey')
+
+
+def upgrade() -> None:
+    replace_patient_foreign_keys(ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    replace_patient_foreign_keys(ondelete=None)
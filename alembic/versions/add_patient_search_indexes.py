@@ -0,0 +1,65 @@
+"""Add indexes for patient search
+
+GET /patients/search matches normalised biodata keys: the lower-cased full
+name (fuzzy and substring), phone digits (substring), lower-cased email and
+insurance policy number (prefix). A GIN trigram index on the name and phone
+expressions answers those matches even when the pattern arrives as a bound
+parameter. Email and policy number only ever match by prefix, so they get
+btree text_pattern_ops indexes on (key, patient_id): a prefix is a range
+scan that returns rows already in the order search pages through them.
+
+The expressions must stay identical to SEARCH_* in src/patients/models.py.
+Indexes are built CONCURRENTLY so patient_biodata stays writable.
+
+Revision ID: patient_search_indexes
+Revises: composite_list_indexes
+Create Date: 2025-03-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'patient_search_indexes'
+down_revision = 'composite_list_indexes'
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXES = {
+    'ix_patient_biodata_search_name': "lower((first_name || ' ') || last_name)",
+    'ix_patient_biodata_search_phone': "regexp_replace(phone, '[^0-9]', '', 'g')",
+}
+PREFIX_INDEXES = {
+    'ix_patient_biodata_search_email': 'lower(email)',
+    'ix_patient_biodata_search_policy': 'lower(insurance_policy_number)',
+}
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        for index_name, expression in TRIGRAM_INDEXES.items():
+            op.create_index(
+                index_name,
+                'patient_biodata',
+                [sa.text(f'({expression}) gin_trgm_ops')],
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+            )
+        for index_name, expression in PREFIX_INDEXES.items():
+            op.create_index(
+                index_name,
+                'patient_biodata',
+                [sa.text(f'({expression}) text_pattern_ops'), 'patient_id'],
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        for index_name in reversed([*TRIGRAM_INDEXES, *PREFIX_INDEXES]):
+            op.drop_index(index_name, table_name='patient_biodata', postgresql_concurrently=True)
@@ -0,0 +1,141 @@
+"""Create initial tables
+
+Revision ID: initial_tables
+Revises: 
+Create Date: 2025-02-01
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'initial_tables'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('firstname', sa.String(length=100), nullable=False),
+        sa.Column('lastname', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('password', sa.String(length=255), nullable=False),
+        sa.Column('role', sa.Enum('ADMIN', 'USER', 'DENTIST', 'RECEPTIONIST', name='userrole'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+
+    op.create_table(
+        'patients',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_patients_user_id'), 'patients', ['user_id'], unique=False)
+
+    # The remaining biodata columns are added by add_biodata_fields.
+    op.create_table(
+        'patient_biodata',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('patient_id', sa.Integer(), nullable=False),
+        sa.Column('first_name', sa.String(length=100), nullable=False),
+        sa.Column('last_name', sa.String(length=100), nullable=False),
+        sa.Column('date_of_birth', sa.DateTime(), nullable=True),
+        sa.Column('gender', sa.String(length=20), nullable=True),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('email', sa.String(length=255), nullable=True),
+        sa.Column('address', sa.String(length=500), nullable=True),
+        sa.Column('emergency_contact_name', sa.String(length=100), nullable=True),
+        sa.Column('emergency_contact_phone', sa.String(length=20), nullable=True),
+        sa.Column('medical_history', sa.String(), nullable=True),
+        sa.Column('allergies', sa.String(), nullable=True),
+        sa.Column('medications', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['patient_id'], ['patients.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_patient_biodata_patient_id'), 'patient_biodata', ['patient_id'], unique=True)
+
+    op.create_table(
+        'patient_record_planner',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('patient_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('planned_date', sa.DateTime(), nullable=True),
+        sa.Column('completed_date', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('priority', sa.String(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['patient_id'], ['patients.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_patient_record_planner_patient_id'), 'patient_record_planner', ['patient_id'], unique=False)
+
+    op.create_table(
+        'intraoral_pictures',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('patient_id', sa.Integer(), nullable=False),
+        sa.Column('image_url', sa.String(length=500), nullable=False),
+        sa.Column('image_path', sa.String(length=500), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('picture_type', sa.String(length=100), nullable=True),
+        sa.Column('taken_date', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['patient_id'], ['patients.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_intraoral_pictures_patient_id'), 'intraoral_pictures', ['patient_id'], unique=False)
+
+    op.create_table(
+        'xrays',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('patient_id', sa.Integer(), nullable=False),
+        sa.Column('image_url', sa.String(length=500), nullable=False),
+        sa.Column('image_path', sa.String(length=500), nullable=True),
+        sa.Column('xray_type', sa.String(length=100), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('taken_date', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['patient_id'], ['patients.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_xrays_patient_id'), 'xrays', ['patient_id'], unique=False)
+
+    op.create_table(
+        'visits',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('patient_id', sa.Integer(), nullable=False),
+        sa.Column('visit_date', sa.DateTime(), nullable=False),
+        sa.Column('visit_type', sa.String(length=100), nullable=True),
+        sa.Column('chief_complaint', sa.String(), nullable=True),
+        sa.Column('examination_notes', sa.String(), nullable=True),
+        sa.Column('diagnosis', sa.String(), nullable=True),
+        sa.Column('treatment_plan', sa.String(), nullable=True),
+        sa.Column('treatment_performed', sa.String(), nullable=True),
+        sa.Column('next_appointment', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['patient_id'], ['patients.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_visits_patient_id'), 'visits', ['patient_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('visits')
+    op.drop_table('xrays')
+    op.drop_table('intraoral_pictures')
+    op.drop_table('patient_record_planner')
+    op.drop_table('patient_biodata')
+    op.drop_table('patients')
+    op.drop_table('users')
+    sa.Enum(name='userrole').drop(op.get_bind(), checkfirst=True)
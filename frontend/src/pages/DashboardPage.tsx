@@ -3,7 +3,7 @@ import { useAuth } from '../contexts/AuthContext';
 import { apiService } from '../services/api';
 import { LogOut, Users, Plus, Calendar, FileText, X, ChevronRight, Trash2, AlertTriangle, Settings, User, Search, Image, Scan, Bell, ChevronLeft } from 'lucide-react';
 import { ThemeSelect } from '../components/ThemeSelect';
-import type { Patient, PatientBiodata, Visit, RecordPlanner } from '../types';
+import type { Patient, PatientBiodata, PatientBiodataSummary, Visit, RecordPlanner } from '../types';
 import './DashboardPage.css';
 
 const DUMMY_BIODATA_FIELDS = {
@@ -167,7 +167,7 @@ export const DashboardPage: React.FC = () => {
   const [formLoading, setFormLoading] = useState(false);
   const [settingsOpen, setSettingsOpen] = useState(false);
   const [patientSearchQuery, setPatientSearchQuery] = useState('');
-  const [patientBiodataMap, setPatientBiodataMap] = useState<Record<number, PatientBiodata | null>>({});
+  const [patientBiodataMap, setPatientBiodataMap] = useState<Record<number, PatientBiodataSummary | null>>({});
   const settingsRef = useRef<HTMLDivElement>(null);
 
   useEffect(() => {
@@ -198,7 +198,7 @@ export const DashboardPage: React.FC = () => {
   const displayBiodataMap = patients.length > 0 ? patientBiodataMap : DUMMY_BIODATA_MAP;
   const isDummyData = patients.length === 0;
 
-  const getPatientDisplayLabel = (patient: Patient, biodataMap?: Record<number, PatientBiodata | null>): string => {
+  const getPatientDisplayLabel = (patient: Patient, biodataMap?: Record<number, PatientBiodataSummary | null>): string => {
     const map = biodataMap ?? patientBiodataMap;
     const b = map[patient.id];
     if (b && (b.first_name?.trim() || b.last_name?.trim())) {
@@ -232,11 +232,11 @@ export const DashboardPage: React.FC = () => {
       if (data.length > 0 && !selectedPatient) {
         setSelectedPatient(data[0]);
       }
-      const map: Record<number, PatientBiodata | null> = {};
+      const map: Record<number, PatientBiodataSummary | null> = {};
       await Promise.all(
         data.map(async (p) => {
           try {
-            map[p.id] = await apiService.getBiodata(p.id);
+            map[p.id] = await apiService.getBiodataSummary(p.id);
           } catch {
             map[p.id] = null;
           }
@@ -253,14 +253,11 @@ export const DashboardPage: React.FC = () => {
   const loadPatientDetails = async () => {
     if (!selectedPatient) return;
     try {
-      const [biodataData, visitsData, plannersData] = await Promise.all([
-        apiService.getBiodata(selectedPatient.id).catch(() => null),
-        apiService.getVisits(selectedPatient.id).catch(() => []),
-        apiService.getRecordPlanners(selectedPatient.id).catch(() => []),
-      ]);
+      const chart = await apiService.getPatientChart(selectedPatient.id);
+      const biodataData = chart.biodata;
       setBiodata(biodataData);
-      setVisits(visitsData);
-      setPlanners(plannersData);
+      setVisits(chart.visits ?? []);
+      setPlanners(chart.record_planners ?? []);
       if (biodataData) {
         setPatientBiodataMap((prev) => ({ ...prev, [selectedPatient.id]: biodataData }));
       }
@@ -6,9 +6,12 @@ import type {
   LoginResponse,
   Patient,
   PatientBiodata,
+  PatientBiodataSummary,
   PatientBiodataCreate,
   Visit,
   RecordPlanner,
+  Page,
+  PatientChart,
 } from '../types';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
@@ -26,6 +29,20 @@ class ApiService {
     });
   }
 
+  // Follows next_cursor until the whole list has been read.
+  private async getAllPages<T>(url: string): Promise<T[]> {
+    const items: T[] = [];
+    let cursor: string | null = null;
+    do {
+      const response: { data: Page<T> } = await this.client.get<Page<T>>(url, {
+        params: { limit: 200, ...(cursor ? { cursor } : {}) },
+      });
+      items.push(...response.data.items);
+      cursor = response.data.next_cursor;
+    } while (cursor);
+    return items;
+  }
+
   // Auth endpoints
   async signUp(data: SignUpRequest): Promise<User> {
     const response = await this.client.post<User>('/auth/signup', data);
@@ -60,8 +77,7 @@ class ApiService {
   }
 
   async getPatientsByUser(userId: number): Promise<Patient[]> {
-    const response = await this.client.get<Patient[]>(`/patients/user/${userId}`);
-    return response.data;
+    return this.getAllPages<Patient>(`/patients/user/${userId}`);
   }
 
   async deletePatient(patientId: number): Promise<void> {
@@ -74,11 +90,24 @@ class ApiService {
     return response.data;
   }
 
+  async getPatientChart(patientId: number): Promise<PatientChart> {
+    const response = await this.client.get<PatientChart>(`/patients/${patientId}/chart`, {
+      params: { include: ['biodata', 'visits', 'record_planners'], limit: 200 },
+      paramsSerializer: { indexes: null },
+    });
+    return response.data;
+  }
+
   async getBiodata(patientId: number): Promise<PatientBiodata> {
     const response = await this.client.get<PatientBiodata>(`/patients/biodata/${patientId}`);
     return response.data;
   }
 
+  async getBiodataSummary(patientId: number): Promise<PatientBiodataSummary> {
+    const response = await this.client.get<PatientBiodataSummary>(`/patients/biodata/${patientId}/summary`);
+    return response.data;
+  }
+
   async updateBiodata(patientId: number, data: Partial<PatientBiodataCreate>): Promise<PatientBiodata> {
     const response = await this.client.put<PatientBiodata>(`/patients/biodata/${patientId}`, data);
     return response.data;
@@ -86,14 +115,12 @@ class ApiService {
 
   // Visit endpoints
   async getVisits(patientId: number): Promise<Visit[]> {
-    const response = await this.client.get<Visit[]>(`/patients/visits/${patientId}`);
-    return response.data;
+    return this.getAllPages<Visit>(`/patients/visits/${patientId}`);
   }
 
   // Record planner endpoints
   async getRecordPlanners(patientId: number): Promise<RecordPlanner[]> {
-    const response = await this.client.get<RecordPlanner[]>(`/patients/record-planner/${patientId}`);
-    return response.data;
+    return this.getAllPages<RecordPlanner>(`/patients/record-planner/${patientId}`);
   }
 }
 
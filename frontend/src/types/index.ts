@@ -69,6 +69,18 @@ export interface PatientBiodata {
   updated_at: string;
 }
 
+export interface PatientBiodataSummary {
+  id: number;
+  patient_id: number;
+  first_name: string;
+  last_name: string;
+  date_of_birth: string | null;
+  gender: string | null;
+  phone: string | null;
+  email: string | null;
+  updated_at: string;
+}
+
 export interface PatientBiodataCreate {
   patient_id: number;
   first_name: string;
@@ -126,3 +138,15 @@ export interface RecordPlanner {
   created_at: string;
   updated_at: string;
 }
+
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+export interface PatientChart {
+  patient: Patient;
+  biodata: PatientBiodata | null;
+  visits: Visit[] | null;
+  record_planners: RecordPlanner[] | null;
+}
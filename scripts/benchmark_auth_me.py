@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Measure GET /auth/me throughput against a running DentalDesk server.
+
+Signs up a throwaway user, logs in once and then hammers /auth/me with a fixed
+number of concurrent clients for the given duration. Run it against a build
+before and after a change to compare requests/second and tail latency.
+
+Usage:
+    python3 scripts/benchmark_auth_me.py --base-url http://localhost:8000 --concurrency 50 --duration 20
+"""
+import argparse
+import asyncio
+import secrets
+import statistics
+import time
+
+import httpx
+
+
+async def create_session(client: httpx.AsyncClient) -> str:
+    """Sign up and log in a throwaway user; return its session ID."""
+    email = f"bench-{secrets.token_hex(6)}@example.com"
+    password = secrets.token_urlsafe(16)
+    signup = await client.post(
+        "/auth/signup",
+        json={"firstname": "Bench", "lastname": "User", "email": email, "password": password},
+    )
+    signup.raise_for_status()
+    login = await client.post("/auth/login", json={"email": email, "password": password})
+    login.raise_for_status()
+    return login.json()["session_id"]
+
+
+async def hammer_auth_me(
+    client: httpx.AsyncClient, session_id: str, deadline: float
+) -> list[float]:
+    """Call /auth/me until the deadline; return per-request latencies in seconds."""
+    latencies = []
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.get("/auth/me", cookies={"session_id": session_id})
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+async def run_benchmark(base_url: str, concurrency: int, duration: float) -> None:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        session_id = await create_session(client)
+        deadline = time.perf_counter() + duration
+        workers = [hammer_auth_me(client, session_id, deadline) for _ in range(concurrency)]
+        results = await asyncio.gather(*workers)
+
+    latencies = sorted(latency for worker in results for latency in worker)
+    print(f"requests:     {len(latencies)}")
+    print(f"throughput:   {len(latencies) / duration:.1f} req/s")
+    print(f"latency mean: {statistics.mean(latencies) * 1000:.2f} ms")
+    print(f"latency p50:  {percentile(latencies, 0.50) * 1000:.2f} ms")
+    print(f"latency p99:  {percentile(latencies, 0.99) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GET /auth/me throughput")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.base_url, args.concurrency, args.duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Measure what a patient's imaging gallery costs to load.
+
+Lists one page of the patient's X-rays and intraoral pictures, then fetches
+the chosen derivative of every uploaded image three times: cold (rendered on
+demand unless the upload already rendered it), warm (served from the
+derivative cache) and revalidated with If-None-Match (304). Finally it
+downloads every original in full and as a single Range request for its
+first --range-bytes, as a progressive viewer would. Prints bytes transferred
+and latency percentiles per pass. Patient endpoints need the session of a
+staff user (admin, dentist or receptionist).
+
+Usage:
+    python3 scripts/benchmark_image_gallery.py --base-url http://localhost:8000 --patient-id 1 \
+        --session-id <session cookie> --variant thumbnail
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+def report(label: str, latencies: list[float], transferred: int) -> None:
+    latencies = sorted(latencies)
+    print(
+        f"{label:<12} {transferred / 1024:10.1f} KiB"
+        f"   p50 {percentile(latencies, 0.50) * 1000:8.2f} ms"
+        f"   p99 {percentile(latencies, 0.99) * 1000:8.2f} ms"
+        f"   max {latencies[-1] * 1000:8.2f} ms"
+    )
+
+
+async def fetch_all(
+    client: httpx.AsyncClient, urls: list[str], headers: dict[str, dict[str, str]], concurrency: int
+) -> tuple[list[float], int]:
+    """GET every URL with its headers, if any; return latencies and body bytes."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    transferred = 0
+
+    async def fetch(url: str) -> None:
+        nonlocal transferred
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(url, headers=headers.get(url))
+            latencies.append(time.perf_counter() - started)
+        if response.status_code != 304:
+            response.raise_for_status()
+        transferred += len(response.content)
+
+    await asyncio.gather(*(fetch(url) for url in urls))
+    return latencies, transferred
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    async with httpx.AsyncClient(
+        base_url=args.base_url, cookies={"session_id": args.session_id}, timeout=60
+    ) as client:
+        urls, original_urls = [], []
+        for collection in ("xrays", "intraoral-pictures"):
+            page = await client.get(f"/patients/{collection}/{args.patient_id}", params={"limit": args.limit})
+            page.raise_for_status()
+            for image in page.json()["items"]:
+                if image["sha256"] is None:
+                    continue
+                urls.append(f"/patients/{collection}/{image['id']}/derivatives/{args.variant}")
+                original_urls.append(f"/patients/{collection}/{image['id']}/file")
+        if not urls:
+            raise SystemExit(f"Patient {args.patient_id} has no uploaded images")
+
+        cold, cold_bytes = await fetch_all(client, urls, {}, args.concurrency)
+        warm, warm_bytes = await fetch_all(client, urls, {}, args.concurrency)
+        etags = {url: {"If-None-Match": (await client.get(url)).headers["etag"]} for url in urls}
+        revalidated, revalidated_bytes = await fetch_all(client, urls, etags, args.concurrency)
+
+        full, full_bytes = await fetch_all(client, original_urls, {}, args.concurrency)
+        first_range = {url: {"Range": f"bytes=0-{args.range_bytes - 1}"} for url in original_urls}
+        ranged, ranged_bytes = await fetch_all(client, original_urls, first_range, args.concurrency)
+
+    print(f"{len(urls)} images for patient {args.patient_id}, {args.variant} derivatives:")
+    report("cold", cold, cold_bytes)
+    report("warm", warm, warm_bytes)
+    report("revalidated", revalidated, revalidated_bytes)
+    report("original", full, full_bytes)
+    report("first range", ranged, ranged_bytes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark image gallery loading")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--patient-id", type=int, required=True, help="Patient with uploaded imaging")
+    parser.add_argument("--session-id", required=True, help="Session cookie of a staff user")
+    parser.add_argument("--variant", choices=["thumbnail", "preview"], default="thumbnail")
+    parser.add_argument("--limit", type=int, default=100, help="Images listed per collection")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--range-bytes", type=int, default=1024 * 1024, help="Size of the first Range request")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
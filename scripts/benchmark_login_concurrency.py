@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Measure how a login storm affects latency of unrelated endpoints.
+
+Logs in repeatedly from many concurrent clients (each login runs bcrypt)
+while a separate set of clients probes a cheap non-auth endpoint. Prints the
+probe latency percentiles; with bcrypt on the event loop the probe p99 tracks
+the hash time, with the bounded hashing pool it should stay near idle latency.
+
+Usage:
+    python3 scripts/benchmark_login_concurrency.py --base-url http://localhost:8000 --login-clients 32 --duration 20
+"""
+import argparse
+import asyncio
+import secrets
+import time
+
+import httpx
+
+
+async def create_user(client: httpx.AsyncClient) -> tuple[str, str]:
+    """Sign up a throwaway user; return its credentials."""
+    email = f"bench-{secrets.token_hex(6)}@example.com"
+    password = secrets.token_urlsafe(16)
+    response = await client.post(
+        "/auth/signup",
+        json={"firstname": "Bench", "lastname": "User", "email": email, "password": password},
+    )
+    response.raise_for_status()
+    return email, password
+
+
+async def hammer_login(
+    client: httpx.AsyncClient, credentials: tuple[str, str], deadline: float
+) -> dict[int, int]:
+    """Log in until the deadline; return a count of responses per status code."""
+    email, password = credentials
+    status_counts: dict[int, int] = {}
+    while time.perf_counter() < deadline:
+        response = await client.post("/auth/login", json={"email": email, "password": password})
+        status_counts[response.status_code] = status_counts.get(response.status_code, 0) + 1
+    return status_counts
+
+
+async def probe_endpoint(client: httpx.AsyncClient, path: str, deadline: float) -> list[float]:
+    """Call a non-auth endpoint until the deadline; return latencies in seconds."""
+    latencies = []
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await client.get(path)
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.01)
+    return latencies
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    connections = args.login_clients + args.probe_clients
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        credentials = await create_user(client)
+        deadline = time.perf_counter() + args.duration
+        logins = [hammer_login(client, credentials, deadline) for _ in range(args.login_clients)]
+        probes = [probe_endpoint(client, args.probe_path, deadline) for _ in range(args.probe_clients)]
+        results = await asyncio.gather(*logins, *probes)
+
+    login_counts: dict[int, int] = {}
+    for counts in results[: args.login_clients]:
+        for status_code, count in counts.items():
+            login_counts[status_code] = login_counts.get(status_code, 0) + count
+    latencies = sorted(latency for worker in results[args.login_clients :] for latency in worker)
+
+    print(f"logins by status: {dict(sorted(login_counts.items()))}")
+    print(f"probe requests:   {len(latencies)} to {args.probe_path}")
+    print(f"probe p50:        {percentile(latencies, 0.50) * 1000:.2f} ms")
+    print(f"probe p99:        {percentile(latencies, 0.99) * 1000:.2f} ms")
+    print(f"probe max:        {latencies[-1] * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark non-auth latency during a login storm")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--login-clients", type=int, default=32)
+    parser.add_argument("--probe-clients", type=int, default=4)
+    parser.add_argument("--probe-path", default="/reminder/")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Compare loading a patient chart through /patients/{id}/chart against the
+per-section fan-out the dashboard used to make.
+
+Each iteration loads the same patient both ways: the fan-out issues the six
+section requests concurrently, like the dashboard did, and the aggregate
+issues a single request. Prints latency percentiles for both.
+Patient endpoints need the session of a staff user (admin, dentist or
+receptionist).
+
+Usage:
+    python3 scripts/benchmark_patient_chart.py --base-url http://localhost:8000 --patient-id 1 \
+        --session-id <session cookie> --iterations 200
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+FAN_OUT_PATHS = [
+    "/patients/{patient_id}",
+    "/patients/biodata/{patient_id}",
+    "/patients/visits/{patient_id}",
+    "/patients/record-planner/{patient_id}",
+    "/patients/xrays/{patient_id}",
+    "/patients/intraoral-pictures/{patient_id}",
+]
+
+
+async def load_fan_out(client: httpx.AsyncClient, patient_id: int) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(*(client.get(path.format(patient_id=patient_id)) for path in FAN_OUT_PATHS))
+    return time.perf_counter() - started
+
+
+async def load_chart(client: httpx.AsyncClient, patient_id: int, limit: int) -> float:
+    started = time.perf_counter()
+    response = await client.get(f"/patients/{patient_id}/chart", params={"limit": limit})
+    response.raise_for_status()
+    return time.perf_counter() - started
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+def report(label: str, latencies: list[float]) -> None:
+    latencies = sorted(latencies)
+    print(
+        f"{label:<10} p50 {percentile(latencies, 0.50) * 1000:8.2f} ms"
+        f"   p99 {percentile(latencies, 0.99) * 1000:8.2f} ms"
+        f"   max {latencies[-1] * 1000:8.2f} ms"
+    )
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    async with httpx.AsyncClient(
+        base_url=args.base_url, cookies={"session_id": args.session_id}, timeout=30
+    ) as client:
+        await load_fan_out(client, args.patient_id)
+        await load_chart(client, args.patient_id, args.limit)
+
+        fan_out_latencies, chart_latencies = [], []
+        for _ in range(args.iterations):
+            fan_out_latencies.append(await load_fan_out(client, args.patient_id))
+            chart_latencies.append(await load_chart(client, args.patient_id, args.limit))
+
+    print(f"{args.iterations} loads of patient {args.patient_id}:")
+    report("fan-out", fan_out_latencies)
+    report("chart", chart_latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the patient chart endpoint")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--session-id", required=True, help="Session cookie of a staff user")
+    parser.add_argument("--patient-id", type=int, required=True)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20, help="Items per chart section")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
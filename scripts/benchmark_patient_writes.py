@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Measure write latency for visits, record planners and patient biodata.
+
+Each iteration creates and then updates a visit and a record planner for the
+given patient and updates the patient's biodata, timing every request.
+Prints latency percentiles per operation. The created rows are deleted
+afterwards.
+Patient endpoints need the session of a staff user (admin, dentist or
+receptionist).
+
+Usage:
+    python3 scripts/benchmark_patient_writes.py --base-url http://localhost:8000 --patient-id 1 \
+        --session-id <session cookie> --iterations 200
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+
+async def timed(latencies: list[float], request) -> httpx.Response:
+    started = time.perf_counter()
+    response = await request
+    latencies.append(time.perf_counter() - started)
+    response.raise_for_status()
+    return response
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+def report(label: str, latencies: list[float]) -> None:
+    latencies = sorted(latencies)
+    print(
+        f"{label:<16} p50 {percentile(latencies, 0.50) * 1000:8.2f} ms"
+        f"   p99 {percentile(latencies, 0.99) * 1000:8.2f} ms"
+        f"   max {latencies[-1] * 1000:8.2f} ms"
+    )
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    patient_id = args.patient_id
+    latencies: dict[str, list[float]] = {
+        "create visit": [],
+        "update visit": [],
+        "create planner": [],
+        "update planner": [],
+        "update biodata": [],
+    }
+    visit_ids, planner_ids = [], []
+
+    async with httpx.AsyncClient(
+        base_url=args.base_url, cookies={"session_id": args.session_id}, timeout=30
+    ) as client:
+        biodata = await client.get(f"/patients/biodata/{patient_id}")
+        biodata.raise_for_status()
+        original_occupation = biodata.json().get("occupation")
+
+        try:
+            for i in range(args.iterations):
+                visit = await timed(
+                    latencies["create visit"],
+                    client.post("/patients/visits", json={"patient_id": patient_id, "visit_type": "benchmark"}),
+                )
+                visit_ids.append(visit.json()["id"])
+                await timed(
+                    latencies["update visit"],
+                    client.put(f"/patients/visits/{visit_ids[-1]}", json={"diagnosis": f"benchmark {i}"}),
+                )
+
+                planner = await timed(
+                    latencies["create planner"],
+                    client.post("/patients/record-planner", json={"patient_id": patient_id, "title": "benchmark"}),
+                )
+                planner_ids.append(planner.json()["id"])
+                await timed(
+                    latencies["update planner"],
+                    client.put(f"/patients/record-planner/{planner_ids[-1]}", json={"status": "in_progress"}),
+                )
+
+                await timed(
+                    latencies["update biodata"],
+                    client.put(f"/patients/biodata/{patient_id}", json={"occupation": f"benchmark {i}"}),
+                )
+        finally:
+            await client.put(f"/patients/biodata/{patient_id}", json={"occupation": original_occupation})
+            for visit_id in visit_ids:
+                await client.delete(f"/patients/visits/{visit_id}")
+            for planner_id in planner_ids:
+                await client.delete(f"/patients/record-planner/{planner_id}")
+
+    print(f"{args.iterations} iterations against patient {patient_id}:")
+    for label, values in latencies.items():
+        report(label, values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark patient write endpoints")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--session-id", required=True, help="Session cookie of a staff user")
+    parser.add_argument("--patient-id", type=int, required=True, help="Patient with existing biodata")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark the Python overhead of the hot service-layer reads.
+
+Each iteration opens a fresh session, as a request would, and calls one
+PatientService read (or the login email lookup). Time spent inside the
+database driver is measured with cursor-execute events and subtracted from
+the call's total, which leaves the per-request Python cost: building,
+caching and compiling SQL plus loading the results.
+
+Run once as is and once with --no-statement-cache to see what SQLAlchemy's
+compiled-statement cache saves. On Postgres it also reports how many
+server-side prepared statements the connection holds.
+
+Usage (from the repository root):
+    python3 -m scripts.benchmark_service_overhead --patient-id 1 --email staff@example.com
+    python3 -m scripts.benchmark_service_overhead --patient-id 1 --email staff@example.com --no-statement-cache
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import settings
+from src.database import create_pooled_engine, monitor_statement_cache
+from src.auth.service import USER_BY_EMAIL
+from src.patients.schema import ChartQuery, RecordPlannerPageQuery, VisitPageQuery
+from src.patients.service import PatientService
+
+CALLS = {
+    "user by email": lambda db, args: db.scalar(USER_BY_EMAIL, {"email": args.email}),
+    "patient version": lambda db, args: PatientService(db).get_patient_version(args.patient_id),
+    "biodata": lambda db, args: PatientService(db).get_biodata_by_patient_id(args.patient_id),
+    "biodata version": lambda db, args: PatientService(db).get_biodata_version(args.patient_id),
+    "visits page": lambda db, args: PatientService(db).get_visits_by_patient_id(
+        args.patient_id, VisitPageQuery()
+    ),
+    "planners page": lambda db, args: PatientService(db).get_record_planners_by_patient_id(
+        args.patient_id, RecordPlannerPageQuery()
+    ),
+    "chart": lambda db, args: PatientService(db).get_patient_chart(args.patient_id, ChartQuery()),
+}
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    if args.no_statement_cache:
+        settings.DB_STATEMENT_CACHE_SIZE = 0
+    engine = create_pooled_engine(args.database_url)
+    statement_cache = monitor_statement_cache(engine)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    driver_seconds = [0.0]
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info["cursor_started_at"] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        driver_seconds[0] += time.perf_counter() - conn.info.pop("cursor_started_at")
+
+    print(
+        f"{args.iterations} calls each, statement cache "
+        f"{'off' if args.no_statement_cache else settings.DB_STATEMENT_CACHE_SIZE}:"
+    )
+    try:
+        for label, call in CALLS.items():
+            for _ in range(args.warmup):
+                async with session_factory() as db:
+                    await call(db, args)
+
+            total_seconds, driver_seconds[0] = 0.0, 0.0
+            for _ in range(args.iterations):
+                async with session_factory() as db:
+                    started = time.perf_counter()
+                    await call(db, args)
+                    total_seconds += time.perf_counter() - started
+
+            total_us = total_seconds / args.iterations * 1e6
+            driver_us = driver_seconds[0] / args.iterations * 1e6
+            print(
+                f"  {label:<16} total {total_us:8.1f} us   driver {driver_us:8.1f} us"
+                f"   python {total_us - driver_us:8.1f} us"
+            )
+
+        print(f"\nstatement cache: {statement_cache.stats().model_dump()}")
+        if engine.dialect.name == "postgresql":
+            async with engine.connect() as conn:
+                prepared = await conn.scalar(text("SELECT count(*) FROM pg_prepared_statements"))
+            print(f"prepared statements on one pooled connection: {prepared}")
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark service-layer Python overhead")
+    parser.add_argument("--database-url", default=str(settings.DATABASE_URL))
+    parser.add_argument("--patient-id", type=int, required=True, help="Patient with biodata")
+    parser.add_argument("--email", required=True, help="Email of an existing user")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument(
+        "--no-statement-cache",
+        action="store_true",
+        help="Disable SQLAlchemy's compiled statement cache for comparison",
+    )
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Pick a bcrypt cost factor that fits a login latency budget on this host.
+
+Times bcrypt at increasing cost factors and chooses the highest one whose
+median hash time stays within the target. Run it on production hardware and
+store the result as BCRYPT_ROUNDS; logins re-hash older passwords to the new
+cost in the background.
+
+Usage:
+    python3 scripts/calibrate_bcrypt.py --target-ms 250
+    python3 scripts/calibrate_bcrypt.py --target-ms 250 --write-env
+"""
+import argparse
+import re
+import statistics
+import time
+from pathlib import Path
+
+import bcrypt
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 20
+SAMPLE_PASSWORD = b"calibration-password"
+
+
+def measure_hash_ms(rounds: int, samples: int) -> float:
+    """Median wall time of one bcrypt hash at the given cost, in milliseconds."""
+    timings = []
+    for _ in range(samples):
+        salt = bcrypt.gensalt(rounds=rounds)
+        started = time.perf_counter()
+        bcrypt.hashpw(SAMPLE_PASSWORD, salt)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_rounds(target_ms: float, samples: int) -> int:
+    """Highest cost whose median hash time fits target_ms (never below MIN_ROUNDS)."""
+    chosen_rounds = MIN_ROUNDS
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        elapsed_ms = measure_hash_ms(rounds, samples)
+        print(f"  rounds={rounds:<2}  {elapsed_ms:9.1f} ms")
+        if elapsed_ms > target_ms:
+            break
+        chosen_rounds = rounds
+    return chosen_rounds
+
+
+def write_rounds_to_env(env_path: Path, rounds: int) -> None:
+    """Set BCRYPT_ROUNDS in the .env file, replacing an existing entry."""
+    line = f"BCRYPT_ROUNDS={rounds}"
+    content = env_path.read_text(encoding="utf-8") if env_path.exists() else ""
+    if re.search(r"^BCRYPT_ROUNDS=.*$", content, flags=re.MULTILINE):
+        content = re.sub(r"^BCRYPT_ROUNDS=.*$", line, content, flags=re.MULTILINE)
+    else:
+        content = f"{content.rstrip()}\n{line}\n".lstrip()
+    env_path.write_text(content, encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate the bcrypt cost factor")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Hash time budget per login")
+    parser.add_argument("--samples", type=int, default=5, help="Hashes timed per cost factor")
+    parser.add_argument("--write-env", action="store_true", help="Store the result in .env")
+    args = parser.parse_args()
+
+    print(f"Timing bcrypt against a {args.target_ms:.0f} ms budget:")
+    rounds = calibrate_rounds(args.target_ms, args.samples)
+    print(f"\nBCRYPT_ROUNDS={rounds}")
+
+    if args.write_env:
+        env_path = Path(__file__).resolve().parent.parent / ".env"
+        write_rounds_to_env(env_path, rounds)
+        print(f"  written to {env_path}")
+
+
+if __name__ == "__main__":
+    main()
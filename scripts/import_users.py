@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Bulk-import staff/user accounts from a CSV or JSON Lines file.
+
+Each record needs firstname, lastname, email and password; role is optional
+(admin, user, dentist, receptionist). Records are validated up front,
+passwords are hashed in parallel on a process pool and accounts are inserted
+in batches. Emails that are already registered are skipped, not overwritten.
+
+Usage (from the repository root):
+    python3 -m scripts.import_users staff.csv
+    python3 -m scripts.import_users staff.jsonl --batch-size 500 --workers 8
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from src.auth.schema import SignUpRequest
+from src.auth.service import UserImportService
+from src.database import AsyncSessionLocal, engine
+from src.executors import BoundedExecutor
+
+
+def read_records(path: Path) -> list[dict]:
+    """Load raw records from a .csv (with header row) or .jsonl file."""
+    with path.open(encoding="utf-8", newline="") as source:
+        if path.suffix.lower() == ".csv":
+            return list(csv.DictReader(source))
+        return [json.loads(line) for line in source if line.strip()]
+
+
+def validate_records(records: list[dict]) -> tuple[list[SignUpRequest], list[str]]:
+    """Split records into valid sign-up requests and human-readable errors."""
+    requests, errors = [], []
+    for record_number, record in enumerate(records, start=1):
+        if not record.get("role"):
+            record.pop("role", None)
+        try:
+            requests.append(SignUpRequest.model_validate(record))
+        except ValidationError as e:
+            problems = "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+            errors.append(f"record {record_number}: {problems}")
+    return requests, errors
+
+
+async def import_users(requests: list[SignUpRequest], batch_size: int, workers: int) -> int:
+    """Insert all requests in batches; return how many accounts were created."""
+    executor = BoundedExecutor(
+        name="user-import-hashing",
+        max_workers=workers,
+        max_queue_size=batch_size,
+        use_processes=True,
+    )
+    executor.start()
+    inserted = 0
+    try:
+        for start in range(0, len(requests), batch_size):
+            batch = requests[start : start + batch_size]
+            async with AsyncSessionLocal() as db:
+                inserted_emails = await UserImportService(db, executor).import_batch(batch)
+            inserted += len(inserted_emails)
+            print(f"  {start + len(batch)}/{len(requests)} processed, {inserted} created")
+    finally:
+        executor.close()
+        await engine.dispose()
+    return inserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-import user accounts")
+    parser.add_argument("path", type=Path, help="CSV or JSON Lines file")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+
+    requests, errors = validate_records(read_records(args.path))
+    if errors:
+        print("Invalid records, nothing imported:")
+        for error in errors:
+            print(f"  {error}")
+        raise SystemExit(1)
+
+    inserted = asyncio.run(import_users(requests, args.batch_size, args.workers))
+    print(f"\nDone. {inserted} created, {len(requests) - inserted} skipped (email already registered).")
+
+
+if __name__ == "__main__":
+    main()
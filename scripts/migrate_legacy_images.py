@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Move imaging uploaded before the blob store into it.
+
+The image_blob_store migration counted references for images uploaded
+earlier, but their files stayed at xrays/<patient_id>/<uuid>.<ext> and
+intraoral_pictures/<patient_id>/<uuid>.<ext>. The blob garbage collector
+only removes files under blobs/, so those files would never be reclaimed.
+
+For every such row this links its file to blobs/<ab>/<cd>/<sha256>, after
+checking the content matches the recorded hash, then points image_path and
+image_url at the blob and commits. The legacy file is removed once its
+rows are committed. Rows whose file is missing or does not match are
+reported and left alone. Safe to re-run: rows already in the blob store
+are skipped.
+
+Usage (from the repository root, with MEDIA_ROOT and DATABASE_URL set as for the app):
+    python3 -m scripts.migrate_legacy_images
+    python3 -m scripts.migrate_legacy_images --batch-size 200 --dry-run
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+from pathlib import Path
+
+import anyio
+from sqlalchemy import bindparam, select, update
+
+from src.config import settings
+from src.database import AsyncSessionLocal, engine
+from src.patients.blob_store import blob_store
+from src.patients.constants import BLOB_DIR, UPLOADED_IMAGE_URLS
+from src.patients.models import IntraoralPicture, XRay
+
+
+def file_sha256(path: Path) -> str:
+    with path.open("rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def link_into_store(legacy: Path, sha256: str) -> None:
+    """Give the blob path the legacy file's content, atomically."""
+    target = blob_store.path(sha256)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(f"{sha256}.{os.getpid()}.tmp")
+    partial.unlink(missing_ok=True)
+    os.link(legacy, partial)
+    os.replace(partial, target)
+
+
+async def place_blob(legacy: Path, sha256: str) -> str | None:
+    """Make sure the blob exists; return why the row must be skipped, if it must."""
+    if await blob_store.contains(sha256):
+        return None
+    if not await anyio.Path(legacy).is_file():
+        return f"{legacy} is missing"
+    if await anyio.to_thread.run_sync(file_sha256, legacy) != sha256:
+        return f"{legacy} does not match its sha256"
+    await anyio.to_thread.run_sync(link_into_store, legacy, sha256)
+    return None
+
+
+async def migrate_table(model: type[XRay] | type[IntraoralPicture], batch_size: int, dry_run: bool) -> int:
+    """Move one table's legacy files in id order; return how many rows were moved."""
+    legacy_rows = (
+        select(model.id, model.image_path, model.sha256)
+        .where(
+            model.sha256.is_not(None),
+            model.image_path.not_like(f"{BLOB_DIR}/%"),
+            model.id > bindparam("after_id"),
+        )
+        .order_by(model.id)
+        .limit(batch_size)
+    )
+    # A Core update, so the batch runs as one executemany.
+    point_at_blob = (
+        update(model.__table__)
+        .where(model.id == bindparam("row_id"))
+        .values(image_path=bindparam("blob_path"), image_url=bindparam("blob_url"))
+    )
+    url = UPLOADED_IMAGE_URLS[model.__tablename__]
+    moved, after_id = 0, 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(legacy_rows, {"after_id": after_id})).all()
+            if not rows:
+                return moved
+            after_id = rows[-1].id
+            updates, legacy_files = [], set()
+            for row in rows:
+                legacy = settings.MEDIA_ROOT / row.image_path
+                problem = None if dry_run else await place_blob(legacy, row.sha256)
+                if problem:
+                    print(f"  {model.__tablename__} {row.id}: skipped, {problem}")
+                    continue
+                updates.append(
+                    {
+                        "row_id": row.id,
+                        "blob_path": blob_store.relative_path(row.sha256).as_posix(),
+                        "blob_url": url.format(id=row.id),
+                    }
+                )
+                legacy_files.add(legacy)
+            if updates and not dry_run:
+                await db.execute(point_at_blob, updates)
+                await db.commit()
+        if not dry_run:
+            for legacy in legacy_files:
+                await anyio.Path(legacy).unlink(missing_ok=True)
+        moved += len(updates)
+        print(f"  {model.__tablename__}: {moved} {'to move' if dry_run else 'moved'}")
+
+
+async def migrate(batch_size: int, dry_run: bool) -> int:
+    moved = 0
+    try:
+        for model in (XRay, IntraoralPicture):
+            moved += await migrate_table(model, batch_size, dry_run)
+        return moved
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move pre-blob-store imaging into the blob store")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows updated per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the rows that would move")
+    args = parser.parse_args()
+    moved = asyncio.run(migrate(args.batch_size, args.dry_run))
+    print(f"\nDone. {moved} images {'would move' if args.dry_run else 'moved'} into {settings.MEDIA_ROOT / BLOB_DIR}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,20 @@
-# App-specific config for auth
-# from pydantic_settings import BaseSettings
-#
-# class AuthSettings(BaseSettings):
-#     ...
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class AuthSettings(BaseSettings):
+    PASSWORD_HASHING_WORKERS: int = 4
+    PASSWORD_HASHING_MAX_QUEUE: int = 64
+    PASSWORD_HASHING_USE_PROCESSES: bool = False
+    BCRYPT_ROUNDS: int = Field(default=12, ge=4, le=31)
+    SESSION_CACHE_MAX_ENTRIES: int = 10000
+    SESSION_CACHE_TTL_SECONDS: float = 30.0
+    SESSION_REFRESH_THRESHOLD: float = Field(default=0.5, gt=0, le=1)
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+auth_settings = AuthSettings()
@@ -1,6 +1,14 @@
 from enum import Enum
 
 SESSION_TTL_SECONDS = 86400
+SESSION_KEY_PREFIX = "session:"
+USER_SESSIONS_KEY_PREFIX = "user_sessions:"
+SESSION_HINT_LENGTH = 8
+PASSWORD_HASHING_RETRY_AFTER_SECONDS = 1
+SESSION_INVALIDATION_CHANNEL = "auth:session-invalidations"
+SESSION_INVALIDATION_RETRY_SECONDS = 1
+# Idle pub/sub reads wake this often, well inside the Redis socket timeout.
+SESSION_INVALIDATION_POLL_SECONDS = 1
 
 
 class UserRole(str, Enum):
@@ -1,17 +1,42 @@
-from fastapi import Depends, HTTPException, Cookie
+from fastapi import Depends, HTTPException, Cookie, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from redis.asyncio import Redis
 from src.database import get_db
 from src.redis import get_redis
 from src.auth.service import AuthService
-from src.auth.exceptions import SessionNotFoundError
+from src.auth.schema import UserResponse, AuthenticatedSession
+from src.auth.constants import UserRole, SESSION_TTL_SECONDS
+from src.auth.config import auth_settings
+from src.auth.session_store import SessionStore, RedisSessionStore
+from src.auth.exceptions import SessionNotFoundError, UserNotFoundError
+from src.auth.utils import password_hashing_executor
+from src.auth.session_cache import SessionUserCache, session_user_cache
+from src.executors import BoundedExecutor
+
+
+async def get_password_executor() -> BoundedExecutor:
+    return password_hashing_executor
+
+
+async def get_session_cache() -> SessionUserCache:
+    return session_user_cache
+
+
+async def get_session_store(redis: Redis = Depends(get_redis)) -> SessionStore:
+    return RedisSessionStore(
+        redis,
+        ttl_seconds=SESSION_TTL_SECONDS,
+        refresh_threshold=auth_settings.SESSION_REFRESH_THRESHOLD,
+    )
 
 
 async def get_auth_service(
     db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
+    sessions: SessionStore = Depends(get_session_store),
+    password_executor: BoundedExecutor = Depends(get_password_executor),
+    session_cache: SessionUserCache = Depends(get_session_cache),
 ) -> AuthService:
-    return AuthService(db, redis)
+    return AuthService(db, sessions, password_executor, session_cache)
 
 
 async def get_current_session_id(session_id: str | None = Cookie(None)) -> str:
@@ -20,11 +45,32 @@ async def get_current_session_id(session_id: str | None = Cookie(None)) -> str:
     return session_id
 
 
-async def get_current_user(
+async def get_current_session(
+    request: Request,
     session_id: str = Depends(get_current_session_id),
     auth_service: AuthService = Depends(get_auth_service),
-):
+) -> AuthenticatedSession:
+    """The caller's session. When reading it extended the session's TTL, the
+    request is marked so the reissue_session_cookie middleware re-issues the
+    cookie on whatever response the endpoint returns."""
     try:
-        return await auth_service.get_user_from_session(session_id)
-    except SessionNotFoundError:
+        session = await auth_service.get_user_from_session(session_id)
+    except (SessionNotFoundError, UserNotFoundError):
         raise HTTPException(status_code=401, detail="Invalid or expired session")
+    if session.refreshed:
+        request.state.refreshed_session_id = session_id
+    return session
+
+
+async def get_current_user(
+    session: AuthenticatedSession = Depends(get_current_session),
+) -> UserResponse:
+    return session.user
+
+
+async def require_admin(
+    current_user: UserResponse = Depends(get_current_user),
+) -> UserResponse:
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Admin role required")
+    return current_user
@@ -1,18 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
-from src.auth.schema import SignUpRequest, LoginRequest, LoginResponse, UserResponse, MessageResponse
-from src.auth.service import AuthService
-from src.auth.dependencies import get_auth_service, get_current_user, get_current_session_id
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response
+from src.auth.schema import (
+    SignUpRequest,
+    LoginRequest,
+    LoginResponse,
+    UserResponse,
+    MessageResponse,
+    AuthStatsResponse,
+    RoleUpdateRequest,
+    ActiveSessionResponse,
+)
+from src.auth.service import AuthService, rehash_outdated_password
+from src.auth.utils import set_session_cookie
+from src.auth.dependencies import (
+    get_auth_service,
+    get_current_user,
+    get_current_session_id,
+    get_password_executor,
+    get_session_cache,
+    require_admin,
+)
 from src.auth.exceptions import (
     EmailAlreadyExistsError,
     InvalidCredentialsError,
     UserNotFoundError,
 )
-from src.config import settings
-from src.auth.constants import SESSION_TTL_SECONDS
+from src.auth.constants import PASSWORD_HASHING_RETRY_AFTER_SECONDS
+from src.exceptions import ExecutorSaturatedError
+from src.executors import BoundedExecutor
+from src.auth.session_cache import SessionUserCache
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def raise_password_hashing_busy() -> None:
+    raise HTTPException(
+        status_code=503,
+        detail="Too many concurrent sign-ins, please retry shortly",
+        headers={"Retry-After": str(PASSWORD_HASHING_RETRY_AFTER_SECONDS)},
+    )
+
+
 @router.post("/signup", response_model=UserResponse, status_code=201)
 async def sign_up(
     request: SignUpRequest,
@@ -23,28 +50,33 @@ async def sign_up(
         return await auth_service.sign_up(request)
     except EmailAlreadyExistsError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorSaturatedError:
+        raise_password_hashing_busy()
 
 
 @router.post("/login", response_model=LoginResponse)
 async def login(
     request: LoginRequest,
     response: Response,
+    background_tasks: BackgroundTasks,
     auth_service: AuthService = Depends(get_auth_service),
 ):
-    """Login and create a session."""
+    """Login and create a session. Outdated password hashes are upgraded after responding."""
     try:
-        user, session_id = await auth_service.login(request.email, request.password)
-        response.set_cookie(
-            key="session_id",
-            value=session_id,
-            httponly=True,
-            secure=settings.ENVIRONMENT == "production",
-            samesite="lax",
-            max_age=SESSION_TTL_SECONDS,
-        )
-        return LoginResponse(user=user, session_id=session_id)
+        result = await auth_service.login(request.email, request.password)
+        set_session_cookie(response, result.session_id)
+        if result.outdated_password_hash:
+            background_tasks.add_task(
+                rehash_outdated_password,
+                result.user.id,
+                request.password,
+                result.outdated_password_hash,
+            )
+        return LoginResponse(user=result.user, session_id=result.session_id)
     except InvalidCredentialsError as e:
         raise HTTPException(status_code=401, detail=str(e))
+    except ExecutorSaturatedError:
+        raise_password_hashing_busy()
 
 
 @router.post("/logout", response_model=MessageResponse)
@@ -62,21 +94,33 @@ async def logout(
         raise HTTPException(status_code=401, detail=str(e))
 
 
-@router.get("/me", response_model=UserResponse)
-async def get_current_user_info(
+@router.post("/logout-all", response_model=MessageResponse)
+async def logout_everywhere(
     response: Response,
+    current_user: UserResponse = Depends(get_current_user),
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    """Invalidate every session of the current user, including this one."""
+    revoked = await auth_service.logout_everywhere(current_user.id)
+    response.delete_cookie(key="session_id")
+    return MessageResponse(message=f"Logged out of {revoked} session(s)")
+
+
+@router.get("/sessions", response_model=list[ActiveSessionResponse])
+async def list_sessions(
     session_id: str = Depends(get_current_session_id),
     current_user: UserResponse = Depends(get_current_user),
+    auth_service: AuthService = Depends(get_auth_service),
 ):
-    """Get current user information. Refreshes session cookie for sliding expiry."""
-    response.set_cookie(
-        key="session_id",
-        value=session_id,
-        httponly=True,
-        secure=settings.ENVIRONMENT == "production",
-        samesite="lax",
-        max_age=SESSION_TTL_SECONDS,
-    )
+    """List the current user's active sessions."""
+    return await auth_service.list_sessions(current_user.id, session_id)
+
+
+@router.get("/me", response_model=UserResponse)
+async def get_current_user_info(
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """Get current user information."""
     return current_user
 
 
@@ -91,3 +135,30 @@ async def delete_account(
         return MessageResponse(message="Account deleted successfully")
     except UserNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.patch("/users/{user_id}/role", response_model=UserResponse)
+async def change_user_role(
+    user_id: int,
+    request: RoleUpdateRequest,
+    _: UserResponse = Depends(require_admin),
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    """Change a user's role (admin only)."""
+    try:
+        return await auth_service.change_user_role(user_id, request.role)
+    except UserNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/stats", response_model=AuthStatsResponse)
+async def get_auth_stats(
+    _: UserResponse = Depends(require_admin),
+    password_executor: BoundedExecutor = Depends(get_password_executor),
+    session_cache: SessionUserCache = Depends(get_session_cache),
+):
+    """Get password hashing pool and session cache statistics (admin only)."""
+    return AuthStatsResponse(
+        password_hashing=password_executor.stats(),
+        session_cache=session_cache.stats(),
+    )
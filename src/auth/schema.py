@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
 from src.auth.constants import UserRole
+from src.executors import ExecutorStats
 
 
 class SignUpRequest(BaseModel):
@@ -26,6 +27,23 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
+class AuthenticatedSession(BaseModel):
+    user: UserResponse
+    refreshed: bool
+
+
+class ActiveSessionResponse(BaseModel):
+    session_hint: str
+    expires_in_seconds: int
+    current: bool
+
+
+class LoginResult(BaseModel):
+    user: UserResponse
+    session_id: str
+    outdated_password_hash: str | None = None
+
+
 class LoginResponse(BaseModel):
     user: UserResponse
     session_id: str
@@ -33,3 +51,22 @@ class LoginResponse(BaseModel):
 
 class MessageResponse(BaseModel):
     message: str
+
+
+class RoleUpdateRequest(BaseModel):
+    role: UserRole
+
+
+class SessionCacheStats(BaseModel):
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    invalidations: int
+    listener_connected: bool
+
+
+class AuthStatsResponse(BaseModel):
+    password_hashing: ExecutorStats
+    session_cache: SessionCacheStats
@@ -1,10 +1,28 @@
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from redis.asyncio import Redis
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.dialects.postgresql import insert
+from src.database import AsyncSessionLocal
 from src.auth.models import User
-from src.auth.schema import SignUpRequest, UserResponse
-from src.auth.constants import SESSION_TTL_SECONDS
-from src.auth.utils import hash_password, verify_password, generate_session_id
+from src.auth.schema import (
+    SignUpRequest,
+    UserResponse,
+    AuthenticatedSession,
+    ActiveSessionResponse,
+    LoginResult,
+)
+from src.auth.constants import UserRole, SESSION_HINT_LENGTH
+from src.auth.session_store import SessionStore
+from src.auth.session_cache import SessionUserCache
+from src.auth.utils import (
+    hash_password,
+    verify_password,
+    generate_session_id,
+    password_hash_is_outdated,
+    password_hashing_executor,
+)
+from src.executors import BoundedExecutor
+from src.exceptions import ExecutorSaturatedError
 from src.auth.exceptions import (
     EmailAlreadyExistsError,
     InvalidCredentialsError,
@@ -12,57 +30,86 @@ from src.auth.exceptions import (
     SessionNotFoundError,
 )
 
+# Built once: login looks users up by email on every attempt.
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+
 
 class AuthService:
-    def __init__(self, db: AsyncSession, redis: Redis):
+    def __init__(
+        self,
+        db: AsyncSession,
+        sessions: SessionStore,
+        password_executor: BoundedExecutor,
+        session_cache: SessionUserCache,
+    ):
         self.db = db
-        self.redis = redis
+        self.sessions = sessions
+        self.password_executor = password_executor
+        self.session_cache = session_cache
 
     async def sign_up(self, request: SignUpRequest) -> UserResponse:
-        existing_user = await self.db.scalar(
-            select(User).where(User.email == request.email)
+        hashed_password = await self.password_executor.run(
+            hash_password, request.password
         )
-        if existing_user:
-            raise EmailAlreadyExistsError("Email already registered")
-        
-        hashed_password = hash_password(request.password)
-        new_user = User(
-            firstname=request.firstname,
-            lastname=request.lastname,
-            email=request.email,
-            password=hashed_password,
-            role=request.role,
+        new_user = await self.db.scalar(
+            insert(User)
+            .values(user_row(request, hashed_password))
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User)
         )
-        self.db.add(new_user)
+        if new_user is None:
+            raise EmailAlreadyExistsError("Email already registered")
         await self.db.commit()
-        await self.db.refresh(new_user)
         
         return UserResponse.model_validate(new_user)
 
-    async def login(self, email: str, password: str) -> tuple[UserResponse, str]:
-        user = await self.db.scalar(select(User).where(User.email == email))
+    async def login(self, email: str, password: str) -> LoginResult:
+        user = await self.db.scalar(USER_BY_EMAIL, {"email": email})
         if not user:
             raise InvalidCredentialsError("Invalid email or password")
         
-        if not verify_password(password, user.password):
+        if not await self.password_executor.run(
+            verify_password, password, user.password
+        ):
             raise InvalidCredentialsError("Invalid email or password")
         
         session_id = generate_session_id()
         user_data = UserResponse.model_validate(user)
         
-        await self.redis.setex(
-            f"session:{session_id}",
-            SESSION_TTL_SECONDS,
-            str(user.id),
-        )
+        await self.sessions.create(session_id, user.id)
         
-        return user_data, session_id
+        return LoginResult(
+            user=user_data,
+            session_id=session_id,
+            outdated_password_hash=(
+                user.password if password_hash_is_outdated(user.password) else None
+            ),
+        )
 
     async def logout(self, session_id: str) -> None:
-        deleted = await self.redis.delete(f"session:{session_id}")
+        deleted = await self.sessions.delete(session_id)
+        await self.session_cache.invalidate_session(session_id)
         if not deleted:
             raise SessionNotFoundError("Session not found or already expired")
 
+    async def logout_everywhere(self, user_id: int) -> int:
+        revoked = await self.sessions.delete_user_sessions(user_id)
+        await self.session_cache.invalidate_user(user_id)
+        return revoked
+
+    async def list_sessions(
+        self, user_id: int, current_session_id: str
+    ) -> list[ActiveSessionResponse]:
+        active_sessions = await self.sessions.list_user_sessions(user_id)
+        return [
+            ActiveSessionResponse(
+                session_hint=session.session_id[:SESSION_HINT_LENGTH],
+                expires_in_seconds=session.expires_in_seconds,
+                current=session.session_id == current_session_id,
+            )
+            for session in active_sessions
+        ]
+
     async def delete_user(self, user_id: int) -> None:
         user = await self.db.get(User, user_id)
         if not user:
@@ -70,16 +117,90 @@ class AuthService:
         
         await self.db.delete(user)
         await self.db.commit()
+        await self.logout_everywhere(user_id)
 
-    async def get_user_from_session(self, session_id: str) -> UserResponse:
-        key = f"session:{session_id}"
-        user_id_str = await self.redis.get(key)
-        if not user_id_str:
-            raise SessionNotFoundError("Session not found or expired")
-        await self.redis.expire(key, SESSION_TTL_SECONDS)
-        user_id = int(user_id_str)
+    async def change_user_role(self, user_id: int, role: UserRole) -> UserResponse:
         user = await self.db.get(User, user_id)
         if not user:
             raise UserNotFoundError("User not found")
-        
+
+        user.role = role
+        await self.db.commit()
+        await self.session_cache.invalidate_user(user_id)
         return UserResponse.model_validate(user)
+
+    async def get_user_from_session(self, session_id: str) -> AuthenticatedSession:
+        cached_user = self.session_cache.get(session_id)
+        if cached_user:
+            return AuthenticatedSession(user=cached_user, refreshed=False)
+
+        observed_generation = self.session_cache.generation
+        session = await self.sessions.read(session_id)
+        if not session:
+            raise SessionNotFoundError("Session not found or expired")
+        user = await self.db.get(User, session.user_id)
+        if not user:
+            raise UserNotFoundError("User not found")
+        
+        user_data = UserResponse.model_validate(user)
+        self.session_cache.put(session_id, user_data, observed_generation)
+        return AuthenticatedSession(user=user_data, refreshed=session.refreshed)
+
+
+class UserImportService:
+    """Bulk account creation for onboarding whole clinics at once."""
+
+    def __init__(self, db: AsyncSession, password_executor: BoundedExecutor):
+        self.db = db
+        self.password_executor = password_executor
+
+    async def import_batch(self, requests: list[SignUpRequest]) -> list[str]:
+        """Create one batch of users; return the emails that were newly inserted.
+
+        Passwords are hashed concurrently on the executor and the batch is
+        written with a single INSERT that skips emails already registered.
+        """
+        hashed_passwords = await asyncio.gather(
+            *(self.password_executor.run(hash_password, request.password) for request in requests)
+        )
+        rows = [
+            user_row(request, hashed_password)
+            for request, hashed_password in zip(requests, hashed_passwords)
+        ]
+        inserted_emails = await self.db.scalars(
+            insert(User)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User.email)
+        )
+        await self.db.commit()
+        return list(inserted_emails)
+
+
+def user_row(request: SignUpRequest, hashed_password: str) -> dict:
+    return {
+        **request.model_dump(exclude={"password"}),
+        "password": hashed_password,
+    }
+
+
+async def rehash_outdated_password(
+    user_id: int, plain_password: str, outdated_hash: str
+) -> None:
+    """Re-hash a password at the configured bcrypt cost after login has responded.
+
+    Uses its own DB session because the request's session is closed by then,
+    and only overwrites the hash if it has not changed in the meantime.
+    """
+    try:
+        new_hash = await password_hashing_executor.run(hash_password, plain_password)
+    except ExecutorSaturatedError:
+        return
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(User)
+            .where(User.id == user_id, User.password == outdated_hash)
+            .values(password=new_hash)
+        )
+        await db.commit()
@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.auth.config import auth_settings
+from src.auth.constants import (
+    SESSION_INVALIDATION_CHANNEL,
+    SESSION_INVALIDATION_POLL_SECONDS,
+    SESSION_INVALIDATION_RETRY_SECONDS,
+)
+from src.auth.schema import SessionCacheStats, UserResponse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    user: UserResponse
+    expires_at: float
+
+
+class SessionUserCache:
+    """Per-worker LRU/TTL cache of session_id -> UserResponse.
+
+    Workers stay consistent through invalidation messages published on a
+    Redis channel that every worker subscribes to. Call start_listener() in
+    the app lifespan and stop_listener() on shutdown.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self._entries: OrderedDict[str, CachedUser] = OrderedDict()
+        self._sessions_by_user: dict[int, set[str]] = {}
+        self._redis: Redis | None = None
+        self._listener_task: asyncio.Task | None = None
+        self._listener_connected = False
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get(self, session_id: str) -> UserResponse | None:
+        cached = self._entries.get(session_id)
+        if cached is None or cached.expires_at <= time.monotonic():
+            if cached is not None:
+                self._discard_session(session_id)
+            self._misses += 1
+            return None
+        self._entries.move_to_end(session_id)
+        self._hits += 1
+        return cached.user
+
+    def put(self, session_id: str, user: UserResponse, observed_generation: int) -> None:
+        """Cache user unless an invalidation arrived since observed_generation was read.
+
+        Nothing is cached while the invalidation listener is disconnected,
+        since other workers' logouts would go unnoticed.
+        """
+        if not self._listener_connected or observed_generation != self.generation:
+            return
+        self._discard_session(session_id)
+        self._entries[session_id] = CachedUser(user, time.monotonic() + self.ttl_seconds)
+        self._sessions_by_user.setdefault(user.id, set()).add(session_id)
+        while len(self._entries) > self.max_entries:
+            oldest_session_id = next(iter(self._entries))
+            self._discard_session(oldest_session_id)
+
+    async def invalidate_session(self, session_id: str) -> None:
+        self._apply_invalidation(f"session:{session_id}")
+        await self._publish(f"session:{session_id}")
+
+    async def invalidate_user(self, user_id: int) -> None:
+        self._apply_invalidation(f"user:{user_id}")
+        await self._publish(f"user:{user_id}")
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+        self._sessions_by_user.clear()
+
+    def _apply_invalidation(self, message: str) -> None:
+        self.generation += 1
+        self._invalidations += 1
+        kind, _, identifier = message.partition(":")
+        if kind == "session":
+            self._discard_session(identifier)
+        elif kind == "user" and identifier.isdigit():
+            for session_id in self._sessions_by_user.pop(int(identifier), set()):
+                self._entries.pop(session_id, None)
+
+    def _discard_session(self, session_id: str) -> None:
+        cached = self._entries.pop(session_id, None)
+        if cached is None:
+            return
+        user_sessions = self._sessions_by_user.get(cached.user.id)
+        if user_sessions is not None:
+            user_sessions.discard(session_id)
+            if not user_sessions:
+                del self._sessions_by_user[cached.user.id]
+
+    async def _publish(self, message: str) -> None:
+        if self._redis is None:
+            return
+        await self._redis.publish(SESSION_INVALIDATION_CHANNEL, message)
+
+    async def start_listener(self, redis: Redis) -> None:
+        self._redis = redis
+        self._listener_task = asyncio.create_task(self._listen_for_invalidations())
+
+    async def stop_listener(self) -> None:
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        self._listener_connected = False
+        self._redis = None
+        self.clear()
+
+    async def _listen_for_invalidations(self) -> None:
+        while True:
+            try:
+                await self._consume_invalidations()
+            except (RedisError, OSError) as e:
+                logger.warning("Session invalidation listener lost Redis: %s", e)
+            self._listener_connected = False
+            self.clear()
+            await asyncio.sleep(SESSION_INVALIDATION_RETRY_SECONDS)
+
+    async def _consume_invalidations(self) -> None:
+        """Apply invalidations until the subscription fails.
+
+        Messages are polled with an explicit read timeout rather than
+        listen(), so a quiet channel never trips the client's socket_timeout
+        and each poll runs the connection's periodic health-check PING.
+        """
+        async with self._redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+            await pubsub.subscribe(SESSION_INVALIDATION_CHANNEL)
+            self.clear()
+            self._listener_connected = True
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=SESSION_INVALIDATION_POLL_SECONDS
+                )
+                if message is not None:
+                    self._apply_invalidation(message["data"])
+
+    def stats(self) -> SessionCacheStats:
+        return SessionCacheStats(
+            entries=len(self._entries),
+            max_entries=self.max_entries,
+            ttl_seconds=self.ttl_seconds,
+            hits=self._hits,
+            misses=self._misses,
+            invalidations=self._invalidations,
+            listener_connected=self._listener_connected,
+        )
+
+
+session_user_cache = SessionUserCache(
+    max_entries=auth_settings.SESSION_CACHE_MAX_ENTRIES,
+    ttl_seconds=auth_settings.SESSION_CACHE_TTL_SECONDS,
+)
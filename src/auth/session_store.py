@@ -0,0 +1,212 @@
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+
+from src.auth.constants import SESSION_KEY_PREFIX, USER_SESSIONS_KEY_PREFIX
+
+# Reads a session and pushes its expiry back only once the remaining TTL has
+# dropped below the refresh threshold, all in one round trip. The owner's
+# session index is extended with it so the index always outlives its members.
+READ_AND_REFRESH_SESSION_SCRIPT = """
+local user_id = redis.call('GET', KEYS[1])
+if not user_id then
+    return nil
+end
+local remaining = redis.call('TTL', KEYS[1])
+if remaining >= 0 and remaining < tonumber(ARGV[2]) then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+    redis.call('EXPIRE', ARGV[3] .. user_id, ARGV[1])
+    return {user_id, 1}
+end
+return {user_id, 0}
+"""
+
+DELETE_SESSION_SCRIPT = """
+local user_id = redis.call('GET', KEYS[1])
+if not user_id then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('SREM', ARGV[1] .. user_id, ARGV[2])
+return 1
+"""
+
+DELETE_USER_SESSIONS_SCRIPT = """
+local session_ids = redis.call('SMEMBERS', KEYS[1])
+for _, session_id in ipairs(session_ids) do
+    redis.call('DEL', ARGV[1] .. session_id)
+end
+redis.call('DEL', KEYS[1])
+return #session_ids
+"""
+
+
+@dataclass(frozen=True)
+class SessionLookup:
+    user_id: int
+    refreshed: bool
+
+
+@dataclass(frozen=True)
+class ActiveSession:
+    session_id: str
+    expires_in_seconds: int
+
+
+class SessionStore(ABC):
+    """Session persistence with lazy sliding expiry and a per-user index.
+
+    read() extends a session only when less than refresh_threshold of
+    ttl_seconds remains, and reports whether it did so the caller knows when
+    the cookie needs re-issuing. Every session is also recorded in its
+    owner's index so one user's sessions can be listed or revoked without
+    scanning the keyspace.
+    """
+
+    def __init__(self, ttl_seconds: int, refresh_threshold: float):
+        self.ttl_seconds = ttl_seconds
+        self.refresh_below_seconds = int(ttl_seconds * refresh_threshold)
+
+    @abstractmethod
+    async def create(self, session_id: str, user_id: int) -> None: ...
+
+    @abstractmethod
+    async def read(self, session_id: str) -> SessionLookup | None: ...
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> bool: ...
+
+    @abstractmethod
+    async def list_user_sessions(self, user_id: int) -> list[ActiveSession]: ...
+
+    @abstractmethod
+    async def delete_user_sessions(self, user_id: int) -> int: ...
+
+
+class RedisSessionStore(SessionStore):
+    def __init__(self, redis: Redis, ttl_seconds: int, refresh_threshold: float):
+        super().__init__(ttl_seconds, refresh_threshold)
+        self.redis = redis
+        self._read_and_refresh = redis.register_script(READ_AND_REFRESH_SESSION_SCRIPT)
+        self._delete_session = redis.register_script(DELETE_SESSION_SCRIPT)
+        self._delete_user_sessions = redis.register_script(DELETE_USER_SESSIONS_SCRIPT)
+
+    async def create(self, session_id: str, user_id: int) -> None:
+        index_key = user_sessions_key(user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.setex(session_key(session_id), self.ttl_seconds, str(user_id))
+            pipe.sadd(index_key, session_id)
+            pipe.expire(index_key, self.ttl_seconds)
+            await pipe.execute()
+
+    async def read(self, session_id: str) -> SessionLookup | None:
+        result = await self._read_and_refresh(
+            keys=[session_key(session_id)],
+            args=[self.ttl_seconds, self.refresh_below_seconds, USER_SESSIONS_KEY_PREFIX],
+        )
+        if not result:
+            return None
+        user_id, refreshed = result
+        return SessionLookup(user_id=int(user_id), refreshed=bool(refreshed))
+
+    async def delete(self, session_id: str) -> bool:
+        deleted = await self._delete_session(
+            keys=[session_key(session_id)],
+            args=[USER_SESSIONS_KEY_PREFIX, session_id],
+        )
+        return bool(deleted)
+
+    async def list_user_sessions(self, user_id: int) -> list[ActiveSession]:
+        index_key = user_sessions_key(user_id)
+        session_ids = sorted(await self.redis.smembers(index_key))
+        if not session_ids:
+            return []
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.ttl(session_key(session_id))
+            remaining_ttls = await pipe.execute()
+
+        active_sessions = [
+            ActiveSession(session_id=session_id, expires_in_seconds=remaining)
+            for session_id, remaining in zip(session_ids, remaining_ttls)
+            if remaining >= 0
+        ]
+        expired_session_ids = [
+            session_id
+            for session_id, remaining in zip(session_ids, remaining_ttls)
+            if remaining < 0
+        ]
+        if expired_session_ids:
+            await self.redis.srem(index_key, *expired_session_ids)
+        return active_sessions
+
+    async def delete_user_sessions(self, user_id: int) -> int:
+        return await self._delete_user_sessions(
+            keys=[user_sessions_key(user_id)],
+            args=[SESSION_KEY_PREFIX],
+        )
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local session store for tests and single-process development."""
+
+    def __init__(self, ttl_seconds: int, refresh_threshold: float):
+        super().__init__(ttl_seconds, refresh_threshold)
+        self._sessions: dict[str, tuple[int, float]] = {}
+        self._sessions_by_user: dict[int, set[str]] = {}
+
+    async def create(self, session_id: str, user_id: int) -> None:
+        self._sessions[session_id] = (user_id, time.monotonic() + self.ttl_seconds)
+        self._sessions_by_user.setdefault(user_id, set()).add(session_id)
+
+    async def read(self, session_id: str) -> SessionLookup | None:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        user_id, expires_at = session
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            await self.delete(session_id)
+            return None
+        if remaining >= self.refresh_below_seconds:
+            return SessionLookup(user_id=user_id, refreshed=False)
+        await self.create(session_id, user_id)
+        return SessionLookup(user_id=user_id, refreshed=True)
+
+    async def delete(self, session_id: str) -> bool:
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        self._sessions_by_user.get(session[0], set()).discard(session_id)
+        return True
+
+    async def list_user_sessions(self, user_id: int) -> list[ActiveSession]:
+        now = time.monotonic()
+        active_sessions, expired_session_ids = [], []
+        for session_id in sorted(self._sessions_by_user.get(user_id, set())):
+            _, expires_at = self._sessions[session_id]
+            if expires_at > now:
+                active_sessions.append(
+                    ActiveSession(session_id=session_id, expires_in_seconds=int(expires_at - now))
+                )
+            else:
+                expired_session_ids.append(session_id)
+        for session_id in expired_session_ids:
+            await self.delete(session_id)
+        return active_sessions
+
+    async def delete_user_sessions(self, user_id: int) -> int:
+        session_ids = self._sessions_by_user.pop(user_id, set())
+        for session_id in session_ids:
+            self._sessions.pop(session_id, None)
+        return len(session_ids)
+
+
+def session_key(session_id: str) -> str:
+    return f"{SESSION_KEY_PREFIX}{session_id}"
+
+
+def user_sessions_key(user_id: int) -> str:
+    return f"{USER_SESSIONS_KEY_PREFIX}{user_id}"
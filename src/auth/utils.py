@@ -1,13 +1,18 @@
 import secrets
 import bcrypt
+from fastapi import Response
+from src.config import settings
+from src.auth.config import auth_settings
+from src.auth.constants import SESSION_TTL_SECONDS
+from src.executors import BoundedExecutor
 
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
+    """Hash a password using bcrypt at BCRYPT_ROUNDS."""
     # Encode password to bytes, bcrypt requires bytes
     password_bytes = password.encode('utf-8')
     # Generate salt and hash password
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=auth_settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     # Return as string
     return hashed.decode('utf-8')
@@ -22,6 +27,36 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hash_bytes)
 
 
+def bcrypt_cost(hashed_password: str) -> int:
+    """Read the cost factor from a modular-crypt bcrypt hash ($2b$<cost>$...)."""
+    return int(hashed_password.split('$')[2])
+
+
+def password_hash_is_outdated(hashed_password: str) -> bool:
+    """Whether a stored hash was made at a different cost than configured."""
+    return bcrypt_cost(hashed_password) != auth_settings.BCRYPT_ROUNDS
+
+
 def generate_session_id() -> str:
     """Generate a secure random session ID."""
     return secrets.token_urlsafe(32)
+
+
+def set_session_cookie(response: Response, session_id: str) -> None:
+    """(Re-)issue the session cookie for the full session TTL."""
+    response.set_cookie(
+        key="session_id",
+        value=session_id,
+        httponly=True,
+        secure=settings.ENVIRONMENT == "production",
+        samesite="lax",
+        max_age=SESSION_TTL_SECONDS,
+    )
+
+
+password_hashing_executor = BoundedExecutor(
+    name="password-hashing",
+    max_workers=auth_settings.PASSWORD_HASHING_WORKERS,
+    max_queue_size=auth_settings.PASSWORD_HASHING_MAX_QUEUE,
+    use_processes=auth_settings.PASSWORD_HASHING_USE_PROCESSES,
+)
@@ -16,6 +16,32 @@ class Config(BaseSettings):
     REDIS_URL: RedisDsn
     ENVIRONMENT: Environment = Environment.DEVELOPMENT
 
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT_SECONDS: float = 5.0
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = 30
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 5.0
+    REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS: float = 2.0
+
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = -1
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 500
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 256
+
+    READ_REPLICA_URLS: list[str] = []
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = 10.0
+    READ_AFTER_WRITE_SECONDS: int = 5
+
+    MEDIA_ROOT: Path = Path("media")
+    MAX_IMAGE_UPLOAD_BYTES: int = 1024 * 1024 * 1024
+    BLOB_GC_INTERVAL_SECONDS: float = 3600.0
+    BLOB_GC_GRACE_SECONDS: int = 24 * 3600
+    IMAGE_DERIVATIVE_WORKERS: int = 2
+    IMAGE_DERIVATIVE_MAX_QUEUE: int = 32
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,4 +1,10 @@
 from enum import Enum
+from pathlib import Path
+
+READ_PRIMARY_COOKIE = "read_primary"
+SAFE_HTTP_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+REPLICA_CHECK_TIMEOUT_SECONDS = 2.0
+ALEMBIC_INI_PATH = Path(__file__).resolve().parent.parent / "alembic.ini"
 
 class Environment(str, Enum):
     DEVELOPMENT = "development"
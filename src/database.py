@@ -1,5 +1,15 @@
+import asyncio
+import itertools
+import logging
+from dataclasses import dataclass
 from typing import AsyncGenerator
+from alembic.config import Config as AlembicConfig
+from alembic.script import ScriptDirectory
+from fastapi import Request
+from sqlalchemy import make_url, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
@@ -7,6 +17,16 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase
 from sqlmodel import SQLModel
 from src.config import settings
+from src.db_pool import PoolMonitor, StatementCacheMonitor
+from src.exceptions import SchemaVersionMismatchError
+from src.constants import (
+    ALEMBIC_INI_PATH,
+    READ_PRIMARY_COOKIE,
+    REPLICA_CHECK_TIMEOUT_SECONDS,
+    SAFE_HTTP_METHODS,
+)
+
+logger = logging.getLogger(__name__)
 
 # ---------- Base ----------
 class Base(DeclarativeBase):
@@ -16,13 +36,53 @@ class Base(DeclarativeBase):
 SQLModel.metadata = Base.metadata
 
 # ---------- Engine ----------
-engine = create_async_engine(
-    str(settings.DATABASE_URL),  
-    echo=False,             
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
-)
+def prepared_statement_cache_size(url: str) -> int | None:
+    """Per-connection prepared statement cache size, if the driver keeps one."""
+    if make_url(url).get_driver_name() == "asyncpg":
+        return settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+    return None
+
+def create_pooled_engine(url: str) -> AsyncEngine:
+    """Async engine whose connection pool is sized from the DB_POOL_* settings.
+
+    Compiled SQL is cached per engine (DB_STATEMENT_CACHE_SIZE) and, on
+    asyncpg, prepared server-side once per connection and reused
+    (DB_PREPARED_STATEMENT_CACHE_SIZE).
+    """
+    prepared_cache_size = prepared_statement_cache_size(url)
+    return create_async_engine(
+        url,
+        echo=False,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        query_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        connect_args=(
+            {"prepared_statement_cache_size": prepared_cache_size}
+            if prepared_cache_size is not None
+            else {}
+        ),
+    )
+
+def monitor_pool(engine: AsyncEngine) -> PoolMonitor:
+    return PoolMonitor(
+        engine,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    )
+
+def monitor_statement_cache(engine: AsyncEngine) -> StatementCacheMonitor:
+    return StatementCacheMonitor(
+        engine,
+        compiled_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        prepared_statement_cache_size=prepared_statement_cache_size(str(engine.url)),
+    )
+
+engine = create_pooled_engine(str(settings.DATABASE_URL))
+pool_monitor = monitor_pool(engine)
+statement_cache = monitor_statement_cache(engine)
 
 # ---------- Session ----------
 AsyncSessionLocal = async_sessionmaker(
@@ -31,17 +91,168 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
-# ---------- Database Initialization ----------
-async def init_db():
-    """Initialize database - create all tables."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+# ---------- Read Replicas ----------
+# Seconds the replica is behind the primary; 0 when it has replayed
+# everything it received, so an idle primary does not read as lag. NULL
+# unless its WAL receiver is streaming: a disconnected replica has replayed
+# all it received too, however far the primary has moved on. Only roles with
+# pg_read_all_stats (e.g. pg_monitor) can see the receiver's status.
+POSTGRES_REPLICA_LAG_QUERY = text("""
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN NOT EXISTS (SELECT FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+""")
+
+
+@dataclass
+class Replica:
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker
+    pool_monitor: PoolMonitor
+    statement_cache: StatementCacheMonitor
+    healthy: bool = False
+    lag_seconds: float | None = None
+
+
+class ReplicaRouter:
+    """Hands out read-only sessions on healthy, caught-up replicas.
+
+    A background task probes every replica's replication lag. Replicas that
+    fail the probe or fall more than max_lag_seconds behind are skipped until
+    a later probe passes; with no usable replica, reads go to the primary.
+    """
+
+    def __init__(self, urls: list[str], max_lag_seconds: float, check_interval_seconds: float):
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.replicas = [self._build_replica(url) for url in urls]
+        self._round_robin = itertools.count()
+        self._check_task: asyncio.Task | None = None
+
+    @staticmethod
+    def _build_replica(url: str) -> Replica:
+        replica_engine = create_pooled_engine(url)
+        return Replica(
+            engine=replica_engine,
+            sessionmaker=async_sessionmaker(
+                bind=replica_engine, class_=AsyncSession, expire_on_commit=False
+            ),
+            pool_monitor=monitor_pool(replica_engine),
+            statement_cache=monitor_statement_cache(replica_engine),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    async def start(self) -> None:
+        if not self.replicas:
+            return
+        await self.check_replicas()
+        self._check_task = asyncio.create_task(self._check_periodically())
+
+    async def close(self) -> None:
+        if self._check_task:
+            self._check_task.cancel()
+            try:
+                await self._check_task
+            except asyncio.CancelledError:
+                pass
+            self._check_task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def check_replicas(self) -> None:
+        await asyncio.gather(*(self._check_replica(replica) for replica in self.replicas))
+
+    async def _check_replica(self, replica: Replica) -> None:
+        try:
+            async with asyncio.timeout(REPLICA_CHECK_TIMEOUT_SECONDS):
+                async with replica.engine.connect() as conn:
+                    if conn.dialect.name == "postgresql":
+                        lag_seconds = await conn.scalar(POSTGRES_REPLICA_LAG_QUERY)
+                    else:
+                        await conn.execute(text("SELECT 1"))
+                        lag_seconds = 0.0
+        except Exception as e:
+            if replica.healthy:
+                logger.warning("Read replica %s failed its health check: %s", replica.engine.url, e)
+            replica.healthy, replica.lag_seconds = False, None
+            return
+        if lag_seconds is None:
+            if replica.healthy:
+                logger.warning(
+                    "Read replica %s is not streaming from the primary, skipping it", replica.engine.url
+                )
+            replica.healthy, replica.lag_seconds = False, None
+            return
+
+        lag_seconds = float(lag_seconds)
+        healthy = lag_seconds <= self.max_lag_seconds
+        if replica.healthy and not healthy:
+            logger.warning("Read replica %s is %.1fs behind, skipping it", replica.engine.url, lag_seconds)
+        replica.healthy, replica.lag_seconds = healthy, lag_seconds
+
+    async def _check_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval_seconds)
+            await self.check_replicas()
+
+    def read_sessionmaker(self) -> async_sessionmaker:
+        """Next healthy replica's sessionmaker in round-robin order, else the primary's."""
+        healthy_replicas = [replica for replica in self.replicas if replica.healthy]
+        if not healthy_replicas:
+            return AsyncSessionLocal
+        return healthy_replicas[next(self._round_robin) % len(healthy_replicas)].sessionmaker
+
+
+replica_router = ReplicaRouter(
+    urls=settings.READ_REPLICA_URLS,
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval_seconds=settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS,
+)
+
+# ---------- Schema Version Check ----------
+def alembic_head_revisions() -> set[str]:
+    """Revisions at the head of alembic/versions (read from the scripts, not the DB)."""
+    scripts = ScriptDirectory.from_config(AlembicConfig(str(ALEMBIC_INI_PATH)))
+    return set(scripts.get_heads())
+
+async def check_schema_version():
+    """Refuse to start unless the database is at the Alembic head.
+
+    Only reads alembic_version; schema changes are applied explicitly with
+    `alembic upgrade head` before the app is deployed.
+    """
+    expected = alembic_head_revisions()
+    async with engine.connect() as conn:
+        try:
+            current = set(await conn.scalars(text("SELECT version_num FROM alembic_version")))
+        except DBAPIError:
+            current = set()
+    if current != expected:
+        raise SchemaVersionMismatchError(
+            f"Database schema is at {sorted(current) or 'no revision'}, "
+            f"expected {sorted(expected)}; run `alembic upgrade head`"
+        )
 
 # ---------- Dependency ----------
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
 
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints: a replica unless the client just wrote."""
+    if request.method in SAFE_HTTP_METHODS and READ_PRIMARY_COOKIE not in request.cookies:
+        session_factory = replica_router.read_sessionmaker()
+    else:
+        session_factory = AsyncSessionLocal
+    async with session_factory() as session:
+        yield session
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Alias for get_db for compatibility."""
     async with AsyncSessionLocal() as session:
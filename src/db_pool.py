@@ -0,0 +1,218 @@
+"""
+Connection pool and compiled-statement cache counters for sizing an
+engine's pool from real traffic, collected from SQLAlchemy events.
+"""
+import time
+from dataclasses import dataclass
+
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy.pool import ConnectionPoolEntry
+
+# Session.info key: when the session's transaction started waiting for a connection.
+CHECKOUT_REQUESTED_AT = "pool_checkout_requested_at"
+
+
+class PoolStats(BaseModel):
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    idle: int
+    overflow: int
+    waiting: int
+    checkouts: int
+    checkout_timeouts: int
+    average_checkout_wait_ms: float
+    max_checkout_wait_ms: float
+    average_hold_ms: float
+    max_hold_ms: float
+    connections_opened: int
+    connections_closed: int
+    connections_invalidated: int
+    average_connection_lifetime_seconds: float
+
+
+@dataclass
+class PoolMetrics:
+    waiting: int = 0
+    checkouts: int = 0
+    checkout_timeouts: int = 0
+    checkout_waits: int = 0
+    total_checkout_wait: float = 0.0
+    max_checkout_wait: float = 0.0
+    checkins: int = 0
+    total_hold: float = 0.0
+    max_hold: float = 0.0
+    connections_opened: int = 0
+    connections_closed: int = 0
+    connections_invalidated: int = 0
+    total_connection_lifetime: float = 0.0
+
+
+class PoolMonitor:
+    """Records checkout wait, hold time, timeouts and connection lifetimes
+    for an engine's connection pool.
+
+    Hold times and lifetimes come from the pool's events, which carry over
+    when engine.dispose() recreates the pool. Checkout wait is timed per
+    session, from beginning a transaction until it has its connection, so it
+    includes opening a new connection and the pre-ping; a session that gives
+    up after pool_timeout seconds without one counts as a checkout timeout.
+    """
+
+    def __init__(self, engine: AsyncEngine, max_overflow: int, pool_timeout: float):
+        self.engine = engine
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self.metrics = PoolMetrics()
+        event.listen(engine.sync_engine, "connect", self._on_connect)
+        event.listen(engine.sync_engine, "checkout", self._on_checkout)
+        event.listen(engine.sync_engine, "checkin", self._on_checkin)
+        event.listen(engine.sync_engine, "close", self._on_close)
+        event.listen(engine.sync_engine, "invalidate", self._on_invalidate)
+        event.listen(Session, "after_transaction_create", self._on_transaction_create)
+        event.listen(Session, "after_begin", self._on_begin)
+        event.listen(Session, "after_transaction_end", self._on_transaction_end)
+
+    def _waits_on_this_pool(self, session: Session, transaction: SessionTransaction) -> bool:
+        return transaction.parent is None and session.bind is self.engine.sync_engine
+
+    def _on_transaction_create(self, session: Session, transaction: SessionTransaction) -> None:
+        if self._waits_on_this_pool(session, transaction):
+            session.info[CHECKOUT_REQUESTED_AT] = time.perf_counter()
+            self.metrics.waiting += 1
+
+    def _on_begin(self, session: Session, transaction: SessionTransaction, connection) -> None:
+        if not self._waits_on_this_pool(session, transaction):
+            return
+        requested_at = session.info.pop(CHECKOUT_REQUESTED_AT, None)
+        if requested_at is None:
+            return
+        checkout_wait = time.perf_counter() - requested_at
+        self.metrics.waiting -= 1
+        self.metrics.checkout_waits += 1
+        self.metrics.total_checkout_wait += checkout_wait
+        self.metrics.max_checkout_wait = max(self.metrics.max_checkout_wait, checkout_wait)
+
+    def _on_transaction_end(self, session: Session, transaction: SessionTransaction) -> None:
+        if not self._waits_on_this_pool(session, transaction):
+            return
+        # Still set: the transaction ended without ever getting a connection.
+        requested_at = session.info.pop(CHECKOUT_REQUESTED_AT, None)
+        if requested_at is None:
+            return
+        self.metrics.waiting -= 1
+        if time.perf_counter() - requested_at >= self.pool_timeout:
+            self.metrics.checkout_timeouts += 1
+
+    def _on_connect(self, dbapi_connection, record: ConnectionPoolEntry) -> None:
+        self.metrics.connections_opened += 1
+        record.info["connected_at"] = time.monotonic()
+
+    def _on_checkout(self, dbapi_connection, record: ConnectionPoolEntry, proxy) -> None:
+        self.metrics.checkouts += 1
+        record.info["checked_out_at"] = time.perf_counter()
+
+    def _on_checkin(self, dbapi_connection, record: ConnectionPoolEntry) -> None:
+        checked_out_at = record.info.pop("checked_out_at", None)
+        if checked_out_at is None:
+            return
+        hold = time.perf_counter() - checked_out_at
+        self.metrics.checkins += 1
+        self.metrics.total_hold += hold
+        self.metrics.max_hold = max(self.metrics.max_hold, hold)
+
+    def _on_close(self, dbapi_connection, record: ConnectionPoolEntry) -> None:
+        self._record_closed(record)
+
+    def _on_invalidate(self, dbapi_connection, record: ConnectionPoolEntry, exception) -> None:
+        self.metrics.connections_invalidated += 1
+        self._record_closed(record)
+
+    def _record_closed(self, record: ConnectionPoolEntry) -> None:
+        connected_at = record.info.pop("connected_at", None)
+        if connected_at is None:
+            return
+        self.metrics.connections_closed += 1
+        self.metrics.total_connection_lifetime += time.monotonic() - connected_at
+
+    def stats(self) -> PoolStats:
+        metrics = self.metrics
+        pool = self.engine.pool
+        return PoolStats(
+            pool_size=pool.size(),
+            max_overflow=self.max_overflow,
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            waiting=metrics.waiting,
+            checkouts=metrics.checkouts,
+            checkout_timeouts=metrics.checkout_timeouts,
+            average_checkout_wait_ms=round(
+                metrics.total_checkout_wait / (metrics.checkout_waits or 1) * 1000, 3
+            ),
+            max_checkout_wait_ms=round(metrics.max_checkout_wait * 1000, 3),
+            average_hold_ms=round(metrics.total_hold / (metrics.checkins or 1) * 1000, 3),
+            max_hold_ms=round(metrics.max_hold * 1000, 3),
+            connections_opened=metrics.connections_opened,
+            connections_closed=metrics.connections_closed,
+            connections_invalidated=metrics.connections_invalidated,
+            average_connection_lifetime_seconds=round(
+                metrics.total_connection_lifetime / (metrics.connections_closed or 1), 3
+            ),
+        )
+
+
+class StatementCacheStats(BaseModel):
+    compiled_cache_size: int
+    cache_hits: int
+    cache_misses: int
+    uncached: int
+    hit_ratio: float
+    prepared_statement_cache_size: int | None
+
+
+class StatementCacheMonitor:
+    """Counts how often an engine's statements come from its compiled cache.
+
+    A miss means SQLAlchemy compiled the statement again; uncached statements
+    (raw SQL, caching disabled) are counted apart. On asyncpg each connection
+    additionally keeps up to prepared_statement_cache_size server-side
+    prepared statements, keyed on the SQL text.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        compiled_cache_size: int,
+        prepared_statement_cache_size: int | None = None,
+    ):
+        self.compiled_cache_size = compiled_cache_size
+        self.prepared_statement_cache_size = prepared_statement_cache_size
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        cache_hit = getattr(context, "cache_hit", None)
+        if cache_hit is CacheStats.CACHE_HIT:
+            self.hits += 1
+        elif cache_hit is CacheStats.CACHE_MISS:
+            self.misses += 1
+        else:
+            self.uncached += 1
+
+    def stats(self) -> StatementCacheStats:
+        cached = self.hits + self.misses
+        return StatementCacheStats(
+            compiled_cache_size=self.compiled_cache_size,
+            cache_hits=self.hits,
+            cache_misses=self.misses,
+            uncached=self.uncached,
+            hit_ratio=round(self.hits / (cached or 1), 4),
+            prepared_statement_cache_size=self.prepared_statement_cache_size,
+        )
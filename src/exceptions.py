@@ -1,3 +1,13 @@
 class AppException(Exception):
     """Base exception for application errors."""
     pass
+
+
+class SchemaVersionMismatchError(AppException):
+    """Database is not migrated to the Alembic head this code expects."""
+    pass
+
+
+class ExecutorSaturatedError(AppException):
+    """Executor queue is full; the work was rejected instead of queued."""
+    pass
@@ -0,0 +1,133 @@
+"""
+Bounded executors for CPU-bound work that must not run on the event loop.
+"""
+import asyncio
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+from src.exceptions import ExecutorSaturatedError
+
+ResultT = TypeVar("ResultT")
+
+
+class ExecutorStats(BaseModel):
+    name: str
+    max_workers: int
+    max_queue_size: int
+    in_flight: int
+    queue_depth: int
+    submitted: int
+    completed: int
+    rejected: int
+    average_wait_ms: float
+    max_wait_ms: float
+
+
+def _run_timed(func: Callable[..., ResultT], *args: Any) -> tuple[float, ResultT]:
+    """Run func in the worker and report when it actually started (monotonic clock)."""
+    started_at = time.monotonic()
+    return started_at, func(*args)
+
+
+class BoundedExecutor:
+    """Thread or process pool with a hard cap on queued work.
+
+    Work beyond max_workers + max_queue_size is rejected with
+    ExecutorSaturatedError instead of piling up behind the pool.
+    Call start() in the app lifespan and close() on shutdown.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_queue_size: int,
+        use_processes: bool = False,
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.use_processes = use_processes
+        self._executor: Executor | None = None
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def start(self) -> None:
+        if self.use_processes:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=self.name,
+            )
+
+    def close(self) -> None:
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._in_flight - self.max_workers)
+
+    async def run(self, func: Callable[..., ResultT], *args: Any) -> ResultT:
+        """Run func(*args) on the pool, failing fast when the queue is full."""
+        if self._executor is None:
+            self.start()
+        if self.queue_depth >= self.max_queue_size:
+            self._rejected += 1
+            raise ExecutorSaturatedError(f"{self.name} executor is saturated")
+
+        loop = asyncio.get_running_loop()
+        submitted_at = time.monotonic()
+        work = self._executor.submit(_run_timed, func, *args)
+        self._in_flight += 1
+        self._submitted += 1
+        # A cancelled caller stops waiting but a started job keeps its worker,
+        # so the slot is only released once the pool has finished with it.
+        work.add_done_callback(lambda _: self._release_from_pool(loop))
+        started_at, result = await asyncio.wrap_future(work, loop=loop)
+        self._record_wait(started_at - submitted_at)
+        return result
+
+    def _release_from_pool(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Done-callback of a pool job; usually runs on a worker thread."""
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            pass  # the loop has closed; nothing is left to admit work
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+
+    def _record_wait(self, wait_seconds: float) -> None:
+        self._completed += 1
+        self._total_wait_seconds += wait_seconds
+        self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+
+    def stats(self) -> ExecutorStats:
+        average_wait = self._total_wait_seconds / self._completed if self._completed else 0.0
+        return ExecutorStats(
+            name=self.name,
+            max_workers=self.max_workers,
+            max_queue_size=self.max_queue_size,
+            in_flight=self._in_flight,
+            queue_depth=self.queue_depth,
+            submitted=self._submitted,
+            completed=self._completed,
+            rejected=self._rejected,
+            average_wait_ms=average_wait * 1000,
+            max_wait_ms=self._max_wait_seconds * 1000,
+        )
@@ -0,0 +1,5 @@
+# App-specific config for internal
+# from pydantic_settings import BaseSettings
+#
+# class InternalSettings(BaseSettings):
+#     ...
@@ -0,0 +1 @@
+# Constants for internal
@@ -0,0 +1,6 @@
+from src.database import pool_monitor, replica_router, statement_cache
+from src.internal.service import InternalStatsService
+
+
+def get_internal_stats_service() -> InternalStatsService:
+    return InternalStatsService(pool_monitor, statement_cache, replica_router)
@@ -0,0 +1,2 @@
+# Custom exceptions for internal
+# from src.exceptions import AppException
@@ -0,0 +1,6 @@
+# SQLModel models for internal
+# from sqlmodel import SQLModel, Field
+#
+# class Internal(SQLModel, table=True):
+#     __tablename__ = "internal"
+#     id: int | None = Field(default=None, primary_key=True)
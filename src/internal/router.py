@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+from src.auth.dependencies import require_admin
+from src.auth.schema import UserResponse
+from src.internal.dependencies import get_internal_stats_service
+from src.internal.schema import DatabaseStatsResponse
+from src.internal.service import InternalStatsService
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+@router.get("/stats/database", response_model=DatabaseStatsResponse)
+async def get_database_stats(
+    _: UserResponse = Depends(require_admin),
+    stats_service: InternalStatsService = Depends(get_internal_stats_service),
+):
+    """Get connection pool and statement cache statistics for the primary and each read replica (admin only)."""
+    return stats_service.get_database_stats()
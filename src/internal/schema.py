@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Optional
+from src.db_pool import PoolStats, StatementCacheStats
+
+
+class ReplicaStats(BaseModel):
+    url: str
+    healthy: bool
+    lag_seconds: Optional[float]
+    pool: PoolStats
+    statement_cache: StatementCacheStats
+
+
+class DatabaseStatsResponse(BaseModel):
+    primary: PoolStats
+    primary_statement_cache: StatementCacheStats
+    replicas: list[ReplicaStats]
@@ -0,0 +1,31 @@
+from src.database import ReplicaRouter
+from src.db_pool import PoolMonitor, StatementCacheMonitor
+from src.internal.schema import DatabaseStatsResponse, ReplicaStats
+
+
+class InternalStatsService:
+    def __init__(
+        self,
+        pool_monitor: PoolMonitor,
+        statement_cache: StatementCacheMonitor,
+        replicas: ReplicaRouter,
+    ):
+        self.pool_monitor = pool_monitor
+        self.statement_cache = statement_cache
+        self.replicas = replicas
+
+    def get_database_stats(self) -> DatabaseStatsResponse:
+        return DatabaseStatsResponse(
+            primary=self.pool_monitor.stats(),
+            primary_statement_cache=self.statement_cache.stats(),
+            replicas=[
+                ReplicaStats(
+                    url=replica.engine.url.render_as_string(hide_password=True),
+                    healthy=replica.healthy,
+                    lag_seconds=replica.lag_seconds,
+                    pool=replica.pool_monitor.stats(),
+                    statement_cache=replica.statement_cache.stats(),
+                )
+                for replica in self.replicas.replicas
+            ],
+        )
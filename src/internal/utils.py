@@ -0,0 +1 @@
+# Helper functions for internal
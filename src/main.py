@@ -1,15 +1,34 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from src.database import engine, init_db
+from src.database import check_schema_version, engine, replica_router
+from src.middleware import pin_reads_after_write, reissue_session_cookie
+from src.redis import redis_client
+from src.auth.utils import password_hashing_executor
+from src.auth.session_cache import session_user_cache
+from src.patients.blob_store import blob_garbage_collector
+from src.patients.derivatives import image_derivative_executor
 from src.auth.router import router as auth_router
 from src.patients.router import router as patients_router
 from src.reminders.router import router as reminders_router
+from src.internal.router import router as internal_router
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await init_db()
+    await check_schema_version()
+    await replica_router.start()
+    await redis_client.start()
+    password_hashing_executor.start()
+    image_derivative_executor.start()
+    await session_user_cache.start_listener(redis_client.client)
+    await blob_garbage_collector.start()
     yield
+    await blob_garbage_collector.close()
+    await session_user_cache.stop_listener()
+    image_derivative_executor.close()
+    password_hashing_executor.close()
+    await redis_client.close()
+    await replica_router.close()
     await engine.dispose()
 
 app = FastAPI(lifespan=lifespan)
@@ -23,7 +42,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Pin a client's reads to the primary briefly after it writes (no-op without replicas)
+app.middleware("http")(pin_reads_after_write)
+
+# Slide the session cookie along with a session extended by any endpoint
+app.middleware("http")(reissue_session_cookie)
+
 # Include all the routes
 app.include_router(auth_router)
 app.include_router(patients_router)
-app.include_router(reminders_router)
\ No newline at end of file
+app.include_router(reminders_router)
+app.include_router(internal_router)
\ No newline at end of file
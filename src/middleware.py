@@ -0,0 +1,41 @@
+from fastapi import Request, Response
+from src.config import settings
+from src.constants import READ_PRIMARY_COOKIE, SAFE_HTTP_METHODS
+from src.database import replica_router
+from src.auth.utils import set_session_cookie
+
+
+async def pin_reads_after_write(request: Request, call_next) -> Response:
+    """HTTP middleware: after a successful write, route this client's reads to
+    the primary for READ_AFTER_WRITE_SECONDS so it sees its own changes."""
+    response = await call_next(request)
+    if (
+        replica_router.enabled
+        and request.method not in SAFE_HTTP_METHODS
+        and response.status_code < 400
+    ):
+        response.set_cookie(
+            key=READ_PRIMARY_COOKIE,
+            value="1",
+            httponly=True,
+            secure=settings.ENVIRONMENT == "production",
+            samesite="lax",
+            max_age=settings.READ_AFTER_WRITE_SECONDS,
+        )
+    return response
+
+
+async def reissue_session_cookie(request: Request, call_next) -> Response:
+    """HTTP middleware: re-issue the session cookie when authenticating this
+    request extended the session, so the browser's copy slides with it.
+
+    Done here rather than in the endpoint so it also reaches file and other
+    raw responses; skipped when the endpoint set or cleared the cookie itself.
+    """
+    response = await call_next(request)
+    session_id = getattr(request.state, "refreshed_session_id", None)
+    if session_id and not any(
+        cookie.startswith("session_id=") for cookie in response.headers.getlist("set-cookie")
+    ):
+        set_session_cookie(response, session_id)
+    return response
@@ -0,0 +1,147 @@
+"""
+Content-addressed storage for uploaded imaging.
+
+Each distinct file is stored once under MEDIA_ROOT/blobs/<ab>/<cd>/<sha256>,
+however many X-ray and intraoral picture rows reference it. image_blobs
+holds a reference count per blob, kept by database triggers; the garbage
+collector removes blobs, and their derivatives and tile pyramids, that have
+had no references for BLOB_GC_GRACE_SECONDS.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import anyio
+from sqlalchemy import bindparam, delete, select
+
+from src.config import settings
+from src.database import AsyncSessionLocal
+from src.patients.constants import BLOB_DIR, BLOB_GC_BATCH_SIZE
+from src.patients.derivatives import ImageDerivatives, image_derivatives
+from src.patients.exceptions import InvalidUploadError
+from src.patients.models import ImageBlob
+from src.patients.tiles import ImageTiles, image_tiles
+from src.patients.uploads import ReceivedImage
+
+logger = logging.getLogger(__name__)
+
+# Delete a batch of long-unreferenced blobs, skipping rows an upload has locked.
+COLLECT_BLOBS = delete(ImageBlob).where(
+    ImageBlob.sha256.in_(
+        select(ImageBlob.sha256)
+        .where(ImageBlob.ref_count == 0, ImageBlob.unreferenced_at < bindparam("cutoff"))
+        .order_by(ImageBlob.unreferenced_at)
+        .limit(bindparam("batch_size"))
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+).returning(ImageBlob.sha256)
+
+
+class BlobStore:
+    """Files keyed by SHA-256 in two levels of sharded directories."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    @staticmethod
+    def relative_path(sha256: str) -> Path:
+        return Path(BLOB_DIR, sha256[:2], sha256[2:4], sha256)
+
+    def path(self, sha256: str) -> Path:
+        return self.root / self.relative_path(sha256)
+
+    async def contains(self, sha256: str) -> bool:
+        return await anyio.Path(self.path(sha256)).is_file()
+
+    async def put(self, image: ReceivedImage) -> bool:
+        """Store an upload under its hash; False if that content is already stored."""
+        if await self.contains(image.sha256):
+            return False
+        if image.path is None:
+            raise InvalidUploadError("This image is no longer stored; upload it again without sha256")
+        await image.move_to(self.path(image.sha256))
+        return True
+
+    async def delete(self, sha256: str) -> None:
+        await anyio.Path(self.path(sha256)).unlink(missing_ok=True)
+
+
+class BlobGarbageCollector:
+    """Periodically removes blobs nothing has referenced for grace_seconds.
+
+    Each batch deletes the image_blobs rows and unlinks their files before
+    committing, so an upload of the same content waits on the row lock and
+    then stores the file afresh. Safe to run in every worker. Call start()
+    in the app lifespan and close() on shutdown.
+    """
+
+    def __init__(
+        self,
+        store: BlobStore,
+        derivatives: ImageDerivatives,
+        tiles: ImageTiles,
+        interval_seconds: float,
+        grace_seconds: int,
+        batch_size: int = BLOB_GC_BATCH_SIZE,
+    ):
+        self.store = store
+        self.derivatives = derivatives
+        self.tiles = tiles
+        self.interval_seconds = interval_seconds
+        self.grace_seconds = grace_seconds
+        self.batch_size = batch_size
+        self._collect_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._collect_task = asyncio.create_task(self._collect_periodically())
+
+    async def close(self) -> None:
+        if self._collect_task:
+            self._collect_task.cancel()
+            try:
+                await self._collect_task
+            except asyncio.CancelledError:
+                pass
+            self._collect_task = None
+
+    async def collect(self) -> int:
+        """Remove every blob unreferenced since before the grace period; return how many."""
+        params = {
+            "cutoff": datetime.utcnow() - timedelta(seconds=self.grace_seconds),
+            "batch_size": self.batch_size,
+        }
+        collected = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                hashes = list(await db.scalars(COLLECT_BLOBS, params))
+                for sha256 in hashes:
+                    await self.store.delete(sha256)
+                    await self.derivatives.delete(sha256)
+                    await self.tiles.delete(sha256)
+                await db.commit()
+            collected += len(hashes)
+            if len(hashes) < self.batch_size:
+                return collected
+
+    async def _collect_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                collected = await self.collect()
+            except Exception as e:
+                logger.warning("Image blob garbage collection failed: %s", e)
+                continue
+            if collected:
+                logger.info("Removed %d unreferenced image blobs", collected)
+
+
+blob_store = BlobStore(settings.MEDIA_ROOT)
+blob_garbage_collector = BlobGarbageCollector(
+    blob_store,
+    image_derivatives,
+    image_tiles,
+    interval_seconds=settings.BLOB_GC_INTERVAL_SECONDS,
+    grace_seconds=settings.BLOB_GC_GRACE_SECONDS,
+)
@@ -1 +1,111 @@
-# Constants for patient
+from enum import Enum
+from src.auth.constants import UserRole
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+DEFAULT_CHART_SECTION_LIMIT = 20
+MAX_BULK_CREATE_ITEMS = 10_000
+DEFAULT_SEARCH_PAGE_SIZE = 20
+MIN_SEARCH_TERM_LENGTH = 3  # shortest term a trigram index can answer
+PURGE_BATCH_SIZE = 5_000
+# Roles that work with patient records: charts, biodata, imaging, visits, plans.
+PATIENT_RECORD_ROLES = frozenset({UserRole.ADMIN, UserRole.DENTIST, UserRole.RECEPTIONIST})
+# Uploaded images are served by the /file endpoints, not from MEDIA_ROOT directly.
+UPLOADED_IMAGE_URLS = {
+    "xrays": "/patients/xrays/{id}/file",
+    "intraoral_pictures": "/patients/intraoral-pictures/{id}/file",
+}
+UPLOAD_WRITE_BUFFER_BYTES = 1024 * 1024  # file data is flushed to disk in writes of about this size
+MAX_UPLOAD_FIELD_BYTES = 64 * 1024
+UPLOAD_FORM_OVERHEAD_BYTES = 1024 * 1024  # allowance for form fields and part headers
+BLOB_DIR = "blobs"
+BLOB_GC_BATCH_SIZE = 500
+DERIVATIVE_DIR = "derivatives"
+DERIVATIVE_FORMAT = "WEBP"
+DERIVATIVE_CONTENT_TYPE = "image/webp"
+DERIVATIVE_QUALITY = 80
+# Derivatives are keyed by content hash, so clients may cache them forever.
+DERIVATIVE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+IMAGE_DERIVATIVE_RETRY_AFTER_SECONDS = 2
+TILE_DIR = "tiles"
+TILE_SIZE = 256
+TILE_PYRAMID_CACHE_SIZE = 64  # tile pyramids each worker keeps memory-mapped
+
+# Accepted imaging content types and the suffix stored files get.
+IMAGE_CONTENT_TYPES = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/tiff": ".tiff",
+    "image/webp": ".webp",
+    "application/dicom": ".dcm",
+}
+# Content types Pillow can decode into thumbnails and previews.
+PREVIEWABLE_CONTENT_TYPES = frozenset({"image/jpeg", "image/png", "image/tiff", "image/webp"})
+
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+class BiodataSection(str, Enum):
+    CONTACT = "contact"
+    MEDICAL = "medical"
+    DENTAL = "dental"
+    LIFESTYLE = "lifestyle"
+    INSURANCE = "insurance"
+
+
+# Biodata columns outside the summary, grouped the way the chart shows them.
+BIODATA_SECTION_FIELDS = {
+    BiodataSection.CONTACT: (
+        "address",
+        "occupation",
+        "emergency_contact_name",
+        "emergency_contact_phone",
+    ),
+    BiodataSection.MEDICAL: (
+        "medical_history",
+        "allergies",
+        "medications",
+        "previous_surgeries",
+        "family_medical_history",
+    ),
+    BiodataSection.DENTAL: (
+        "previous_dental_treatments",
+        "gum_disease_history",
+        "dental_visit_frequency",
+        "oral_hygiene_habits",
+        "dental_trauma_history",
+    ),
+    BiodataSection.LIFESTYLE: (
+        "smoking_tobacco_use",
+        "alcohol_consumption",
+        "diet_habits",
+    ),
+    BiodataSection.INSURANCE: (
+        "insurance_provider",
+        "insurance_policy_number",
+        "consent_forms",
+    ),
+}
+
+
+class ImageVariant(str, Enum):
+    THUMBNAIL = "thumbnail"
+    PREVIEW = "preview"
+
+
+# Bounding box each derivative is fitted into, preserving aspect ratio.
+IMAGE_VARIANT_SIZES = {
+    ImageVariant.THUMBNAIL: (256, 256),
+    ImageVariant.PREVIEW: (1600, 1600),
+}
+
+
+class ChartSection(str, Enum):
+    BIODATA = "biodata"
+    VISITS = "visits"
+    RECORD_PLANNERS = "record_planners"
+    XRAYS = "xrays"
+    INTRAORAL_PICTURES = "intraoral_pictures"
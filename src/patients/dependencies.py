@@ -1,6 +1,9 @@
-from fastapi import Depends
+from fastapi import Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.database import get_db
+from src.auth.dependencies import get_current_user
+from src.auth.schema import UserResponse
+from src.database import get_db, get_read_db
+from src.patients.constants import PATIENT_RECORD_ROLES
 from src.patients.service import PatientService
 
 
@@ -8,3 +11,19 @@ async def get_patient_service(
     db: AsyncSession = Depends(get_db),
 ) -> PatientService:
     return PatientService(db)
+
+
+async def get_patient_read_service(
+    db: AsyncSession = Depends(get_read_db),
+) -> PatientService:
+    """PatientService for read-only endpoints; may be served by a replica."""
+    return PatientService(db)
+
+
+async def require_patient_access(
+    current_user: UserResponse = Depends(get_current_user),
+) -> UserResponse:
+    """Patient records are for clinic staff only: admins, dentists and receptionists."""
+    if current_user.role not in PATIENT_RECORD_ROLES:
+        raise HTTPException(status_code=403, detail="Staff role required for patient records")
+    return current_user
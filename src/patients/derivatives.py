@@ -0,0 +1,116 @@
+"""
+Thumbnails and web previews of stored imaging.
+
+Derivatives are rendered with Pillow in a bounded process pool and cached on
+disk by (blob hash, variant) under MEDIA_ROOT/derivatives. A given key always
+renders the same bytes, so they are served as immutable.
+"""
+import asyncio
+import os
+from pathlib import Path
+
+import anyio
+from PIL import Image, ImageOps
+
+from src.config import settings
+from src.executors import BoundedExecutor
+from src.patients.constants import (
+    DERIVATIVE_DIR,
+    DERIVATIVE_FORMAT,
+    DERIVATIVE_QUALITY,
+    IMAGE_VARIANT_SIZES,
+    ImageVariant,
+)
+from src.patients.exceptions import ImagePreviewUnavailableError
+
+SIXTEEN_BIT_MODES = frozenset({"I", "I;16", "I;16B", "I;16L"})
+
+
+def to_display_mode(image: Image.Image) -> Image.Image:
+    """Upright 8-bit greyscale or RGB copy of image; 16-bit radiographs are scaled down."""
+    image = ImageOps.exif_transpose(image)
+    if image.mode in SIXTEEN_BIT_MODES:
+        return image.convert("I").point(lambda value: value * (1 / 256)).convert("L")
+    if image.mode not in ("L", "RGB"):
+        return image.convert("RGB")
+    return image
+
+
+def render_derivative(source: str, destination: str, size: tuple[int, int]) -> int:
+    """Fit an image into size and save it as a derivative; return its byte size.
+
+    Runs in a pool worker. JPEGs are decoded at reduced scale where possible.
+    """
+    with Image.open(source) as original:
+        original.draft("RGB", size)
+        image = to_display_mode(original)
+        image.thumbnail(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        partial = f"{destination}.{os.getpid()}.tmp"
+        image.save(partial, DERIVATIVE_FORMAT, quality=DERIVATIVE_QUALITY)
+        os.replace(partial, destination)
+    return os.path.getsize(destination)
+
+
+class ImageDerivatives:
+    """Renders derivatives once per (blob hash, variant) and caches them on disk.
+
+    Concurrent requests for a derivative that is still rendering share one
+    render instead of queueing duplicates on the pool.
+    """
+
+    def __init__(self, root: Path, executor: BoundedExecutor):
+        self.root = root
+        self.executor = executor
+        self._rendering: dict[tuple[str, ImageVariant], asyncio.Future] = {}
+
+    def path(self, sha256: str, variant: ImageVariant) -> Path:
+        return self.root / DERIVATIVE_DIR / variant.value / sha256[:2] / sha256[2:4] / sha256
+
+    async def get(self, sha256: str, source: Path, variant: ImageVariant) -> Path:
+        """Path of the cached derivative, rendering it from source first if needed.
+
+        Raises ImagePreviewUnavailableError if source cannot be decoded and
+        ExecutorSaturatedError if the render pool is full.
+        """
+        path = self.path(sha256, variant)
+        if await anyio.Path(path).is_file():
+            return path
+        key = (sha256, variant)
+        rendering = self._rendering.get(key)
+        if rendering is None:
+            rendering = asyncio.ensure_future(self._render(source, path, variant))
+            self._rendering[key] = rendering
+            rendering.add_done_callback(lambda _: self._rendering.pop(key, None))
+        await asyncio.shield(rendering)
+        return path
+
+    async def _render(self, source: Path, path: Path, variant: ImageVariant) -> None:
+        try:
+            await self.executor.run(
+                render_derivative, str(source), str(path), IMAGE_VARIANT_SIZES[variant]
+            )
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            raise ImagePreviewUnavailableError("Image cannot be previewed") from e
+
+    async def render_all(self, sha256: str, source: Path) -> None:
+        """Render every variant ahead of the first request; failures are left to the lazy path."""
+        for variant in ImageVariant:
+            try:
+                await self.get(sha256, source, variant)
+            except Exception:
+                return
+
+    async def delete(self, sha256: str) -> None:
+        for variant in ImageVariant:
+            await anyio.Path(self.path(sha256, variant)).unlink(missing_ok=True)
+
+
+image_derivative_executor = BoundedExecutor(
+    name="image-derivatives",
+    max_workers=settings.IMAGE_DERIVATIVE_WORKERS,
+    max_queue_size=settings.IMAGE_DERIVATIVE_MAX_QUEUE,
+    use_processes=True,
+)
+image_derivatives = ImageDerivatives(settings.MEDIA_ROOT, image_derivative_executor)
@@ -34,3 +34,41 @@ class XRayNotFoundError(AppException):
 class VisitNotFoundError(AppException):
     """Visit not found."""
     pass
+
+
+class InvalidCursorError(AppException):
+    """Pagination cursor is malformed."""
+    pass
+
+
+class InvalidUploadError(AppException):
+    """Upload body is not a well-formed imaging form."""
+    pass
+
+
+class UploadTooLargeError(AppException):
+    """Uploaded file exceeds the configured size limit."""
+    pass
+
+
+class UnsupportedImageTypeError(AppException):
+    """Uploaded file has a content type that is not accepted for imaging."""
+    pass
+
+
+class ImagePreviewUnavailableError(AppException):
+    """Image has no stored file or cannot be decoded into a thumbnail or preview."""
+    pass
+
+
+class TileNotFoundError(AppException):
+    """Tile level or position is outside the image's tile pyramid."""
+    pass
+
+
+class BulkCreateError(AppException):
+    """One or more items of a bulk create failed validation; nothing was inserted."""
+
+    def __init__(self, errors: list):
+        super().__init__(f"{len(errors)} item(s) failed validation")
+        self.errors = errors
@@ -1,13 +1,19 @@
 from datetime import datetime
+from sqlalchemy import DDL, BigInteger, Index, event, func, literal_column, text
 from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional
 
+PLANNED_DATE_DESC_OPS = {"planned_date": "DESC NULLS LAST", "id": "DESC"}
+
 
 class Patient(SQLModel, table=True):
     __tablename__ = "patients"
+    __table_args__ = (
+        Index("ix_patients_user_id_created_at", "user_id", "created_at", "id"),
+    )
     
     id: int | None = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="users.id", index=True)
+    user_id: int = Field(foreign_key="users.id")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -16,7 +22,7 @@ class PatientBiodata(SQLModel, table=True):
     __tablename__ = "patient_biodata"
     
     id: int | None = Field(default=None, primary_key=True)
-    patient_id: int = Field(foreign_key="patients.id", unique=True, index=True)
+    patient_id: int = Field(foreign_key="patients.id", ondelete="CASCADE", unique=True, index=True)
     first_name: str = Field(max_length=100)
     last_name: str = Field(max_length=100)
     date_of_birth: datetime | None = None
@@ -47,11 +53,82 @@ class PatientBiodata(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+# Normalised search keys over biodata. Patient search matches these exact
+# expressions so Postgres can use the indexes built on them; their constants
+# are inlined SQL, as bound parameters would not match the index.
+SEARCH_NAME = func.lower(
+    PatientBiodata.first_name.op("||")(literal_column("' '")).op("||")(PatientBiodata.last_name)
+)
+SEARCH_PHONE = func.regexp_replace(
+    PatientBiodata.phone,
+    literal_column("'[^0-9]'"),
+    literal_column("''"),
+    literal_column("'g'"),
+)
+SEARCH_EMAIL = func.lower(PatientBiodata.email)
+SEARCH_POLICY = func.lower(PatientBiodata.insurance_policy_number)
+# Identifier keys, matched by prefix only and listed in this order.
+SEARCH_PREFIX_KEYS = [SEARCH_EMAIL, SEARCH_POLICY]
+
+# GIN trigram indexes answer fuzzy (%) and substring LIKE matches, including
+# with bound parameters. Postgres only; other dialects skip them.
+for index_name, expression in [
+    ("ix_patient_biodata_search_name", SEARCH_NAME),
+    ("ix_patient_biodata_search_phone", SEARCH_PHONE),
+]:
+    Index(
+        index_name,
+        expression.label("search_key"),
+        postgresql_using="gin",
+        postgresql_ops={"search_key": "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
+
+# Byte-wise ordered btree indexes answer prefix ranges on the identifier keys
+# and return them in (key, patient_id) order, so a prefix shared by many
+# patients stops after one page.
+for index_name, expression in [
+    ("ix_patient_biodata_search_email", SEARCH_EMAIL),
+    ("ix_patient_biodata_search_policy", SEARCH_POLICY),
+]:
+    Index(
+        index_name,
+        expression.label("search_key"),
+        PatientBiodata.patient_id,
+        postgresql_ops={"search_key": "text_pattern_ops"},
+    ).ddl_if(dialect="postgresql")
+
+event.listen(
+    PatientBiodata.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
 class PatientRecordPlanner(SQLModel, table=True):
     __tablename__ = "patient_record_planner"
+    # Matches the newest first, undated last list order on Postgres, and read
+    # backwards the oldest first, undated first one; SQLite has no NULLS LAST
+    # in indexes and gets plain ascending columns.
+    __table_args__ = (
+        Index(
+            "ix_patient_record_planner_patient_id_planned_date",
+            "patient_id",
+            "planned_date",
+            "id",
+            postgresql_ops=PLANNED_DATE_DESC_OPS,
+        ),
+        Index(
+            "ix_patient_record_planner_patient_id_status_planned_date",
+            "patient_id",
+            "status",
+            "planned_date",
+            "id",
+            postgresql_ops=PLANNED_DATE_DESC_OPS,
+        ),
+    )
     
     id: int | None = Field(default=None, primary_key=True)
-    patient_id: int = Field(foreign_key="patients.id", index=True)
+    patient_id: int = Field(foreign_key="patients.id", ondelete="CASCADE")
     title: str = Field(max_length=200)
     description: str | None = Field(default=None)
     planned_date: datetime | None = None
@@ -62,13 +139,84 @@ class PatientRecordPlanner(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class ImageBlob(SQLModel, table=True):
+    """One stored image file, shared by every X-ray / intraoral picture row with its content."""
+    __tablename__ = "image_blobs"
+    __table_args__ = (
+        Index(
+            "ix_image_blobs_unreferenced_at",
+            "unreferenced_at",
+            postgresql_where=text("ref_count = 0"),
+        ),
+    )
+
+    sha256: str = Field(primary_key=True, max_length=64)
+    content_type: str = Field(max_length=100)
+    size_bytes: int = Field(sa_type=BigInteger)
+    ref_count: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    unreferenced_at: datetime | None = None
+
+
+# Reference counts are kept by statement-level triggers on the image tables,
+# so inserts, deletes and patient cascades all adjust them set-based. The
+# sha256 of an image row is never updated. Postgres only.
+BLOB_REF_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION image_blobs_add_refs() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE image_blobs AS blob
+        SET ref_count = blob.ref_count + refs.added, unreferenced_at = NULL
+        FROM (SELECT sha256, count(*) AS added FROM new_rows WHERE sha256 IS NOT NULL GROUP BY sha256) AS refs
+        WHERE blob.sha256 = refs.sha256;
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION image_blobs_drop_refs() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE image_blobs AS blob
+        SET ref_count = blob.ref_count - refs.dropped,
+            unreferenced_at = CASE WHEN blob.ref_count = refs.dropped THEN timezone('utc', now()) END
+        FROM (SELECT sha256, count(*) AS dropped FROM old_rows WHERE sha256 IS NOT NULL GROUP BY sha256) AS refs
+        WHERE blob.sha256 = refs.sha256;
+        RETURN NULL;
+    END $$
+    """,
+]
+BLOB_REF_TRIGGERS = [
+    """
+    CREATE TRIGGER %(table)s_add_blob_refs AFTER INSERT ON %(table)s
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION image_blobs_add_refs()
+    """,
+    """
+    CREATE TRIGGER %(table)s_drop_blob_refs AFTER DELETE ON %(table)s
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION image_blobs_drop_refs()
+    """,
+]
+
+for statement in BLOB_REF_FUNCTIONS:
+    event.listen(
+        ImageBlob.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
+
+
 class IntraoralPicture(SQLModel, table=True):
     __tablename__ = "intraoral_pictures"
+    __table_args__ = (
+        Index("ix_intraoral_pictures_patient_id_taken_date", "patient_id", "taken_date", "id"),
+        Index("ix_intraoral_pictures_sha256", "sha256"),
+    )
     
     id: int | None = Field(default=None, primary_key=True)
-    patient_id: int = Field(foreign_key="patients.id", index=True)
+    patient_id: int = Field(foreign_key="patients.id", ondelete="CASCADE")
     image_url: str = Field(max_length=500)
     image_path: str | None = Field(default=None, max_length=500)
+    content_type: str | None = Field(default=None, max_length=100)
+    size_bytes: int | None = Field(default=None, sa_type=BigInteger)
+    sha256: str | None = Field(default=None, foreign_key="image_blobs.sha256", max_length=64)
     description: str | None = Field(default=None)
     picture_type: str | None = Field(default=None, max_length=100)
     taken_date: datetime = Field(default_factory=datetime.utcnow)
@@ -77,22 +225,41 @@ class IntraoralPicture(SQLModel, table=True):
 
 class XRay(SQLModel, table=True):
     __tablename__ = "xrays"
+    __table_args__ = (
+        Index("ix_xrays_patient_id_taken_date", "patient_id", "taken_date", "id"),
+        Index("ix_xrays_sha256", "sha256"),
+    )
     
     id: int | None = Field(default=None, primary_key=True)
-    patient_id: int = Field(foreign_key="patients.id", index=True)
+    patient_id: int = Field(foreign_key="patients.id", ondelete="CASCADE")
     image_url: str = Field(max_length=500)
     image_path: str | None = Field(default=None, max_length=500)
+    content_type: str | None = Field(default=None, max_length=100)
+    size_bytes: int | None = Field(default=None, sa_type=BigInteger)
+    sha256: str | None = Field(default=None, foreign_key="image_blobs.sha256", max_length=64)
     xray_type: str | None = Field(default=None, max_length=100)
     description: str | None = Field(default=None)
     taken_date: datetime = Field(default_factory=datetime.utcnow)
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+for image_table in (IntraoralPicture.__table__, XRay.__table__):
+    for statement in BLOB_REF_TRIGGERS:
+        event.listen(
+            image_table,
+            "after_create",
+            DDL(statement).execute_if(dialect="postgresql"),
+        )
+
+
 class Visit(SQLModel, table=True):
     __tablename__ = "visits"
+    __table_args__ = (
+        Index("ix_visits_patient_id_visit_date", "patient_id", "visit_date", "id"),
+    )
     
     id: int | None = Field(default=None, primary_key=True)
-    patient_id: int = Field(foreign_key="patients.id", index=True)
+    patient_id: int = Field(foreign_key="patients.id", ondelete="CASCADE")
     visit_date: datetime = Field(default_factory=datetime.utcnow)
     visit_type: str | None = Field(default=None, max_length=100)
     chief_complaint: str | None = Field(default=None)
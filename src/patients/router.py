@@ -1,4 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timezone
+from typing import Annotated, TypeVar
+import anyio
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+from src.config import settings
+from src.exceptions import ExecutorSaturatedError
 from src.patients.schema import (
     PatientCreate,
     PatientResponse,
@@ -9,15 +17,42 @@ from src.patients.schema import (
     PatientRecordPlannerUpdate,
     PatientRecordPlannerResponse,
     IntraoralPictureCreate,
+    IntraoralPictureUpload,
     IntraoralPictureResponse,
     XRayCreate,
+    XRayUpload,
     XRayResponse,
     VisitCreate,
     VisitUpdate,
     VisitResponse,
+    PageQuery,
+    RecordPlannerPageQuery,
+    IntraoralPicturePageQuery,
+    XRayPageQuery,
+    VisitPageQuery,
+    PatientPage,
+    PatientRecordPlannerPage,
+    IntraoralPicturePage,
+    XRayPage,
+    VisitPage,
+    ChartQuery,
+    PatientChartResponse,
+    BulkCreateResponse,
+    PatientBiodataSummary,
+    BiodataSectionsQuery,
+    PatientBiodataSections,
+    PatientSearchQuery,
+    PatientSearchPage,
+    StoredImage,
+    TileLevel,
+    TilePyramidResponse,
+)
+from src.patients.service import PatientService, purge_patient
+from src.patients.dependencies import (
+    get_patient_read_service,
+    get_patient_service,
+    require_patient_access,
 )
-from src.patients.service import PatientService
-from src.patients.dependencies import get_patient_service
 from src.patients.exceptions import (
     PatientNotFoundError,
     PatientBiodataNotFoundError,
@@ -26,9 +61,186 @@ from src.patients.exceptions import (
     IntraoralPictureNotFoundError,
     XRayNotFoundError,
     VisitNotFoundError,
+    InvalidCursorError,
+    BulkCreateError,
+    InvalidUploadError,
+    UploadTooLargeError,
+    UnsupportedImageTypeError,
+    ImagePreviewUnavailableError,
+    TileNotFoundError,
+)
+from src.patients.constants import (
+    DERIVATIVE_CACHE_CONTROL,
+    DERIVATIVE_CONTENT_TYPE,
+    IMAGE_CONTENT_TYPES,
+    IMAGE_DERIVATIVE_RETRY_AFTER_SECONDS,
+    MAX_BULK_CREATE_ITEMS,
+    PREVIEWABLE_CONTENT_TYPES,
+    ImageVariant,
+)
+from src.patients.blob_store import blob_store
+from src.patients.derivatives import image_derivatives
+from src.patients.tiles import TilePyramid, image_tiles
+from src.patients.uploads import UPLOAD_FILE_FIELD, ReceivedImage, receive_image_upload
+from src.patients.utils import ResourceVersion, etag_matches
+
+# Every patient endpoint is staff-only; see require_patient_access.
+router = APIRouter(
+    prefix="/patients",
+    tags=["patients"],
+    dependencies=[Depends(require_patient_access)],
 )
 
-router = APIRouter(prefix="/patients", tags=["patients"])
+BulkItems = Body(min_length=1, max_length=MAX_BULK_CREATE_ITEMS)
+
+UploadFormT = TypeVar("UploadFormT", bound=BaseModel)
+
+
+def not_modified(
+    request: Request, response: Response, version: ResourceVersion
+) -> Response | None:
+    """Return a 304 if the client's copy is current, else tag the full response."""
+    if version.matches(
+        request.headers.get("if-none-match"), request.headers.get("if-modified-since")
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=version.headers)
+    response.headers.update(version.headers)
+    return None
+
+
+def is_conditional(request: Request) -> bool:
+    """Whether a GET carries validators; only then is a row's version worth its own query."""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def bulk_created(ids: list[int]) -> BulkCreateResponse:
+    return BulkCreateResponse(created=len(ids), ids=ids)
+
+
+def bulk_error(e: BulkCreateError) -> HTTPException:
+    return HTTPException(
+        status_code=422, detail=[error.model_dump() for error in e.errors]
+    )
+
+
+def upload_openapi(form: type[BaseModel]) -> dict:
+    """Document a streamed multipart body, which FastAPI cannot infer from the signature."""
+    schema = form.model_json_schema()
+    schema["properties"][UPLOAD_FILE_FIELD] = {"type": "string", "format": "binary"}
+    schema["required"] = [*schema.get("required", []), UPLOAD_FILE_FIELD]
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"multipart/form-data": {"schema": schema}},
+        }
+    }
+
+
+async def receive_upload(
+    request: Request, form: type[UploadFormT]
+) -> tuple[UploadFormT, ReceivedImage]:
+    """Stream an imaging upload to disk, then validate its form fields."""
+    try:
+        image = await receive_image_upload(
+            request,
+            settings.MEDIA_ROOT,
+            settings.MAX_IMAGE_UPLOAD_BYTES,
+            is_stored=blob_store.contains,
+        )
+    except InvalidUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedImageTypeError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    try:
+        return form.model_validate(image.fields), image
+    except ValidationError as e:
+        await image.discard()
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
+
+
+def render_derivatives_later(
+    background_tasks: BackgroundTasks,
+    sha256: str,
+    content_type: str,
+    image_path: str,
+    tiles: bool = False,
+) -> None:
+    """Render thumbnails and previews, and optionally tiles, after responding to an upload."""
+    if content_type in PREVIEWABLE_CONTENT_TYPES:
+        background_tasks.add_task(image_derivatives.render_all, sha256, settings.MEDIA_ROOT / image_path)
+        if tiles:
+            background_tasks.add_task(image_tiles.prepare, sha256, settings.MEDIA_ROOT / image_path)
+
+
+async def derivative_response(request: Request, image: StoredImage, variant: ImageVariant) -> Response:
+    """Serve a cached thumbnail or preview, rendering it on first request."""
+    if image.sha256 is None or image.content_type not in PREVIEWABLE_CONTENT_TYPES:
+        raise HTTPException(status_code=404, detail="No preview available for this image")
+    headers = {"ETag": f'"{image.sha256}-{variant.value}"', "Cache-Control": DERIVATIVE_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    try:
+        path = await image_derivatives.get(
+            image.sha256, settings.MEDIA_ROOT / image.image_path, variant
+        )
+    except ImagePreviewUnavailableError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ExecutorSaturatedError:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many previews are being rendered, please retry shortly",
+            headers={"Retry-After": str(IMAGE_DERIVATIVE_RETRY_AFTER_SECONDS)},
+        )
+    return FileResponse(path, media_type=DERIVATIVE_CONTENT_TYPE, headers=headers)
+
+
+async def tile_pyramid(image: StoredImage) -> TilePyramid:
+    """The image's deep-zoom tile pyramid, building it on first request."""
+    if image.sha256 is None or image.content_type not in PREVIEWABLE_CONTENT_TYPES:
+        raise HTTPException(status_code=404, detail="No tiles available for this image")
+    try:
+        return await image_tiles.get(image.sha256, settings.MEDIA_ROOT / image.image_path)
+    except ImagePreviewUnavailableError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ExecutorSaturatedError:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many images are being tiled, please retry shortly",
+            headers={"Retry-After": str(IMAGE_DERIVATIVE_RETRY_AFTER_SECONDS)},
+        )
+
+
+async def stored_file_response(request: Request, image: StoredImage, name: str) -> Response:
+    """Stream an uploaded image from disk, honouring Range / If-Range and conditional GETs.
+
+    The file is sent in FileResponse-sized chunks, so a download holds one
+    chunk in memory whatever the image size. Only uploaded images are
+    served: image_path is trusted only when the upload endpoint set it.
+    """
+    if image.sha256 is None:
+        raise HTTPException(status_code=404, detail="Image was not uploaded to this server")
+    path = settings.MEDIA_ROOT / image.image_path
+    try:
+        stat_result = await anyio.Path(path).stat()
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Image file is missing")
+    response = FileResponse(
+        path,
+        media_type=image.content_type,
+        filename=f"{name}{IMAGE_CONTENT_TYPES.get(image.content_type, '')}",
+        stat_result=stat_result,
+        content_disposition_type="inline",
+    )
+    # Reuse FileResponse's validators so If-Range and If-None-Match agree.
+    version = ResourceVersion(
+        etag=response.headers["etag"],
+        last_modified=datetime.fromtimestamp(int(stat_result.st_mtime), timezone.utc),
+    )
+    return not_modified(request, response, version) or response
 
 
 @router.post("", response_model=PatientResponse, status_code=status.HTTP_201_CREATED)
@@ -40,25 +252,64 @@ async def create_patient(
     return await patient_service.create_patient(request)
 
 
+@router.get("/search", response_model=PatientSearchPage)
+async def search_patients(
+    query: Annotated[PatientSearchQuery, Query()],
+    patient_service: PatientService = Depends(get_patient_read_service),
+):
+    """Search patients by name, phone, email or insurance policy number, best match first."""
+    try:
+        results, next_cursor = await patient_service.search_patients(query)
+        return PatientSearchPage(items=results, next_cursor=next_cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/{patient_id}", response_model=PatientResponse)
 async def get_patient(
     patient_id: int,
-    patient_service: PatientService = Depends(get_patient_service),
+    request: Request,
+    response: Response,
+    patient_service: PatientService = Depends(get_patient_read_service),
 ):
-    """Get patient by ID."""
+    """Get patient by ID; honours If-None-Match / If-Modified-Since."""
     try:
-        return await patient_service.get_patient_by_id(patient_id)
+        if is_conditional(request):
+            version = await patient_service.get_patient_version(patient_id)
+            if cached := not_modified(request, response, version):
+                return cached
+        patient = await patient_service.get_patient_by_id(patient_id)
     except PatientNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    response.headers.update(ResourceVersion.of("patient", patient_id, patient.updated_at).headers)
+    return patient
 
 
-@router.get("/user/{user_id}", response_model=list[PatientResponse])
+@router.get("/{patient_id}/chart", response_model=PatientChartResponse)
+async def get_patient_chart(
+    patient_id: int,
+    query: Annotated[ChartQuery, Query()],
+    patient_service: PatientService = Depends(get_patient_read_service),
+):
+    """Get a patient with biodata and the most recent visits, planners, X-rays and pictures."""
+    try:
+        return await patient_service.get_patient_chart(patient_id, query)
+    except PatientNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/user/{user_id}", response_model=PatientPage)
 async def get_patients_by_user(
     user_id: int,
-    patient_service: PatientService = Depends(get_patient_service),
+    query: Annotated[PageQuery, Query()],
+    patient_service: PatientService = Depends(get_patient_read_service),
 ):
-    """Get all patients for a user."""
-    return await patient_service.get_patients_by_user_id(user_id)
+    """Get a page of patients for a user, ordered by creation date."""
+    try:
+        patients, next_cursor = await patient_service.get_patients_by_user_id(user_id, query)
+        return PatientPage(items=patients, next_cursor=next_cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.delete("/{patient_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -73,6 +324,21 @@ async def delete_patient(
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.post("/{patient_id}/purge", status_code=status.HTTP_202_ACCEPTED)
+async def purge_patient_in_background(
+    patient_id: int,
+    background_tasks: BackgroundTasks,
+    patient_service: PatientService = Depends(get_patient_service),
+):
+    """Delete a patient with a very large history in batches after responding."""
+    try:
+        await patient_service.get_patient_version(patient_id)
+    except PatientNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    background_tasks.add_task(purge_patient, patient_id)
+    return Response(status_code=status.HTTP_202_ACCEPTED)
+
+
 @router.post("/biodata", response_model=PatientBiodataResponse, status_code=status.HTTP_201_CREATED)
 async def create_biodata(
     request: PatientBiodataCreate,
@@ -88,11 +354,48 @@ async def create_biodata(
 @router.get("/biodata/{patient_id}", response_model=PatientBiodataResponse)
 async def get_biodata(
     patient_id: int,
-    patient_service: PatientService = Depends(get_patient_service),
+    request: Request,
+    response: Response,
+    patient_service: PatientService = Depends(get_patient_read_service),
+):
+    """Get patient biodata; honours If-None-Match / If-Modified-Since."""
+    try:
+        if is_conditional(request):
+            version = await patient_service.get_biodata_version(patient_id)
+            if cached := not_modified(request, response, version):
+                return cached
+        biodata = await patient_service.get_biodata_by_patient_id(patient_id)
+    except PatientBiodataNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    response.headers.update(ResourceVersion.of("biodata", patient_id, biodata.updated_at).headers)
+    return biodata
+
+
+@router.get("/biodata/{patient_id}/summary", response_model=PatientBiodataSummary)
+async def get_biodata_summary(
+    patient_id: int,
+    patient_service: PatientService = Depends(get_patient_read_service),
 ):
-    """Get patient biodata."""
+    """Get a patient's name, contact and date of birth without the clinical history."""
     try:
-        return await patient_service.get_biodata_by_patient_id(patient_id)
+        return await patient_service.get_biodata_summary(patient_id)
+    except PatientBiodataNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get(
+    "/biodata/{patient_id}/sections",
+    response_model=PatientBiodataSections,
+    response_model_exclude_unset=True,
+)
+async def get_biodata_sections(
+    patient_id: int,
+    query: Annotated[BiodataSectionsQuery, Query()],
+    patient_service: PatientService = Depends(get_patient_read_service),
+):
+    """Get the requested biodata sections (contact, medical, dental, lifestyle, insurance)."""
+    try:
+        return await patient_service.get_biodata_sections(patient_id, query.include)
     except PatientBiodataNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -119,13 +422,32 @@ async def create_record_planner(
     return await patient_service.create_record_planner(request)
 
 
-@router.get("/record-planner/{patient_id}", response_model=list[PatientRecordPlannerResponse])
+@router.post("/record-planner/bulk", response_model=BulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_record_planners(
+    requests: Annotated[list[PatientRecordPlannerCreate], BulkItems],
+    patient_service: PatientService = Depends(get_patient_service),
+):
+    """Create many record planner entries in one transaction; all or nothing."""
+    try:
+        return bulk_created(await patient_service.create_record_planners(requests))
+    except BulkCreateError as e:
+        raise bulk_error(e)
+
+
+@router.get("/record-planner/{patient_id}", response_model=PatientRecordPlannerPage)
 async def get_record_planners(
     patient_id: int,
-    patient_service: PatientService = Depends(get_patient_service),
+    query: Annotated[RecordPlannerPageQuery, Query()],
+    patient_service: PatientService = Depends(get_patient_read_service),
 ):
-    """Get all record planners for a patient."""
-    return await patient_service.get_record_planners_by_patient_id(patient_id)
+    """Get a page of record planners for a patient, ordered by planned date."""
+    try:
+        planners, next_cursor = await patient_service.get_record_planners_by_patient_id(
+            patient_id, query
+        )
+        return PatientRecordPlannerPage(items=planners, next_cursor=next_cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.put("/record-planner/{planner_id}", response_model=PatientRecordPlannerResponse)
@@ -162,13 +484,88 @@ async def create_intraoral_picture(
     return await patient_service.create_intraoral_picture(request)
 
 
-@router.get("/intraoral-pictures/{patient_id}", response_model=list[IntraoralPictureResponse])
+@router.post(
+    "/intraoral-pictures/upload",
+    response_model=IntraoralPictureResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=upload_openapi(IntraoralPictureUpload),
+)
+async def upload_intraoral_picture(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    patient_service: PatientService = Depends(get_patient_service),
+):
+    """Upload an intraoral picture as multipart/form-data, streamed to disk as it arrives."""
+    upload, image = await receive_upload(request, IntraoralPictureUpload)
+    try:
+        picture = await patient_service.create_uploaded_intraoral_picture(upload, image)
+        render_derivatives_later(
+            background_tasks, picture.sha256, picture.content_type, picture.image_path
+        )
+        return picture
+    except PatientNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except InvalidUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        await image.discard()
+
+
+@router.post("/intraoral-pictures/bulk", response_model=BulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_intraoral_pictures(
+    requests: Annotated[list[IntraoralPictureCreate], BulkItems],
+    patient_service: PatientService = Depends(get_patient_service),
+):
+    """Add many intraoral pictures in one transaction; all or nothing."""
+    try:
+        return bulk_created(await patient_service.create_intraoral_pictures(requests))
+    except BulkCreateError as e:
+        raise bulk_error(e)
+
+
+@router.get("/intraoral-pictures/{patient_id}", response_model=IntraoralPicturePage)
 async def get_intraoral_pictures(
     patient_id: int,
-    patient_service: PatientService = Depends(get_patient_service),
+    query: Annotated[IntraoralPicturePageQuery, Query()],
+    patient_service: PatientService = Depends(get_patient_read_service),
+):
+    """Get a page of intraoral pictures for a patient, ordered by date taken."""
+    try:
+        pictures, next_cursor = await patient_service.get_intraoral_pictures_by_patient_id(
+            patient_id, query
+        )
+        return IntraoralPicturePage(items=pictures, next_cursor=next_cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/intraoral-pictures/{picture_id}/file", response_class=FileResponse)
+async def download_intraoral_picture(
+    picture_id: int,
+    request: Request,
+    patient_service: PatientService = Depends(get_patient_read_service),
 ):
-    """Get all intraoral pictures for a patient."""
-    return await patient_service.get_intraoral_pictures_by_patient_id(patient_id)
+    """Download an uploaded intraoral picture; supports Range requests for progressive viewing."""
+    try:
+        image = await patient_service.get_intraoral_picture_image(picture_id)
+    except IntraoralPictureNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return await stored_file_response(request, image, f"intraoral-picture-{picture_id}")
+
+
+@router.get("/intraoral-pictures/{picture_id}/derivatives/{variant}", response_class=FileResponse)
+async def get_intraoral_picture_derivative(
+    picture_id: int,
+    variant: ImageVariant,
+    request: Request,
+    patient_service: PatientService = Depends(get_patient_read_service),
+):
+    """Get an intraoral picture's thumbnail or web preview, cacheable for good."""
+    try:
+        image = await patient_service.get_intraoral_picture_image(picture_id)
+    except IntraoralPictureNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return await derivative_response(request, image, variant)
 
 
 @router.delete("/intraoral-pictures/{picture_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -192,13 +589,137 @@ async def create_xray(
     return await patient_service.create_xray(request)
 
 
-@router.get("/xrays/{patient_id}", response_model=list[XRayResponse])
+@router.post(
+    "/xrays/upload",
+    response_model=XRayResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=upload_openapi(XRayUpload),
+)
+async def upload_xray(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    patient_service: PatientService = Depends(get_patient_service),
+):
+    """Upload an X-ray as multipart/form-data, streamed to disk as it arrives."""
+    upload, image = await receive_upload(request, XRayUpload)
+    try:
+        xray = await patient_service.create_uploaded_xray(upload, image)
+        render_derivatives_later(
+            background_tasks, xray.sha256, xray.content_type, xray.image_path, tiles=True
+        )
+        return xray
+    except PatientNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except InvalidUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        await image.discard()
+
+
+@router.post("/xrays/bulk", response_model=BulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_xrays(
+    requests: Annotated[list[XRayCreate], BulkItems],
+    patient_service: PatientService = Depends(get_patient_service),
+):
+    """Add many X-rays in one transaction; all or nothing."""
+    try:
+        return bulk_created(await patient_service.create_xrays(requests))
+    except BulkCreateError as e:
+        raise bulk_error(e)
+
+
+@router.get("/xrays/{patient_id}", response_model=XRayPage)
 async def get_xrays(
     patient_id: int,
-    patient_service: PatientService = Depends(get_patient_service),
+    query: Annotated[XRayPageQuery, Query()],
+    patient_service: PatientService = Depends(get_patient_read_service),
 ):
-    """Get all X-rays for a patient."""
-    return await patient_service.get_xrays_by_patient_id(patient_id)
+    """Get a page of X-rays for a patient, ordered by date taken."""
+    try:
+        xrays, next_cursor = await patient_service.get_xrays_by_patient_id(patient_id, query)
+        return XRayPage(items=xrays, next_cursor=next_cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/xrays/{xray_id}/file", response_class=FileResponse)
+async def download_xray(
+    xray_id: int,
+    request: Request,
+    patient_service: PatientService = Depends(get_patient_read_service),
+):
+    """Download an uploaded X-ray; supports Range requests for progressive viewing."""
+    try:
+        image = await patient_service.get_xray_image(xray_id)
+    except XRayNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return await stored_file_response(request, image, f"xray-{xray_id}")
+
+
+@router.get("/xrays/{xray_id}/tiles", response_model=TilePyramidResponse)
+async def get_xray_tile_pyramid(
+    xray_id: int,
+    patient_service: PatientService = Depends(get_patient_read_service),
+):
+    """Get the layout of an X-ray's deep-zoom tiles, building them on first request."""
+    try:
+        image = await patient_service.get_xray_image(xray_id)
+    except XRayNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    pyramid = await tile_pyramid(image)
+    return TilePyramidResponse(
+        width=pyramid.width,
+        height=pyramid.height,
+        tile_size=pyramid.tile_size,
+        content_type=DERIVATIVE_CONTENT_TYPE,
+        levels=[
+            TileLevel(width=width, height=height, columns=columns, rows=rows)
+            for width, height, columns, rows in pyramid.levels
+        ],
+    )
+
+
+@router.get("/xrays/{xray_id}/tiles/{level}/{column}/{row}", response_class=Response)
+async def get_xray_tile(
+    xray_id: int,
+    level: int,
+    column: int,
+    row: int,
+    request: Request,
+    patient_service: PatientService = Depends(get_patient_read_service),
+):
+    """Get one deep-zoom tile of an X-ray, cacheable for good."""
+    try:
+        image = await patient_service.get_xray_image(xray_id)
+    except XRayNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    headers = {
+        "ETag": f'"{image.sha256}-{level}-{column}-{row}"',
+        "Cache-Control": DERIVATIVE_CACHE_CONTROL,
+    }
+    if image.sha256 is not None and etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    pyramid = await tile_pyramid(image)
+    try:
+        tile = pyramid.tile(level, column, row)
+    except TileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return Response(content=tile, media_type=DERIVATIVE_CONTENT_TYPE, headers=headers)
+
+
+@router.get("/xrays/{xray_id}/derivatives/{variant}", response_class=FileResponse)
+async def get_xray_derivative(
+    xray_id: int,
+    variant: ImageVariant,
+    request: Request,
+    patient_service: PatientService = Depends(get_patient_read_service),
+):
+    """Get an X-ray's thumbnail or web preview, cacheable for good."""
+    try:
+        image = await patient_service.get_xray_image(xray_id)
+    except XRayNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return await derivative_response(request, image, variant)
 
 
 @router.delete("/xrays/{xray_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -222,25 +743,50 @@ async def create_visit(
     return await patient_service.create_visit(request)
 
 
-@router.get("/visits/{patient_id}", response_model=list[VisitResponse])
+@router.post("/visits/bulk", response_model=BulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_visits(
+    requests: Annotated[list[VisitCreate], BulkItems],
+    patient_service: PatientService = Depends(get_patient_service),
+):
+    """Create many visits in one transaction; all or nothing."""
+    try:
+        return bulk_created(await patient_service.create_visits(requests))
+    except BulkCreateError as e:
+        raise bulk_error(e)
+
+
+@router.get("/visits/{patient_id}", response_model=VisitPage)
 async def get_visits(
     patient_id: int,
-    patient_service: PatientService = Depends(get_patient_service),
+    query: Annotated[VisitPageQuery, Query()],
+    patient_service: PatientService = Depends(get_patient_read_service),
 ):
-    """Get all visits for a patient."""
-    return await patient_service.get_visits_by_patient_id(patient_id)
+    """Get a page of visits for a patient, ordered by visit date."""
+    try:
+        visits, next_cursor = await patient_service.get_visits_by_patient_id(patient_id, query)
+        return VisitPage(items=visits, next_cursor=next_cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/visits/detail/{visit_id}", response_model=VisitResponse)
 async def get_visit(
     visit_id: int,
-    patient_service: PatientService = Depends(get_patient_service),
+    request: Request,
+    response: Response,
+    patient_service: PatientService = Depends(get_patient_read_service),
 ):
-    """Get a specific visit by ID."""
+    """Get a specific visit by ID; honours If-None-Match / If-Modified-Since."""
     try:
-        return await patient_service.get_visit_by_id(visit_id)
+        if is_conditional(request):
+            version = await patient_service.get_visit_version(visit_id)
+            if cached := not_modified(request, response, version):
+                return cached
+        visit = await patient_service.get_visit_by_id(visit_id)
     except VisitNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    response.headers.update(ResourceVersion.of("visit", visit_id, visit.updated_at).headers)
+    return visit
 
 
 @router.put("/visits/{visit_id}", response_model=VisitResponse)
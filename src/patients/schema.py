@@ -1,6 +1,76 @@
 from datetime import datetime
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, Generic, Optional, TypeVar
+from src.patients.constants import (
+    DEFAULT_CHART_SECTION_LIMIT,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_SEARCH_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    MIN_SEARCH_TERM_LENGTH,
+    BiodataSection,
+    ChartSection,
+    SortOrder,
+)
+
+ItemT = TypeVar("ItemT")
+
+
+class PageQuery(BaseModel):
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+    order: SortOrder = SortOrder.DESC
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+
+
+class RecordPlannerPageQuery(PageQuery):
+    status: Optional[str] = Field(default=None, max_length=50)
+
+
+class IntraoralPicturePageQuery(PageQuery):
+    picture_type: Optional[str] = Field(default=None, max_length=100)
+
+
+class XRayPageQuery(PageQuery):
+    xray_type: Optional[str] = Field(default=None, max_length=100)
+
+
+class VisitPageQuery(PageQuery):
+    visit_type: Optional[str] = Field(default=None, max_length=100)
+
+
+class PatientSearchQuery(BaseModel):
+    q: str = Field(min_length=MIN_SEARCH_TERM_LENGTH, max_length=100)
+    user_id: Optional[int] = None
+    limit: int = Field(default=DEFAULT_SEARCH_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+
+    @field_validator("q", mode="before")
+    @classmethod
+    def strip_term(cls, q: Any) -> Any:
+        """Strip before the length check, so padding cannot pass a too-short term."""
+        return q.strip() if isinstance(q, str) else q
+
+
+class ChartQuery(BaseModel):
+    include: list[ChartSection] = Field(default_factory=lambda: list(ChartSection))
+    limit: int = Field(default=DEFAULT_CHART_SECTION_LIMIT, ge=1, le=MAX_PAGE_SIZE)
+
+
+class CursorPage(BaseModel, Generic[ItemT]):
+    items: list[ItemT]
+    next_cursor: Optional[str] = None
+
+
+class BulkCreateResponse(BaseModel):
+    created: int
+    ids: list[int]  # ids[i] is the row created from item i of the request
+
+
+class BulkItemError(BaseModel):
+    index: int
+    field: str
+    detail: str
 
 
 class PatientCreate(BaseModel):
@@ -112,6 +182,51 @@ class PatientBiodataResponse(BaseModel):
         from_attributes = True
 
 
+class PatientBiodataSummary(BaseModel):
+    id: int
+    patient_id: int
+    first_name: str
+    last_name: str
+    date_of_birth: Optional[datetime]
+    gender: Optional[str]
+    phone: Optional[str]
+    email: Optional[str]
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class BiodataSectionsQuery(BaseModel):
+    include: list[BiodataSection] = Field(min_length=1)
+
+
+class PatientBiodataSections(BaseModel):
+    """Requested biodata sections; fields of other sections are left out."""
+
+    patient_id: int
+    address: Optional[str] = None
+    occupation: Optional[str] = None
+    emergency_contact_name: Optional[str] = None
+    emergency_contact_phone: Optional[str] = None
+    medical_history: Optional[str] = None
+    allergies: Optional[str] = None
+    medications: Optional[str] = None
+    previous_surgeries: Optional[str] = None
+    family_medical_history: Optional[str] = None
+    previous_dental_treatments: Optional[str] = None
+    gum_disease_history: Optional[str] = None
+    dental_visit_frequency: Optional[str] = None
+    oral_hygiene_habits: Optional[str] = None
+    dental_trauma_history: Optional[str] = None
+    smoking_tobacco_use: Optional[str] = None
+    alcohol_consumption: Optional[str] = None
+    diet_habits: Optional[str] = None
+    insurance_provider: Optional[str] = None
+    insurance_policy_number: Optional[str] = None
+    consent_forms: Optional[str] = None
+
+
 class PatientRecordPlannerCreate(BaseModel):
     patient_id: int
     title: str = Field(min_length=1, max_length=200)
@@ -155,11 +270,23 @@ class IntraoralPictureCreate(BaseModel):
     taken_date: Optional[datetime] = None
 
 
+class IntraoralPictureUpload(BaseModel):
+    """Form fields sent with an uploaded intraoral picture."""
+    patient_id: int
+    description: Optional[str] = None
+    picture_type: Optional[str] = Field(default=None, max_length=100)
+    taken_date: Optional[datetime] = None
+    sha256: Optional[str] = Field(default=None, pattern="^[0-9a-f]{64}$")
+
+
 class IntraoralPictureResponse(BaseModel):
     id: int
     patient_id: int
     image_url: str
     image_path: Optional[str]
+    content_type: Optional[str] = None
+    size_bytes: Optional[int] = None
+    sha256: Optional[str] = None
     description: Optional[str]
     picture_type: Optional[str]
     taken_date: datetime
@@ -178,11 +305,23 @@ class XRayCreate(BaseModel):
     taken_date: Optional[datetime] = None
 
 
+class XRayUpload(BaseModel):
+    """Form fields sent with an uploaded X-ray."""
+    patient_id: int
+    xray_type: Optional[str] = Field(default=None, max_length=100)
+    description: Optional[str] = None
+    taken_date: Optional[datetime] = None
+    sha256: Optional[str] = Field(default=None, pattern="^[0-9a-f]{64}$")
+
+
 class XRayResponse(BaseModel):
     id: int
     patient_id: int
     image_url: str
     image_path: Optional[str]
+    content_type: Optional[str] = None
+    size_bytes: Optional[int] = None
+    sha256: Optional[str] = None
     xray_type: Optional[str]
     description: Optional[str]
     taken_date: datetime
@@ -231,3 +370,80 @@ class VisitResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class PatientPage(CursorPage[PatientResponse]):
+    pass
+
+
+class StoredImage(BaseModel):
+    """Where an X-ray's or intraoral picture's file lives.
+
+    sha256 is None for external images.
+    """
+    patient_id: int
+    image_path: Optional[str]
+    content_type: Optional[str]
+    sha256: Optional[str]
+
+
+class TileLevel(BaseModel):
+    width: int
+    height: int
+    columns: int
+    rows: int
+
+
+class TilePyramidResponse(BaseModel):
+    """Layout of an X-ray's deep-zoom tiles; levels[0] is the smallest."""
+    width: int
+    height: int
+    tile_size: int
+    content_type: str
+    levels: list[TileLevel]
+
+
+class PatientSearchResult(BaseModel):
+    patient_id: int
+    first_name: str
+    last_name: str
+    date_of_birth: Optional[datetime]
+    phone: Optional[str]
+    email: Optional[str]
+    insurance_policy_number: Optional[str]
+    score: float
+
+
+class PatientSearchPage(CursorPage[PatientSearchResult]):
+    pass
+
+
+class PatientRecordPlannerPage(CursorPage[PatientRecordPlannerResponse]):
+    pass
+
+
+class IntraoralPicturePage(CursorPage[IntraoralPictureResponse]):
+    pass
+
+
+class XRayPage(CursorPage[XRayResponse]):
+    pass
+
+
+class VisitPage(CursorPage[VisitResponse]):
+    pass
+
+
+class PatientChartResponse(BaseModel):
+    """A patient with the most recent items of each requested section.
+
+    Sections left out of the request are null; so is biodata when the
+    patient has none yet.
+    """
+
+    patient: PatientResponse
+    biodata: Optional[PatientBiodataResponse] = None
+    visits: Optional[list[VisitResponse]] = None
+    record_planners: Optional[list[PatientRecordPlannerResponse]] = None
+    xrays: Optional[list[XRayResponse]] = None
+    intraoral_pictures: Optional[list[IntraoralPictureResponse]] = None
@@ -1,14 +1,38 @@
+import re
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    Select,
+    and_,
+    bindparam,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import load_only
+from sqlmodel import SQLModel
 from typing import Optional
+from src.database import AsyncSessionLocal
 from src.patients.models import (
     Patient,
+    ImageBlob,
     PatientBiodata,
     PatientRecordPlanner,
     IntraoralPicture,
     XRay,
     Visit,
+    SEARCH_NAME,
+    SEARCH_PHONE,
+    SEARCH_PREFIX_KEYS,
 )
 from src.patients.schema import (
     PatientCreate,
@@ -18,8 +42,23 @@ from src.patients.schema import (
     PatientRecordPlannerUpdate,
     IntraoralPictureCreate,
     XRayCreate,
+    XRayUpload,
+    IntraoralPictureUpload,
     VisitCreate,
     VisitUpdate,
+    PageQuery,
+    RecordPlannerPageQuery,
+    IntraoralPicturePageQuery,
+    XRayPageQuery,
+    VisitPageQuery,
+    ChartQuery,
+    PatientChartResponse,
+    PatientBiodataSummary,
+    PatientBiodataSections,
+    PatientSearchQuery,
+    PatientSearchResult,
+    BulkItemError,
+    StoredImage,
 )
 from src.patients.exceptions import (
     PatientNotFoundError,
@@ -29,19 +68,277 @@ from src.patients.exceptions import (
     IntraoralPictureNotFoundError,
     XRayNotFoundError,
     VisitNotFoundError,
+    BulkCreateError,
+    InvalidCursorError,
+    InvalidUploadError,
+)
+from src.patients.constants import (
+    BIODATA_SECTION_FIELDS,
+    MIN_SEARCH_TERM_LENGTH,
+    PURGE_BATCH_SIZE,
+    UPLOADED_IMAGE_URLS,
+    BiodataSection,
+    ChartSection,
+    SortOrder,
+)
+from src.patients.utils import (
+    Keyset,
+    ResourceVersion,
+    decode_search_cursor,
+    encode_search_cursor,
+    escape_like,
+    pattern_order,
+    prefix_range,
+)
+from src.patients.blob_store import blob_store
+from src.patients.uploads import ReceivedImage
+
+PATIENT_KEYSET = Keyset(Patient.created_at, Patient.id)
+RECORD_PLANNER_KEYSET = Keyset(
+    PatientRecordPlanner.planned_date, PatientRecordPlanner.id, nullable=True
+)
+INTRAORAL_PICTURE_KEYSET = Keyset(IntraoralPicture.taken_date, IntraoralPicture.id)
+XRAY_KEYSET = Keyset(XRay.taken_date, XRay.id)
+VISIT_KEYSET = Keyset(Visit.visit_date, Visit.id)
+
+# Hot statements are built once with bind parameters: SQLAlchemy then reuses
+# their memoized cache key and compiled SQL instead of rebuilding both per
+# request, and asyncpg reuses the connection's prepared statement.
+PATIENT_UPDATED_AT = select(Patient.updated_at).where(Patient.id == bindparam("patient_id"))
+PATIENT_WITH_BIODATA = (
+    select(Patient, PatientBiodata)
+    .outerjoin(PatientBiodata, PatientBiodata.patient_id == Patient.id)
+    .where(Patient.id == bindparam("patient_id"))
+)
+BIODATA_BY_PATIENT = select(PatientBiodata).where(
+    PatientBiodata.patient_id == bindparam("patient_id")
+)
+# Only the summary columns; touching any other attribute raises instead of
+# lazy-loading the clinical text.
+BIODATA_SUMMARY_BY_PATIENT = BIODATA_BY_PATIENT.options(
+    load_only(
+        *(getattr(PatientBiodata, field) for field in PatientBiodataSummary.model_fields),
+        raiseload=True,
+    )
+)
+BIODATA_UPDATED_AT = select(PatientBiodata.updated_at).where(
+    PatientBiodata.patient_id == bindparam("patient_id")
 )
+VISIT_UPDATED_AT = select(Visit.updated_at).where(Visit.id == bindparam("visit_id"))
+XRAY_IMAGE = select(XRay.patient_id, XRay.image_path, XRay.content_type, XRay.sha256).where(
+    XRay.id == bindparam("xray_id")
+)
+# Uploads take their id before the insert so image_url can name its /file endpoint.
+NEXT_IMAGE_ID = {
+    model: select(func.nextval(func.pg_get_serial_sequence(model.__tablename__, "id")))
+    for model in (XRay, IntraoralPicture)
+}
+INTRAORAL_PICTURE_IMAGE = select(
+    IntraoralPicture.patient_id,
+    IntraoralPicture.image_path,
+    IntraoralPicture.content_type,
+    IntraoralPicture.sha256,
+).where(IntraoralPicture.id == bindparam("picture_id"))
+
+# One batch of a patient's history per table, for purge_patient.
+PURGE_HISTORY_BATCHES = [
+    delete(model).where(
+        model.id.in_(
+            select(model.id)
+            .where(model.patient_id == bindparam("patient_id"))
+            .limit(bindparam("batch_size"))
+            .scalar_subquery()
+        )
+    )
+    for model in (Visit, PatientRecordPlanner, XRay, IntraoralPicture)
+]
+
+
+def page_statements(statement: Select, keyset: Keyset) -> dict[bool, Select]:
+    """The statement in keyset order with a bound limit, keyed by descending."""
+    return {
+        descending: statement.order_by(*keyset.order_by(descending)).limit(bindparam("limit"))
+        for descending in (True, False)
+    }
+
+
+def rows_by_patient(model) -> Select:
+    return select(model).where(model.patient_id == bindparam("patient_id"))
+
+
+PATIENT_PAGES = page_statements(
+    select(Patient).where(Patient.user_id == bindparam("user_id")), PATIENT_KEYSET
+)
+RECORD_PLANNER_PAGES = page_statements(
+    rows_by_patient(PatientRecordPlanner), RECORD_PLANNER_KEYSET
+)
+INTRAORAL_PICTURE_PAGES = page_statements(
+    rows_by_patient(IntraoralPicture), INTRAORAL_PICTURE_KEYSET
+)
+XRAY_PAGES = page_statements(rows_by_patient(XRay), XRAY_KEYSET)
+VISIT_PAGES = page_statements(rows_by_patient(Visit), VISIT_KEYSET)
+
+# Chart list sections: the newest `limit` rows of each list.
+CHART_LIST_SECTIONS = {
+    ChartSection.VISITS: VISIT_PAGES[True],
+    ChartSection.RECORD_PLANNERS: RECORD_PLANNER_PAGES[True],
+    ChartSection.XRAYS: XRAY_PAGES[True],
+    ChartSection.INTRAORAL_PICTURES: INTRAORAL_PICTURE_PAGES[True],
+}
 
 
 class PatientService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create_patient(self, request: PatientCreate) -> Patient:
-        new_patient = Patient(user_id=request.user_id)
-        self.db.add(new_patient)
+    async def _fetch_page(
+        self,
+        pages: dict[bool, Select],
+        params: dict,
+        keyset: Keyset,
+        query: PageQuery,
+        *filters: ColumnElement,
+    ) -> tuple[list, str | None]:
+        """Run one keyset-paginated page; return its rows and the next cursor.
+
+        Starts from the prebuilt page statement, so an unfiltered first page
+        builds no SQL at all.
+        """
+        descending = query.order == SortOrder.DESC
+        conditions = list(filters)
+        if query.cursor:
+            conditions.append(keyset.after(query.cursor, descending))
+        if query.date_from:
+            conditions.append(keyset.sort_column >= query.date_from)
+        if query.date_to:
+            conditions.append(keyset.sort_column <= query.date_to)
+        statement = pages[descending]
+        if conditions:
+            statement = statement.where(*conditions)
+
+        result = await self.db.execute(statement, {**params, "limit": query.limit + 1})
+        rows = list(result.scalars().all())
+        if len(rows) <= query.limit:
+            return rows, None
+        rows = rows[: query.limit]
+        return rows, keyset.cursor_for(rows[-1])
+
+    async def _insert(self, row: SQLModel):
+        """INSERT ... RETURNING the new row and commit: no refresh round trip.
+
+        Building the model instance first fills its default_factory columns.
+        The id is left to the database unless the row already has one.
+        """
+        model = type(row)
+        values = row.model_dump(exclude={"id"} if row.id is None else None)
+        created = await self.db.scalar(insert(model).values(values).returning(model))
         await self.db.commit()
-        await self.db.refresh(new_patient)
-        return new_patient
+        return created
+
+    async def _insert_many(self, rows: list[SQLModel]) -> list[int]:
+        """Insert patient-owned rows in one transaction; return their ids in order.
+
+        Every patient_id is checked up front so a bad item is reported with
+        its index instead of aborting the batch midway. The insert is a single
+        executemany that SQLAlchemy sends as multi-row INSERT ... RETURNING
+        batches.
+        """
+        model = type(rows[0])
+        existing_patient_ids = set(
+            await self.db.scalars(
+                select(Patient.id).where(Patient.id.in_({row.patient_id for row in rows}))
+            )
+        )
+        errors = [
+            BulkItemError(index=index, field="patient_id", detail="Patient not found")
+            for index, row in enumerate(rows)
+            if row.patient_id not in existing_patient_ids
+        ]
+        if errors:
+            raise BulkCreateError(errors)
+
+        ids = list(
+            await self.db.scalars(
+                insert(model).returning(model.id, sort_by_parameter_order=True),
+                [row.model_dump(exclude={"id"}) for row in rows],
+            )
+        )
+        await self.db.commit()
+        return ids
+
+    async def _update(self, model: type[SQLModel], where: ColumnElement, values: dict):
+        """UPDATE ... RETURNING the row and commit; None if nothing matched."""
+        updated = await self.db.scalar(
+            update(model).where(where).values(**values).returning(model)
+        )
+        if updated is not None:
+            await self.db.commit()
+        return updated
+
+    async def _delete(self, model: type[SQLModel], row_id: int) -> bool:
+        """DELETE ... RETURNING id and commit; False if the row did not exist."""
+        deleted_id = await self.db.scalar(
+            delete(model).where(model.id == row_id).returning(model.id)
+        )
+        if deleted_id is None:
+            return False
+        await self.db.commit()
+        return True
+
+    async def _create_uploaded_image(
+        self,
+        model: type[XRay] | type[IntraoralPicture],
+        request: XRayUpload | IntraoralPictureUpload,
+        image: ReceivedImage,
+    ) -> XRay | IntraoralPicture:
+        """Put an upload in the blob store and insert its row referencing the blob.
+
+        The image_blobs upsert locks the blob's row until commit, so the garbage
+        collector cannot remove the file under this upload; the insert trigger
+        then counts the new reference.
+        """
+        if request.sha256 and request.sha256 != image.sha256:
+            raise InvalidUploadError("Uploaded file does not match its sha256 field")
+        if await self.db.scalar(PATIENT_UPDATED_AT, {"patient_id": request.patient_id}) is None:
+            raise PatientNotFoundError("Patient not found")
+
+        blob = ImageBlob(
+            sha256=image.sha256, content_type=image.content_type, size_bytes=image.size_bytes
+        )
+        await self.db.execute(
+            pg_insert(ImageBlob)
+            .values(blob.model_dump())
+            .on_conflict_do_update(
+                index_elements=[ImageBlob.sha256], set_={"unreferenced_at": None}
+            )
+        )
+        stored = await blob_store.put(image)
+        row_id = await self.db.scalar(NEXT_IMAGE_ID[model])
+        row = model(
+            **self._upload_data(request),
+            id=row_id,
+            image_path=blob_store.relative_path(image.sha256).as_posix(),
+            image_url=UPLOADED_IMAGE_URLS[model.__tablename__].format(id=row_id),
+            content_type=image.content_type,
+            size_bytes=image.size_bytes,
+            sha256=image.sha256,
+        )
+        try:
+            return await self._insert(row)
+        except BaseException:
+            if stored:
+                await blob_store.delete(image.sha256)
+            raise
+
+    @staticmethod
+    def _upload_data(request: XRayUpload | IntraoralPictureUpload) -> dict:
+        upload_data = request.model_dump(exclude={"sha256"})
+        if not upload_data.get("taken_date"):
+            upload_data["taken_date"] = datetime.utcnow()
+        return upload_data
+
+    async def create_patient(self, request: PatientCreate) -> Patient:
+        return await self._insert(Patient(user_id=request.user_id))
 
     async def get_patient_by_id(self, patient_id: int) -> Patient:
         patient = await self.db.get(Patient, patient_id)
@@ -49,175 +346,378 @@ class PatientService:
             raise PatientNotFoundError("Patient not found")
         return patient
 
-    async def get_patients_by_user_id(self, user_id: int) -> list[Patient]:
-        result = await self.db.execute(
-            select(Patient).where(Patient.user_id == user_id)
+    async def get_patient_version(self, patient_id: int) -> ResourceVersion:
+        updated_at = await self.db.scalar(PATIENT_UPDATED_AT, {"patient_id": patient_id})
+        if updated_at is None:
+            raise PatientNotFoundError("Patient not found")
+        return ResourceVersion.of("patient", patient_id, updated_at)
+
+    async def get_patient_chart(
+        self, patient_id: int, query: ChartQuery
+    ) -> PatientChartResponse:
+        """Build a patient's chart on this session with one query per section.
+
+        The patient and biodata come back together through an outer join;
+        each requested list section is one query capped at query.limit
+        newest rows.
+        """
+        sections = set(query.include)
+        if ChartSection.BIODATA in sections:
+            row = (
+                await self.db.execute(PATIENT_WITH_BIODATA, {"patient_id": patient_id})
+            ).first()
+            patient, biodata = row if row else (None, None)
+        else:
+            patient, biodata = await self.db.get(Patient, patient_id), None
+        if not patient:
+            raise PatientNotFoundError("Patient not found")
+
+        chart = {"patient": patient, "biodata": biodata}
+        for section, statement in CHART_LIST_SECTIONS.items():
+            if section not in sections:
+                continue
+            result = await self.db.execute(
+                statement, {"patient_id": patient_id, "limit": query.limit}
+            )
+            chart[section.value] = list(result.scalars().all())
+        return PatientChartResponse.model_validate(chart)
+
+    async def get_patients_by_user_id(
+        self, user_id: int, query: PageQuery
+    ) -> tuple[list[Patient], str | None]:
+        return await self._fetch_page(
+            PATIENT_PAGES, {"user_id": user_id}, PATIENT_KEYSET, query
+        )
+
+    async def search_patients(
+        self, query: PatientSearchQuery
+    ) -> tuple[list[PatientSearchResult], str | None]:
+        """Find patients by email, insurance policy number, name or phone.
+
+        Email and policy number match by prefix and are listed first, one
+        phase per key, each in its index's (key, patient_id) order so a
+        prefix many patients share reads one page rather than every match.
+        Names then match fuzzily (trigram similarity) or by substring and
+        phone digits by substring (numbers are stored with and without
+        country codes), ranked phone matches first, then names starting with
+        the term, then by similarity. Later phases only run while the page
+        is short; cursors record the phase and the position within it.
+        """
+        term = query.q.lower()
+        like_prefix = escape_like(term) + "%"
+        prefix_matches = [
+            and_(prefix_range(key, term), key.like(like_prefix, escape="\\"))
+            for key in SEARCH_PREFIX_KEYS
+        ]
+        name_score = func.similarity(SEARCH_NAME, term) + case(
+            (SEARCH_NAME.like(like_prefix, escape="\\"), 1.0), else_=0.0
         )
-        return list(result.scalars().all())
+        cursor_phase, cursor_value, cursor_patient_id = (
+            decode_search_cursor(query.cursor) if query.cursor else (0, None, None)
+        )
+        ranked_phase = len(SEARCH_PREFIX_KEYS)
+        if query.cursor and (
+            not 0 <= cursor_phase <= ranked_phase
+            or isinstance(cursor_value, str) != (cursor_phase < ranked_phase)
+        ):
+            raise InvalidCursorError("Invalid pagination cursor")
+
+        matches: list[tuple[int, Row]] = []
+        for phase, key in enumerate(SEARCH_PREFIX_KEYS):
+            if phase < cursor_phase or len(matches) > query.limit:
+                continue
+            statement = self._search_statement(query, name_score + 2.0, key).where(
+                prefix_matches[phase],
+                *(earlier.is_not(True) for earlier in prefix_matches[:phase]),
+            )
+            if phase == cursor_phase and query.cursor:
+                statement = statement.where(
+                    key.op("~>=~")(cursor_value),
+                    or_(
+                        key.op("~>~")(cursor_value),
+                        PatientBiodata.patient_id > cursor_patient_id,
+                    ),
+                )
+            statement = statement.order_by(
+                pattern_order(key), PatientBiodata.patient_id
+            ).limit(query.limit + 1 - len(matches))
+            matches.extend((phase, row) for row in await self.db.execute(statement))
+
+        if len(matches) <= query.limit:
+            name_or_phone_matches = [
+                SEARCH_NAME.op("%")(term),
+                SEARCH_NAME.like("%" + like_prefix, escape="\\"),
+            ]
+            score = name_score
+            digits = re.sub(r"\D", "", term)
+            if len(digits) >= MIN_SEARCH_TERM_LENGTH:
+                phone_match = SEARCH_PHONE.like(f"%{digits}%")
+                name_or_phone_matches.append(phone_match)
+                score = score + case((phone_match, 2.0), else_=0.0)
+            ranked = (
+                self._search_statement(query, score, literal(None))
+                .where(
+                    or_(*name_or_phone_matches),
+                    *(prefix_match.is_not(True) for prefix_match in prefix_matches),
+                )
+                .subquery()
+            )
+            statement = select(ranked)
+            if cursor_phase == ranked_phase:
+                statement = statement.where(
+                    tuple_(ranked.c.score, ranked.c.patient_id)
+                    < tuple_(cursor_value, cursor_patient_id)
+                )
+            statement = statement.order_by(
+                ranked.c.score.desc(), ranked.c.patient_id.desc()
+            ).limit(query.limit + 1 - len(matches))
+            matches.extend((ranked_phase, row) for row in await self.db.execute(statement))
+
+        results = [PatientSearchResult.model_validate(row._mapping) for _, row in matches]
+        if len(results) <= query.limit:
+            return results, None
+        last_phase, last_row = matches[query.limit - 1]
+        sort_value = last_row.score if last_phase == ranked_phase else last_row.sort_key
+        return results[: query.limit], encode_search_cursor(
+            last_phase, sort_value, last_row.patient_id
+        )
+
+    @staticmethod
+    def _search_statement(
+        query: PatientSearchQuery, score: ColumnElement, sort_key: ColumnElement
+    ) -> Select:
+        statement = select(
+            PatientBiodata.patient_id,
+            PatientBiodata.first_name,
+            PatientBiodata.last_name,
+            PatientBiodata.date_of_birth,
+            PatientBiodata.phone,
+            PatientBiodata.email,
+            PatientBiodata.insurance_policy_number,
+            score.label("score"),
+            sort_key.label("sort_key"),
+        )
+        if query.user_id is not None:
+            statement = statement.join(Patient, Patient.id == PatientBiodata.patient_id).where(
+                Patient.user_id == query.user_id
+            )
+        return statement
 
     async def delete_patient(self, patient_id: int) -> None:
-        patient = await self.db.get(Patient, patient_id)
-        if not patient:
+        """Delete a patient in one statement; the database cascades to its history."""
+        if not await self._delete(Patient, patient_id):
             raise PatientNotFoundError("Patient not found")
-        await self.db.delete(patient)
-        await self.db.commit()
 
     async def create_or_update_biodata(
         self, request: PatientBiodataCreate
     ) -> PatientBiodata:
-        existing_biodata = await self.db.scalar(
-            select(PatientBiodata).where(PatientBiodata.patient_id == request.patient_id)
+        new_biodata = PatientBiodata(**request.model_dump())
+        created = await self.db.scalar(
+            pg_insert(PatientBiodata)
+            .values(new_biodata.model_dump(exclude={"id"}))
+            .on_conflict_do_nothing(index_elements=[PatientBiodata.patient_id])
+            .returning(PatientBiodata)
         )
-        
-        if existing_biodata:
+        if created is None:
             raise PatientBiodataAlreadyExistsError(
                 "Biodata already exists for this patient. Use update endpoint."
             )
-        
-        new_biodata = PatientBiodata(**request.model_dump())
-        self.db.add(new_biodata)
         await self.db.commit()
-        await self.db.refresh(new_biodata)
-        return new_biodata
+        return created
 
     async def update_biodata(
         self, patient_id: int, request: PatientBiodataUpdate
     ) -> PatientBiodata:
-        biodata = await self.db.scalar(
-            select(PatientBiodata).where(PatientBiodata.patient_id == patient_id)
-        )
-        if not biodata:
-            raise PatientBiodataNotFoundError("Patient biodata not found")
-        
         update_data = request.model_dump(exclude_unset=True)
         update_data["updated_at"] = datetime.utcnow()
         
-        for field, value in update_data.items():
-            setattr(biodata, field, value)
-        
-        await self.db.commit()
-        await self.db.refresh(biodata)
+        biodata = await self._update(
+            PatientBiodata, PatientBiodata.patient_id == patient_id, update_data
+        )
+        if not biodata:
+            raise PatientBiodataNotFoundError("Patient biodata not found")
         return biodata
 
+    async def get_biodata_version(self, patient_id: int) -> ResourceVersion:
+        updated_at = await self.db.scalar(BIODATA_UPDATED_AT, {"patient_id": patient_id})
+        if updated_at is None:
+            raise PatientBiodataNotFoundError("Patient biodata not found")
+        return ResourceVersion.of("biodata", patient_id, updated_at)
+
     async def get_biodata_by_patient_id(self, patient_id: int) -> PatientBiodata:
+        biodata = await self.db.scalar(BIODATA_BY_PATIENT, {"patient_id": patient_id})
+        if not biodata:
+            raise PatientBiodataNotFoundError("Patient biodata not found")
+        return biodata
+
+    async def get_biodata_summary(self, patient_id: int) -> PatientBiodataSummary:
+        biodata = await self.db.scalar(BIODATA_SUMMARY_BY_PATIENT, {"patient_id": patient_id})
+        if not biodata:
+            raise PatientBiodataNotFoundError("Patient biodata not found")
+        return PatientBiodataSummary.model_validate(biodata)
+
+    async def get_biodata_sections(
+        self, patient_id: int, sections: list[BiodataSection]
+    ) -> PatientBiodataSections:
+        """Load only the columns of the requested biodata sections."""
+        fields = [
+            field
+            for section in dict.fromkeys(sections)
+            for field in BIODATA_SECTION_FIELDS[section]
+        ]
         biodata = await self.db.scalar(
-            select(PatientBiodata).where(PatientBiodata.patient_id == patient_id)
+            BIODATA_BY_PATIENT.options(
+                load_only(*(getattr(PatientBiodata, field) for field in fields), raiseload=True)
+            ),
+            {"patient_id": patient_id},
         )
         if not biodata:
             raise PatientBiodataNotFoundError("Patient biodata not found")
-        return biodata
+        return PatientBiodataSections.model_validate(
+            {"patient_id": patient_id, **{field: getattr(biodata, field) for field in fields}}
+        )
 
     async def create_record_planner(
         self, request: PatientRecordPlannerCreate
     ) -> PatientRecordPlanner:
-        new_planner = PatientRecordPlanner(**request.model_dump())
-        self.db.add(new_planner)
-        await self.db.commit()
-        await self.db.refresh(new_planner)
-        return new_planner
+        return await self._insert(PatientRecordPlanner(**request.model_dump()))
+
+    async def create_record_planners(
+        self, requests: list[PatientRecordPlannerCreate]
+    ) -> list[int]:
+        return await self._insert_many(
+            [PatientRecordPlanner(**request.model_dump()) for request in requests]
+        )
 
     async def get_record_planners_by_patient_id(
-        self, patient_id: int
-    ) -> list[PatientRecordPlanner]:
-        result = await self.db.execute(
-            select(PatientRecordPlanner).where(
-                PatientRecordPlanner.patient_id == patient_id
-            )
+        self, patient_id: int, query: RecordPlannerPageQuery
+    ) -> tuple[list[PatientRecordPlanner], str | None]:
+        filters = [PatientRecordPlanner.status == query.status] if query.status else []
+        return await self._fetch_page(
+            RECORD_PLANNER_PAGES, {"patient_id": patient_id}, RECORD_PLANNER_KEYSET, query, *filters
         )
-        return list(result.scalars().all())
 
     async def update_record_planner(
         self, planner_id: int, request: PatientRecordPlannerUpdate
     ) -> PatientRecordPlanner:
-        planner = await self.db.get(PatientRecordPlanner, planner_id)
-        if not planner:
-            raise RecordPlannerNotFoundError("Record planner not found")
-        
         update_data = request.model_dump(exclude_unset=True)
         update_data["updated_at"] = datetime.utcnow()
         
-        for field, value in update_data.items():
-            setattr(planner, field, value)
-        
-        await self.db.commit()
-        await self.db.refresh(planner)
+        planner = await self._update(
+            PatientRecordPlanner, PatientRecordPlanner.id == planner_id, update_data
+        )
+        if not planner:
+            raise RecordPlannerNotFoundError("Record planner not found")
         return planner
 
     async def delete_record_planner(self, planner_id: int) -> None:
-        planner = await self.db.get(PatientRecordPlanner, planner_id)
-        if not planner:
+        if not await self._delete(PatientRecordPlanner, planner_id):
             raise RecordPlannerNotFoundError("Record planner not found")
-        await self.db.delete(planner)
-        await self.db.commit()
 
     async def create_intraoral_picture(
         self, request: IntraoralPictureCreate
     ) -> IntraoralPicture:
+        return await self._insert(self._intraoral_picture_row(request))
+
+    async def create_intraoral_pictures(
+        self, requests: list[IntraoralPictureCreate]
+    ) -> list[int]:
+        return await self._insert_many(
+            [self._intraoral_picture_row(request) for request in requests]
+        )
+
+    async def create_uploaded_intraoral_picture(
+        self, request: IntraoralPictureUpload, image: ReceivedImage
+    ) -> IntraoralPicture:
+        return await self._create_uploaded_image(IntraoralPicture, request, image)
+
+    @staticmethod
+    def _intraoral_picture_row(request: IntraoralPictureCreate) -> IntraoralPicture:
         picture_data = request.model_dump()
         if not picture_data.get("taken_date"):
             picture_data["taken_date"] = datetime.utcnow()
-        
-        new_picture = IntraoralPicture(**picture_data)
-        self.db.add(new_picture)
-        await self.db.commit()
-        await self.db.refresh(new_picture)
-        return new_picture
+        return IntraoralPicture(**picture_data)
+
+    async def get_intraoral_picture_image(self, picture_id: int) -> StoredImage:
+        row = (await self.db.execute(INTRAORAL_PICTURE_IMAGE, {"picture_id": picture_id})).one_or_none()
+        if row is None:
+            raise IntraoralPictureNotFoundError("Intraoral picture not found")
+        return StoredImage.model_validate(row._mapping)
 
     async def get_intraoral_pictures_by_patient_id(
-        self, patient_id: int
-    ) -> list[IntraoralPicture]:
-        result = await self.db.execute(
-            select(IntraoralPicture).where(IntraoralPicture.patient_id == patient_id)
+        self, patient_id: int, query: IntraoralPicturePageQuery
+    ) -> tuple[list[IntraoralPicture], str | None]:
+        filters = (
+            [IntraoralPicture.picture_type == query.picture_type] if query.picture_type else []
+        )
+        return await self._fetch_page(
+            INTRAORAL_PICTURE_PAGES, {"patient_id": patient_id}, INTRAORAL_PICTURE_KEYSET, query, *filters
         )
-        return list(result.scalars().all())
 
     async def delete_intraoral_picture(self, picture_id: int) -> None:
-        picture = await self.db.get(IntraoralPicture, picture_id)
-        if not picture:
+        if not await self._delete(IntraoralPicture, picture_id):
             raise IntraoralPictureNotFoundError("Intraoral picture not found")
-        await self.db.delete(picture)
-        await self.db.commit()
 
     async def create_xray(self, request: XRayCreate) -> XRay:
+        return await self._insert(self._xray_row(request))
+
+    async def create_xrays(self, requests: list[XRayCreate]) -> list[int]:
+        return await self._insert_many([self._xray_row(request) for request in requests])
+
+    async def create_uploaded_xray(self, request: XRayUpload, image: ReceivedImage) -> XRay:
+        return await self._create_uploaded_image(XRay, request, image)
+
+    @staticmethod
+    def _xray_row(request: XRayCreate) -> XRay:
         xray_data = request.model_dump()
         if not xray_data.get("taken_date"):
             xray_data["taken_date"] = datetime.utcnow()
-        
-        new_xray = XRay(**xray_data)
-        self.db.add(new_xray)
-        await self.db.commit()
-        await self.db.refresh(new_xray)
-        return new_xray
+        return XRay(**xray_data)
 
-    async def get_xrays_by_patient_id(self, patient_id: int) -> list[XRay]:
-        result = await self.db.execute(
-            select(XRay).where(XRay.patient_id == patient_id)
+    async def get_xray_image(self, xray_id: int) -> StoredImage:
+        row = (await self.db.execute(XRAY_IMAGE, {"xray_id": xray_id})).one_or_none()
+        if row is None:
+            raise XRayNotFoundError("X-ray not found")
+        return StoredImage.model_validate(row._mapping)
+
+    async def get_xrays_by_patient_id(
+        self, patient_id: int, query: XRayPageQuery
+    ) -> tuple[list[XRay], str | None]:
+        filters = [XRay.xray_type == query.xray_type] if query.xray_type else []
+        return await self._fetch_page(
+            XRAY_PAGES, {"patient_id": patient_id}, XRAY_KEYSET, query, *filters
         )
-        return list(result.scalars().all())
 
     async def delete_xray(self, xray_id: int) -> None:
-        xray = await self.db.get(XRay, xray_id)
-        if not xray:
+        if not await self._delete(XRay, xray_id):
             raise XRayNotFoundError("X-ray not found")
-        await self.db.delete(xray)
-        await self.db.commit()
 
     async def create_visit(self, request: VisitCreate) -> Visit:
+        return await self._insert(self._visit_row(request))
+
+    async def create_visits(self, requests: list[VisitCreate]) -> list[int]:
+        return await self._insert_many([self._visit_row(request) for request in requests])
+
+    @staticmethod
+    def _visit_row(request: VisitCreate) -> Visit:
         visit_data = request.model_dump()
         if not visit_data.get("visit_date"):
             visit_data["visit_date"] = datetime.utcnow()
-        
-        new_visit = Visit(**visit_data)
-        self.db.add(new_visit)
-        await self.db.commit()
-        await self.db.refresh(new_visit)
-        return new_visit
+        return Visit(**visit_data)
 
-    async def get_visits_by_patient_id(self, patient_id: int) -> list[Visit]:
-        result = await self.db.execute(
-            select(Visit).where(Visit.patient_id == patient_id).order_by(Visit.visit_date.desc())
+    async def get_visits_by_patient_id(
+        self, patient_id: int, query: VisitPageQuery
+    ) -> tuple[list[Visit], str | None]:
+        filters = [Visit.visit_type == query.visit_type] if query.visit_type else []
+        return await self._fetch_page(
+            VISIT_PAGES, {"patient_id": patient_id}, VISIT_KEYSET, query, *filters
         )
-        return list(result.scalars().all())
+
+    async def get_visit_version(self, visit_id: int) -> ResourceVersion:
+        updated_at = await self.db.scalar(VISIT_UPDATED_AT, {"visit_id": visit_id})
+        if updated_at is None:
+            raise VisitNotFoundError("Visit not found")
+        return ResourceVersion.of("visit", visit_id, updated_at)
 
     async def get_visit_by_id(self, visit_id: int) -> Visit:
         visit = await self.db.get(Visit, visit_id)
@@ -226,23 +726,32 @@ class PatientService:
         return visit
 
     async def update_visit(self, visit_id: int, request: VisitUpdate) -> Visit:
-        visit = await self.db.get(Visit, visit_id)
-        if not visit:
-            raise VisitNotFoundError("Visit not found")
-        
         update_data = request.model_dump(exclude_unset=True)
         update_data["updated_at"] = datetime.utcnow()
         
-        for field, value in update_data.items():
-            setattr(visit, field, value)
-        
-        await self.db.commit()
-        await self.db.refresh(visit)
+        visit = await self._update(Visit, Visit.id == visit_id, update_data)
+        if not visit:
+            raise VisitNotFoundError("Visit not found")
         return visit
 
     async def delete_visit(self, visit_id: int) -> None:
-        visit = await self.db.get(Visit, visit_id)
-        if not visit:
+        if not await self._delete(Visit, visit_id):
             raise VisitNotFoundError("Visit not found")
-        await self.db.delete(visit)
-        await self.db.commit()
+
+
+async def purge_patient(patient_id: int, batch_size: int = PURGE_BATCH_SIZE) -> None:
+    """Delete a patient with a very large history after the request has responded.
+
+    History rows are deleted batch_size at a time, each batch in its own
+    transaction, so no single statement holds row locks for the whole
+    history. The final DELETE then cascades to the biodata. Uses its own DB
+    session because the request's session is closed by then.
+    """
+    async with AsyncSessionLocal() as db:
+        for statement in PURGE_HISTORY_BATCHES:
+            params = {"patient_id": patient_id, "batch_size": batch_size}
+            while (await db.execute(statement, params)).rowcount == batch_size:
+                await db.commit()
+            await db.commit()
+        await db.execute(delete(Patient).where(Patient.id == patient_id))
+        await db.commit()
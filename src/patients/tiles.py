@@ -0,0 +1,206 @@
+"""
+Deep-zoom tile pyramids for large X-rays.
+
+Each pyramid is one packed file under MEDIA_ROOT/tiles, keyed by blob hash.
+Level 0 is the whole image shrunk to 1x1 and each following level doubles in
+size up to full resolution; every level is cut into TILE_SIZE tiles with no
+overlap, left to right and top to bottom. The file holds a fixed header, an
+index of (offset, length) per tile in level, row, column order, then the
+encoded tiles. Workers memory-map pyramid files, so serving a tile copies
+only that tile's bytes out of the page cache.
+"""
+import asyncio
+import io
+import math
+import mmap
+import os
+import struct
+from collections import OrderedDict
+from pathlib import Path
+
+import anyio
+from PIL import Image
+
+from src.config import settings
+from src.executors import BoundedExecutor
+from src.patients.constants import (
+    DERIVATIVE_FORMAT,
+    DERIVATIVE_QUALITY,
+    TILE_DIR,
+    TILE_PYRAMID_CACHE_SIZE,
+    TILE_SIZE,
+)
+from src.patients.derivatives import image_derivative_executor, to_display_mode
+from src.patients.exceptions import ImagePreviewUnavailableError, TileNotFoundError
+
+TILE_FILE_MAGIC = b"DDTP"
+TILE_FILE_VERSION = 1
+# magic, version, tile size, width, height
+TILE_FILE_HEADER = struct.Struct("<4sHHII")
+# offset, length
+TILE_INDEX_ENTRY = struct.Struct("<QI")
+
+
+def pyramid_levels(width: int, height: int, tile_size: int) -> list[tuple[int, int, int, int]]:
+    """(width, height, columns, rows) of every level, smallest first."""
+    top = math.ceil(math.log2(max(width, height)))
+    levels = []
+    for level in range(top + 1):
+        level_width = math.ceil(width / 2 ** (top - level))
+        level_height = math.ceil(height / 2 ** (top - level))
+        columns = math.ceil(level_width / tile_size)
+        rows = math.ceil(level_height / tile_size)
+        levels.append((level_width, level_height, columns, rows))
+    return levels
+
+
+def build_tile_pyramid(source: str, destination: str, tile_size: int) -> int:
+    """Cut an image into a packed tile pyramid file; return its byte size.
+
+    Runs in a pool worker. Levels are encoded from full resolution down, each
+    halved from the one above, and the index is written once every tile's
+    offset is known.
+    """
+    with Image.open(source) as original:
+        image = to_display_mode(original)
+    levels = pyramid_levels(image.width, image.height, tile_size)
+    index_offset = TILE_FILE_HEADER.size
+    level_starts = [0]
+    for _, _, columns, rows in levels:
+        level_starts.append(level_starts[-1] + columns * rows)
+    index = [(0, 0)] * level_starts[-1]
+
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    partial = f"{destination}.{os.getpid()}.tmp"
+    with open(partial, "wb") as file:
+        file.write(
+            TILE_FILE_HEADER.pack(TILE_FILE_MAGIC, TILE_FILE_VERSION, tile_size, image.width, image.height)
+        )
+        file.seek(index_offset + TILE_INDEX_ENTRY.size * len(index))
+        for level in reversed(range(len(levels))):
+            level_width, level_height, columns, rows = levels[level]
+            if image.size != (level_width, level_height):
+                image = image.resize((level_width, level_height), Image.Resampling.LANCZOS)
+            for row in range(rows):
+                for column in range(columns):
+                    box = (
+                        column * tile_size,
+                        row * tile_size,
+                        min((column + 1) * tile_size, level_width),
+                        min((row + 1) * tile_size, level_height),
+                    )
+                    encoded = io.BytesIO()
+                    image.crop(box).save(encoded, DERIVATIVE_FORMAT, quality=DERIVATIVE_QUALITY)
+                    index[level_starts[level] + row * columns + column] = (file.tell(), encoded.tell())
+                    file.write(encoded.getbuffer())
+        file.seek(index_offset)
+        file.write(b"".join(TILE_INDEX_ENTRY.pack(*entry) for entry in index))
+    os.replace(partial, destination)
+    return os.path.getsize(destination)
+
+
+class TilePyramid:
+    """A memory-mapped pyramid file.
+
+    ImageTiles may close an evicted pyramid, so read tiles straight after
+    getting it, without awaiting in between.
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.tile_size, self.width, self.height = TILE_FILE_HEADER.unpack_from(
+            self._map
+        )
+        if (magic, version) != (TILE_FILE_MAGIC, TILE_FILE_VERSION):
+            self._map.close()
+            raise ValueError(f"{path} is not a version {TILE_FILE_VERSION} tile pyramid")
+        self.levels = pyramid_levels(self.width, self.height, self.tile_size)
+        self._level_starts = [0]
+        for _, _, columns, rows in self.levels:
+            self._level_starts.append(self._level_starts[-1] + columns * rows)
+
+    def tile(self, level: int, column: int, row: int) -> bytes:
+        if not 0 <= level < len(self.levels):
+            raise TileNotFoundError(f"Level must be between 0 and {len(self.levels) - 1}")
+        _, _, columns, rows = self.levels[level]
+        if not (0 <= column < columns and 0 <= row < rows):
+            raise TileNotFoundError(f"Level {level} has {columns}x{rows} tiles")
+        position = self._level_starts[level] + row * columns + column
+        offset, length = TILE_INDEX_ENTRY.unpack_from(
+            self._map, TILE_FILE_HEADER.size + TILE_INDEX_ENTRY.size * position
+        )
+        return self._map[offset:offset + length]
+
+    def close(self) -> None:
+        self._map.close()
+
+
+class ImageTiles:
+    """Builds a tile pyramid once per blob hash and keeps recently used ones mapped.
+
+    Concurrent requests for a pyramid that is still building share one build
+    instead of queueing duplicates on the pool.
+    """
+
+    def __init__(
+        self, root: Path, executor: BoundedExecutor, cache_size: int = TILE_PYRAMID_CACHE_SIZE
+    ):
+        self.root = root
+        self.executor = executor
+        self.cache_size = cache_size
+        self._pyramids: OrderedDict[str, TilePyramid] = OrderedDict()
+        self._building: dict[str, asyncio.Future] = {}
+
+    def path(self, sha256: str) -> Path:
+        return self.root / TILE_DIR / sha256[:2] / sha256[2:4] / sha256
+
+    async def get(self, sha256: str, source: Path) -> TilePyramid:
+        """The pyramid for a blob, building it from source first if needed.
+
+        Raises ImagePreviewUnavailableError if source cannot be decoded and
+        ExecutorSaturatedError if the build pool is full.
+        """
+        pyramid = self._pyramids.get(sha256)
+        if pyramid is not None:
+            self._pyramids.move_to_end(sha256)
+            return pyramid
+        path = self.path(sha256)
+        if not await anyio.Path(path).is_file():
+            building = self._building.get(sha256)
+            if building is None:
+                building = asyncio.ensure_future(self._build(source, path))
+                self._building[sha256] = building
+                building.add_done_callback(lambda _: self._building.pop(sha256, None))
+            await asyncio.shield(building)
+        pyramid = await anyio.to_thread.run_sync(TilePyramid, path)
+        # Another request may have mapped it while this one waited.
+        if sha256 in self._pyramids:
+            pyramid.close()
+            return self._pyramids[sha256]
+        self._pyramids[sha256] = pyramid
+        if len(self._pyramids) > self.cache_size:
+            self._pyramids.popitem(last=False)[1].close()
+        return pyramid
+
+    async def _build(self, source: Path, path: Path) -> None:
+        try:
+            await self.executor.run(build_tile_pyramid, str(source), str(path), TILE_SIZE)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            raise ImagePreviewUnavailableError("Image cannot be tiled") from e
+
+    async def prepare(self, sha256: str, source: Path) -> None:
+        """Build the pyramid ahead of the first request; failures are left to the lazy path."""
+        try:
+            await self.get(sha256, source)
+        except Exception:
+            return
+
+    async def delete(self, sha256: str) -> None:
+        pyramid = self._pyramids.pop(sha256, None)
+        if pyramid is not None:
+            pyramid.close()
+        await anyio.Path(self.path(sha256)).unlink(missing_ok=True)
+
+
+image_tiles = ImageTiles(settings.MEDIA_ROOT, image_derivative_executor)
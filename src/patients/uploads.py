@@ -0,0 +1,236 @@
+"""
+Streaming multipart uploads for patient imaging.
+
+The request body is parsed as it arrives. The file part is hashed, size
+checked and written to a temporary file under MEDIA_ROOT in buffered
+chunks, so an upload holds about UPLOAD_WRITE_BUFFER_BYTES in memory
+whatever the size of the file. When a sha256 field precedes the file and
+that content is already stored, the file data is only hashed, not written.
+"""
+import hashlib
+import os
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import anyio
+from python_multipart.multipart import MultipartParseError, MultipartParser, parse_options_header
+from starlette.requests import Request
+
+from src.patients.constants import (
+    IMAGE_CONTENT_TYPES,
+    MAX_UPLOAD_FIELD_BYTES,
+    UPLOAD_FORM_OVERHEAD_BYTES,
+    UPLOAD_WRITE_BUFFER_BYTES,
+)
+from src.patients.exceptions import (
+    InvalidUploadError,
+    UnsupportedImageTypeError,
+    UploadTooLargeError,
+)
+
+UPLOAD_FILE_FIELD = "file"
+UPLOAD_SHA256_FIELD = "sha256"
+UPLOAD_TMP_DIR = "tmp"
+
+
+@dataclass
+class ReceivedImage:
+    """An uploaded file waiting under MEDIA_ROOT/tmp to be stored.
+
+    path is None when the content was already stored and was not written.
+    """
+
+    path: Path | None
+    content_type: str
+    size_bytes: int
+    sha256: str
+    fields: dict[str, str]
+
+    @property
+    def suffix(self) -> str:
+        return IMAGE_CONTENT_TYPES[self.content_type]
+
+    async def move_to(self, destination: Path) -> None:
+        """Rename the file into place; MEDIA_ROOT/tmp is on the same filesystem."""
+        await anyio.to_thread.run_sync(_move, self.path, destination)
+
+    async def discard(self) -> None:
+        if self.path is not None:
+            await anyio.Path(self.path).unlink(missing_ok=True)
+
+
+def _move(source: Path, destination: Path) -> None:
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(source, destination)
+
+
+class _ImageForm:
+    """python-multipart callbacks collecting text fields and one file part.
+
+    File data is hashed and queued in `pending`; the caller drains it to disk
+    between body chunks because the callbacks cannot await.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.fields: dict[str, str] = {}
+        self.content_type: str | None = None
+        self.size_bytes = 0
+        self.digest = hashlib.sha256()
+        self.pending: list[bytes] = []
+        self.pending_bytes = 0
+        self.keep_data = True
+        self.expected_sha256: str | None = None
+        self.complete = False
+        self._headers: dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._field_name = ""
+        self._field_value = bytearray()
+        self._in_file = False
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_end": self.on_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+        self._field_value = bytearray()
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        disposition, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if disposition != b"form-data" or b"name" not in options:
+            raise InvalidUploadError("Form part is missing its name")
+        self._field_name = options[b"name"].decode("utf-8", errors="replace")
+        self._in_file = b"filename" in options
+        if not self._in_file:
+            return
+        if self._field_name != UPLOAD_FILE_FIELD or self.content_type is not None:
+            raise InvalidUploadError(f"Expected exactly one file part named '{UPLOAD_FILE_FIELD}'")
+        content_type = parse_options_header(self._headers.get(b"content-type", b""))[0].decode("latin-1")
+        if content_type not in IMAGE_CONTENT_TYPES:
+            raise UnsupportedImageTypeError(f"Unsupported image type '{content_type}'")
+        self.content_type = content_type
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        chunk = data[start:end]
+        if not self._in_file:
+            self._field_value += chunk
+            if len(self._field_value) > MAX_UPLOAD_FIELD_BYTES:
+                raise InvalidUploadError(f"Form field '{self._field_name}' is too large")
+            return
+        self.size_bytes += len(chunk)
+        if self.size_bytes > self.max_bytes:
+            raise UploadTooLargeError(f"Images are limited to {self.max_bytes} bytes")
+        self.digest.update(chunk)
+        if self.keep_data:
+            self.pending.append(chunk)
+            self.pending_bytes += len(chunk)
+
+    def on_part_end(self) -> None:
+        if self._in_file:
+            return
+        try:
+            self.fields[self._field_name] = self._field_value.decode("utf-8")
+        except UnicodeDecodeError:
+            raise InvalidUploadError(f"Form field '{self._field_name}' is not UTF-8")
+        if self._field_name == UPLOAD_SHA256_FIELD and self.content_type is None:
+            self.expected_sha256 = self.fields[self._field_name]
+
+    def on_end(self) -> None:
+        self.complete = True
+
+    def skip_data(self) -> None:
+        """Keep hashing the file part but stop queueing it for disk."""
+        self.keep_data = False
+        self.take_pending()
+
+    def take_pending(self) -> bytes:
+        data = b"".join(self.pending)
+        self.pending.clear()
+        self.pending_bytes = 0
+        return data
+
+
+async def receive_image_upload(
+    request: Request,
+    media_root: Path,
+    max_bytes: int,
+    is_stored: Callable[[str], Awaitable[bool]] | None = None,
+) -> ReceivedImage:
+    """Stream a multipart/form-data imaging upload into a temporary file.
+
+    is_stored is asked about a sha256 field sent before the file part; if it
+    answers True the file is verified against that hash but not written.
+    Raises InvalidUploadError, UploadTooLargeError or UnsupportedImageTypeError
+    as soon as the body shows the problem; the temporary file is removed on
+    any failure, including a client disconnect.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or not options.get(b"boundary"):
+        raise InvalidUploadError("Expected a multipart/form-data body")
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes + UPLOAD_FORM_OVERHEAD_BYTES:
+        raise UploadTooLargeError(f"Images are limited to {max_bytes} bytes")
+
+    form = _ImageForm(max_bytes)
+    parser = MultipartParser(options[b"boundary"], form.callbacks())
+    tmp_dir = anyio.Path(media_root / UPLOAD_TMP_DIR)
+    await tmp_dir.mkdir(parents=True, exist_ok=True)
+    path = tmp_dir / f"{uuid.uuid4().hex}.part"
+    checked_stored = is_stored is None
+    try:
+        async with await anyio.open_file(path, "wb") as file:
+            try:
+                async for chunk in request.stream():
+                    parser.write(chunk)
+                    if form.expected_sha256 and not checked_stored:
+                        checked_stored = True
+                        if await is_stored(form.expected_sha256):
+                            form.skip_data()
+                    if form.pending_bytes >= UPLOAD_WRITE_BUFFER_BYTES:
+                        await file.write(form.take_pending())
+                parser.finalize()
+            except MultipartParseError as e:
+                raise InvalidUploadError("Malformed multipart body") from e
+            await file.write(form.take_pending())
+        if not form.complete:
+            raise InvalidUploadError("Upload ended before the closing boundary")
+        if form.content_type is None:
+            raise InvalidUploadError(f"Missing file part '{UPLOAD_FILE_FIELD}'")
+        if not form.keep_data:
+            if form.digest.hexdigest() != form.expected_sha256:
+                raise InvalidUploadError("Uploaded file does not match its sha256 field")
+            await path.unlink()
+    except BaseException:
+        await path.unlink(missing_ok=True)
+        raise
+
+    return ReceivedImage(
+        path=Path(path) if form.keep_data else None,
+        content_type=form.content_type,
+        size_bytes=form.size_bytes,
+        sha256=form.digest.hexdigest(),
+        fields=form.fields,
+    )
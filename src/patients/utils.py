@@ -1 +1,165 @@
 # Helper functions for patient
+import base64
+import binascii
+import hashlib
+import json
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from sqlalchemy import ColumnElement, UnaryExpression, and_, or_, tuple_
+from sqlalchemy.sql.operators import custom_op
+
+from src.patients.exceptions import InvalidCursorError
+
+
+def _encode_position(position: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip("=")
+
+
+def _decode_position(cursor: str) -> list:
+    padded_cursor = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded_cursor))
+
+
+def encode_cursor(sort_value: datetime | None, row_id: int) -> str:
+    """Opaque URL-safe cursor for the (sort_value, id) position of a row."""
+    return _encode_position([sort_value.isoformat() if sort_value else None, row_id])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime | None, int]:
+    try:
+        sort_value, row_id = _decode_position(cursor)
+        return (datetime.fromisoformat(sort_value) if sort_value else None), int(row_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+def encode_search_cursor(phase: int, sort_value: str | float, patient_id: int) -> str:
+    """Cursor for a search result: which phase of the search it came from and
+    its (sort_value, patient_id) position within that phase."""
+    return _encode_position([phase, sort_value, patient_id])
+
+
+def decode_search_cursor(cursor: str) -> tuple[int, str | float, int]:
+    try:
+        phase, sort_value, patient_id = _decode_position(cursor)
+        if not isinstance(sort_value, str):
+            sort_value = float(sort_value)
+        return int(phase), sort_value, int(patient_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards in user input; use with escape="\\"."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def prefix_range(expression: ColumnElement, prefix: str) -> ColumnElement[bool]:
+    """expression starts with prefix, as a range a text_pattern_ops index can
+    scan. Unlike LIKE 'prefix%', this stays an index range when prefix is a
+    bound parameter; every string starting with prefix sorts byte-wise below
+    prefix with its last character incremented."""
+    next_code_point = ord(prefix[-1]) + 1
+    if 0xD800 <= next_code_point < 0xE000:
+        next_code_point = 0xE000  # surrogates cannot be encoded
+    if next_code_point > sys.maxunicode:
+        return expression.op("~>=~")(prefix)
+    upper_bound = prefix[:-1] + chr(next_code_point)
+    return and_(expression.op("~>=~")(prefix), expression.op("~<~")(upper_bound))
+
+
+def pattern_order(expression: ColumnElement) -> UnaryExpression:
+    """ORDER BY expression USING ~<~: the byte-wise order of a text_pattern_ops index."""
+    return UnaryExpression(expression, modifier=custom_op("USING ~<~"))
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """(sort_column, id) ordering used to paginate one list by cursor.
+
+    Either direction is a forward or backward walk of one composite index on
+    (sort_column, id), so Postgres never sorts. Non-null columns use the
+    index's default NULL placement. Nullable ones order NULLs below every
+    value: last when newest first, first when oldest first, which is a
+    (sort_column DESC NULLS LAST, id DESC) index read either way.
+    """
+
+    sort_column: Any
+    id_column: Any
+    nullable: bool = False
+
+    def order_by(self, descending: bool) -> list[ColumnElement]:
+        if descending:
+            sort = self.sort_column.desc()
+            return [sort.nulls_last() if self.nullable else sort, self.id_column.desc()]
+        sort = self.sort_column.asc()
+        return [sort.nulls_first() if self.nullable else sort, self.id_column.asc()]
+
+    def after(self, cursor: str, descending: bool) -> ColumnElement:
+        """Condition selecting rows strictly after the cursor position."""
+        sort_value, row_id = decode_cursor(cursor)
+        id_after = self.id_column < row_id if descending else self.id_column > row_id
+        if sort_value is None:
+            undated_after = and_(self.sort_column.is_(None), id_after)
+            if descending:
+                return undated_after
+            return or_(undated_after, self.sort_column.is_not(None))
+
+        position = tuple_(self.sort_column, self.id_column)
+        cursor_position = tuple_(sort_value, row_id)
+        rows_after = position < cursor_position if descending else position > cursor_position
+        if self.nullable and descending:
+            return or_(rows_after, self.sort_column.is_(None))
+        return rows_after
+
+    def cursor_for(self, row: Any) -> str:
+        return encode_cursor(getattr(row, self.sort_column.key), getattr(row, self.id_column.key))
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header lists etag, compared weakly as GET requires."""
+    if if_none_match is None:
+        return False
+    client_tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in client_tags or etag in client_tags
+
+
+@dataclass(frozen=True)
+class ResourceVersion:
+    """Validators for one stored row, derived from its updated_at alone."""
+
+    etag: str
+    last_modified: datetime
+
+    @classmethod
+    def of(cls, resource: str, row_id: int, updated_at: datetime) -> "ResourceVersion":
+        digest = hashlib.sha256(f"{resource}:{row_id}:{updated_at.isoformat()}".encode())
+        last_modified = updated_at.replace(tzinfo=timezone.utc, microsecond=0)
+        return cls(etag=f'"{digest.hexdigest()[:32]}"', last_modified=last_modified)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": format_datetime(self.last_modified, usegmt=True),
+            "Cache-Control": "private, no-cache",
+        }
+
+    def matches(self, if_none_match: str | None, if_modified_since: str | None) -> bool:
+        """Whether a conditional GET can be answered with 304 Not Modified.
+
+        If-None-Match takes precedence; If-Modified-Since is only consulted
+        when the client sent no entity tags (RFC 9110, section 13.2.2).
+        """
+        if if_none_match is not None:
+            return etag_matches(if_none_match, self.etag)
+        if if_modified_since is not None:
+            try:
+                return self.last_modified <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
@@ -1,36 +1,45 @@
 """
 Redis async client. Add dependency: redis (e.g. uv add redis).
 """
-from redis.asyncio import Redis, from_url
+from redis.asyncio import BlockingConnectionPool, Redis
 
 from src.config import settings
 
 
 class RedisClient:
-    """Async Redis client. Call start() before use and close() on shutdown."""
+    """App-wide async Redis client backed by a single bounded connection pool.
+
+    Call start() once in the app lifespan and close() on shutdown.
+    """
 
     def __init__(self, url: str | None = None):
         self._url = str(url or settings.REDIS_URL or "redis://localhost:6379")
         self.client: Redis | None = None
 
     async def start(self) -> None:
-        self.client = from_url(
+        pool = BlockingConnectionPool.from_url(
             self._url,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS,
             encoding="utf-8",
             decode_responses=True,
         )
+        self.client = Redis(connection_pool=pool)
 
     async def close(self) -> None:
         if self.client:
-            await self.client.aclose()
+            await self.client.aclose(close_connection_pool=True)
             self.client = None
 
 
+redis_client = RedisClient()
+
+
 async def get_redis() -> Redis:
-    """Return a new Redis client connected to REDIS_URL (for one-off use or dependencies)."""
-    url = settings.REDIS_URL or "redis://localhost:6379"
-    return from_url(
-        str(url),
-        encoding="utf-8",
-        decode_responses=True,
-    )
+    """Return the shared Redis client started in the app lifespan."""
+    if redis_client.client is None:
+        raise RuntimeError("Redis client is not started; it is opened in the app lifespan")
+    return redis_client.client
@@ -1,7 +1,15 @@
+import asyncio
+import threading
+
 import pytest
 from fastapi.testclient import TestClient
 
 from src.main import app
+from src.exceptions import ExecutorSaturatedError
+from src.executors import BoundedExecutor
+from src.auth.service import AuthService
+from src.auth.session_cache import SessionUserCache
+from src.auth.session_store import InMemorySessionStore
 
 client = TestClient(app)
 
@@ -10,3 +18,183 @@ def test_auth_list():
     """Test auth list endpoint."""
     response = client.get("/auth/")
     assert response.status_code == 200
+
+
+def test_password_executor_rejects_work_beyond_queue_limit():
+    """Work beyond workers + queue size fails fast instead of queueing."""
+    release = threading.Event()
+    executor = BoundedExecutor("test", max_workers=1, max_queue_size=1)
+
+    async def saturate():
+        running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(release.wait)
+        release.set()
+        await asyncio.gather(*running)
+
+    asyncio.run(saturate())
+    executor.close()
+    assert executor.stats().rejected == 1
+    assert executor.stats().completed == 2
+
+
+def test_session_store_extends_ttl_only_below_refresh_threshold():
+    """Reads leave the expiry alone until less than the threshold remains."""
+    store = InMemorySessionStore(ttl_seconds=100, refresh_threshold=0.5)
+
+    async def read_fresh_then_stale_session():
+        await store.create("fresh", user_id=1)
+        fresh = await store.read("fresh")
+        store.refresh_below_seconds = 101
+        stale = await store.read("fresh")
+        missing = await store.read("unknown")
+        return fresh, stale, missing
+
+    fresh, stale, missing = asyncio.run(read_fresh_then_stale_session())
+    assert fresh.user_id == 1 and not fresh.refreshed
+    assert stale.user_id == 1 and stale.refreshed
+    assert missing is None
+
+
+def session_index_service() -> tuple[AuthService, InMemorySessionStore]:
+    store = InMemorySessionStore(ttl_seconds=100, refresh_threshold=0.5)
+    cache = SessionUserCache(max_entries=10, ttl_seconds=30)
+    return AuthService(None, store, None, cache), store
+
+
+def test_session_index_lists_a_users_sessions_and_prunes_logouts_and_expiries():
+    """Listing reads one user's index; logged-out and expired sessions drop out of it."""
+    auth_service, store = session_index_service()
+
+    async def list_after_logout_and_expiry():
+        for session_id, user_id in [("alpha-session", 1), ("bravo-session", 1), ("other-session", 2)]:
+            await store.create(session_id, user_id)
+        store.ttl_seconds = 0
+        await store.create("stale-session", 1)
+        store.ttl_seconds = 100
+        listed = await auth_service.list_sessions(1, "bravo-session")
+        await auth_service.logout("alpha-session")
+        after_logout = await auth_service.list_sessions(1, "bravo-session")
+        return listed, after_logout
+
+    listed, after_logout = asyncio.run(list_after_logout_and_expiry())
+    assert [(s.session_hint, s.current) for s in listed] == [("alpha-se", False), ("bravo-se", True)]
+    assert all(0 < s.expires_in_seconds <= 100 for s in listed)
+    assert [s.session_hint for s in after_logout] == ["bravo-se"]
+    assert store._sessions_by_user == {1: {"bravo-session"}, 2: {"other-session"}}
+
+
+def test_logout_everywhere_revokes_only_that_users_sessions():
+    """Revoking one user's sessions leaves other users signed in and empties the index."""
+    auth_service, store = session_index_service()
+
+    async def revoke_user_one():
+        for session_id, user_id in [("alpha-session", 1), ("bravo-session", 1), ("other-session", 2)]:
+            await store.create(session_id, user_id)
+        revoked = await auth_service.logout_everywhere(1)
+        reads = [await store.read(session_id) for session_id in ["alpha-session", "bravo-session", "other-session"]]
+        return revoked, reads, await auth_service.list_sessions(1, "alpha-session")
+
+    revoked, (alpha, bravo, other), remaining = asyncio.run(revoke_user_one())
+    assert revoked == 2
+    assert alpha is None and bravo is None
+    assert other.user_id == 2
+    assert remaining == []
+
+
+def test_session_cache_listener_survives_an_idle_channel():
+    """An idle invalidation channel outlasting the socket timeout keeps one subscription."""
+    from redis.asyncio import Redis
+
+    from src.auth.session_cache import SessionUserCache
+
+    subscriptions = []
+
+    async def silent_redis(reader, writer):
+        # Acknowledge every command, then stay quiet as an idle channel does.
+        while line := await reader.readline():
+            command = []
+            for _ in range(int(line[1:])):
+                length = int((await reader.readline())[1:])
+                command.append((await reader.readexactly(length + 2))[:-2].decode())
+            if command[0].upper() == "SUBSCRIBE":
+                subscriptions.append(command[1])
+                channel = command[1].encode()
+                writer.write(b"*3\r\n$9\r\nsubscribe\r\n$%d\r\n%s\r\n:1\r\n" % (len(channel), channel))
+            else:
+                writer.write(b"+OK\r\n")
+            await writer.drain()
+
+    async def listen_while_idle():
+        server = await asyncio.start_server(silent_redis, "127.0.0.1", 0)
+        redis = Redis(port=server.sockets[0].getsockname()[1], socket_timeout=0.2, decode_responses=True)
+        cache = SessionUserCache(max_entries=10, ttl_seconds=60)
+        await cache.start_listener(redis)
+        try:
+            await asyncio.sleep(1.5)
+            return cache.stats().listener_connected
+        finally:
+            await cache.stop_listener()
+            await redis.aclose()
+            server.close()
+
+    assert asyncio.run(listen_while_idle())
+    assert len(subscriptions) == 1
+
+
+def test_executor_keeps_a_cancelled_callers_job_in_flight_until_it_finishes():
+    """A cancelled caller does not free the slot its still-running job occupies."""
+    release = threading.Event()
+    executor = BoundedExecutor("test", max_workers=1, max_queue_size=1)
+
+    # Jobs give up after 5s, so a regression fails instead of hanging.
+    async def cancel_while_running():
+        abandoned = asyncio.ensure_future(executor.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(executor.run(release.wait, 5))
+        abandoned.cancel()
+        await asyncio.sleep(0.05)
+        in_flight_after_cancel = executor.stats().in_flight
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(release.wait, 5)
+        release.set()
+        await queued
+        await asyncio.sleep(0.05)
+        return in_flight_after_cancel, executor.stats().in_flight
+
+    assert asyncio.run(cancel_while_running()) == (2, 0)
+    executor.close()
+
+
+def test_any_endpoint_that_extends_the_session_reissues_the_cookie():
+    """A refresh on an endpoint other than /auth/me still slides the browser's cookie."""
+    from src.database import get_db
+    from src.auth.dependencies import get_session_cache, get_session_store
+    from src.auth.models import User
+
+    class Users:
+        async def get(self, model, user_id):
+            return User(id=user_id, firstname="Ada", lastname="Lovelace", email="ada@example.com", password="")
+
+    store = InMemorySessionStore(ttl_seconds=100, refresh_threshold=0.5)
+    asyncio.run(store.create("abc", user_id=1))
+    app.dependency_overrides[get_db] = Users
+    app.dependency_overrides[get_session_store] = lambda: store
+    app.dependency_overrides[get_session_cache] = lambda: SessionUserCache(max_entries=10, ttl_seconds=30)
+    client.cookies.set("session_id", "abc")
+    try:
+        fresh = client.get("/auth/sessions")
+        store.refresh_below_seconds = 101
+        refreshed = client.get("/auth/sessions")
+        logged_out = client.post("/auth/logout-all")
+    finally:
+        app.dependency_overrides.clear()
+        client.cookies.clear()
+
+    assert fresh.status_code == 200 and "set-cookie" not in fresh.headers
+    assert refreshed.status_code == 200
+    assert refreshed.headers.get_list("set-cookie") == [
+        "session_id=abc; HttpOnly; Max-Age=86400; Path=/; SameSite=lax"
+    ]
+    assert [cookie.split(";")[0] for cookie in logged_out.headers.get_list("set-cookie")] == ['session_id=""']
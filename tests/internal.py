@@ -0,0 +1,12 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+
+client = TestClient(app)
+
+
+def test_database_stats_requires_session():
+    """Test the database stats endpoint is not public."""
+    response = client.get("/internal/stats/database")
+    assert response.status_code == 401